@@ -1,6 +1,14 @@
+import sys
 from contextlib import suppress
 from pathlib import Path
 
+if sys.version_info >= (3, 11):
+    from tomllib import loads as toml_loads
+else:
+    from tomli import loads as toml_loads
+
+__all__ = ["path_is_relative_to", "toml_loads"]
+
 
 def path_is_relative_to(path1: Path, path2: Path) -> bool:
     """Backport of ``PurePath.is_relative_to`` for Python 3.7 and 3.8."""
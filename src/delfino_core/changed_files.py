@@ -0,0 +1,71 @@
+"""Selection of files affected by changes against the trunk branch, used by the `--changed` option."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from delfino_core.backports import path_is_relative_to
+from delfino_core.import_graph import ImportGraph, python_files
+from delfino_core.vcs_tools import get_changed_files
+
+# Changes in any of these files can affect results of any file, so everything must be checked.
+CONFIG_FILES = frozenset(
+    {
+        "pyproject.toml",
+        "setup.cfg",
+        "tox.ini",
+        "pytest.ini",
+        "mypy.ini",
+        ".mypy.ini",
+        "ruff.toml",
+        ".ruff.toml",
+        "uv.lock",
+        "poetry.lock",
+        "Pipfile.lock",
+    }
+)
+_PYTHON_SUFFIXES = frozenset({".py", ".pyi"})
+
+
+def select_changed(
+    target_paths: Iterable[Path], import_roots: Sequence[Path], include_dependents: bool
+) -> list[Path] | None:
+    """Select Python files from `target_paths` affected by changes against the trunk branch.
+
+    Args:
+        target_paths: Files and folders to select from.
+        import_roots: Folders used to convert file paths to module names, in order of priority.
+        include_dependents: Also select files importing any of the changed files, directly or transitively.
+            Use for tools whose results in one file depend on other files, such as type checkers or tests.
+            A changed `conftest.py` selects all files in its folder.
+
+    Returns:
+        Selected existing files, which may be empty, or `None` if a configuration or lock file changed
+        and all files need to be checked.
+    """
+    changed = get_changed_files()
+    if any(path.name in CONFIG_FILES for path in changed):
+        return None
+
+    target_paths = list(target_paths)
+    candidates = python_files(target_paths)
+    changed_candidates = set(candidates).intersection(changed)
+
+    if not include_dependents:
+        return sorted(changed_candidates)
+
+    # Deleted or renamed modules are kept in the graph, so that files still importing them are selected
+    removed = {
+        path
+        for path in changed
+        if path.suffix in _PYTHON_SUFFIXES
+        and not path.exists()
+        and any(path_is_relative_to(path, target_path) for target_path in target_paths)
+    }
+    affected = ImportGraph([*candidates, *removed], import_roots).dependents(changed_candidates | removed)
+
+    for conftest in (path for path in changed_candidates | removed if path.name == "conftest.py"):
+        affected.update(path for path in candidates if path_is_relative_to(path, conftest.parent))
+
+    return sorted(affected - removed)
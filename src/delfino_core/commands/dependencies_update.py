@@ -1,45 +1,94 @@
 from __future__ import annotations
 
+import io
+import json
 import os
 import re
+import shlex
 import webbrowser
+from collections.abc import Collection, Iterable
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 from pathlib import Path
 from subprocess import PIPE, CompletedProcess
+from typing import Any
 
 import click
 from click import secho
 from delfino.constants import ENTRY_POINT, PackageManager
 from delfino.decorators import pass_app_context
-from delfino.execution import OnError, run
+from delfino.execution import OnError
 from delfino.models import AppContext
 from delfino.terminal_output import print_header
-from delfino.validation import assert_package_manager_is_known, assert_pip_package_installed
+from delfino.validation import assert_package_manager_is_known
 
+from delfino_core.backports import toml_loads
 from delfino_core.commands.verify import run_group_verify
 from delfino_core.config import CorePluginConfig
+from delfino_core.git_files import GitDir, UnsupportedGitStateError
+from delfino_core.output import CapturedOutput
+from delfino_core.probes import assert_pip_package_installed
 from delfino_core.spinner import Spinner
+from delfino_core.telemetry import run
 from delfino_core.utils import ask
+from delfino_core.vcs_tools import RepoSnapshot
 
-try:
-    from git import Repo
-except ImportError:
-    pass
 
-try:
-    import yaml
-except ImportError:
-    pass
+def _run(args: str, spinner: Spinner | None = None, output: CapturedOutput | None = None) -> CompletedProcess:
+    """Run the command with its output written into temporary files, printed only if it fails.
 
+    Args:
+        args: The command to run.
+        spinner: Shown while the command is running.
+        output: Files to capture the output into, for the caller to read afterward. By default, the output
+            is discarded after the command has finished.
+    """
+    with ExitStack() as stack:
+        if output is None:
+            output = stack.enter_context(CapturedOutput())
 
-def _run(args: str, spinner: Spinner | None = None) -> CompletedProcess:
-    """Print the command before execution."""
-    if spinner is None:
-        return run(args, on_error=OnError.EXIT, stdout=PIPE, stderr=PIPE)
+        if spinner is None:
+            result = run(args, on_error=OnError.PASS, stdout=output.stdout, stderr=output.stderr)
+            if result.returncode:
+                secho(f"\nError ({result.returncode}) when calling {args!r}:", fg="red")
+                output.echo()
+                raise click.exceptions.Exit(code=result.returncode)
+            return result
 
-    result = run(args, on_error=OnError.PASS, running_hook=spinner, stdout=PIPE, stderr=PIPE)
-    spinner.print_results(result, error_cls=click.exceptions.Exit)
-    return result
+        with spinner:
+            result = run(args, on_error=OnError.PASS, stdout=output.stdout, stderr=output.stderr)
+        spinner.print_results(result, error_cls=click.exceptions.Exit, output=output)
+        return result
+
+
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_NAME_SEPARATORS = re.compile(r"[-_.]+")
+
+
+def canonical_name(name: str) -> str:
+    """Package name normalized as in PEP 503, so that e.g. ``Ruamel.YAML`` and ``ruamel-yaml`` match."""
+    return _NAME_SEPARATORS.sub("-", name).lower()
+
+
+def _add_requirements(requirements: dict[str, list[str]], entries: Any) -> None:
+    """Add requirements from a table of names to specifications, or from a list of PEP 508 strings.
+
+    Requirements are keyed by canonical package names.
+    """
+    if isinstance(entries, dict):
+        for name, specification in entries.items():
+            requirements.setdefault(canonical_name(name), []).append(json.dumps(specification, sort_keys=True))
+    elif isinstance(entries, list):
+        for entry in entries:  # Entries other than strings are e.g. `{include-group = "..."}` of dependency groups
+            if isinstance(entry, str) and (match := _REQUIREMENT_NAME.match(entry)):
+                requirements.setdefault(canonical_name(match.group(1)), []).append(entry.strip())
+
+
+def _add_project_requirements(requirements: dict[str, list[str]], pyproject_toml: dict[str, Any]) -> None:
+    project = pyproject_toml.get("project", {})
+    _add_requirements(requirements, project.get("dependencies", []))
+    for entries in project.get("optional-dependencies", {}).values():
+        _add_requirements(requirements, entries)
 
 
 class Changelogs:
@@ -47,6 +96,7 @@ class Changelogs:
 
     def __init__(self):
         assert_pip_package_installed("PyYAML")
+        import yaml  # noqa: PLC0415 # Deferred, only needed by this command
 
         with open(self._DATA_FILE, encoding="utf-8") as file:
             self._packages_to_urls: dict[str, str] = yaml.safe_load(file)["changelogs"]
@@ -57,17 +107,23 @@ class Changelogs:
 
 class Updater:
     _FILENAME: str = ""
+    # Entries of dependency sections which can't be updated by name, e.g. the Python version constraint
+    _NOT_PACKAGES: frozenset[str] = frozenset()
 
     @staticmethod
     def _git_root():
-        return (
-            run(["git", "rev-parse", "--show-toplevel"], stdout=PIPE, stderr=PIPE, on_error=OnError.EXIT)
-            .stdout.decode()
-            .strip()
-        )
+        try:
+            return GitDir.discover().work_tree
+        except UnsupportedGitStateError:
+            return (
+                run(["git", "rev-parse", "--show-toplevel"], stdout=PIPE, stderr=PIPE, on_error=OnError.EXIT)
+                .stdout.decode()
+                .strip()
+            )
 
     def __init__(self, stash: bool):
         assert_pip_package_installed("gitpython")
+        from git import Repo  # noqa: PLC0415 # Deferred, gitpython is slow to import
 
         self._repo = Repo(self._git_root())
         self._stash = stash
@@ -102,26 +158,61 @@ class Updater:
                     secho(f"\nOpen a new pull request by visiting:\n\n\t{url}\n", fg="green")
 
     def _link_to_open_a_pull_request(self) -> str | None:
-        url = self._repo.remote().url
+        snapshot = RepoSnapshot.take()
+        url = snapshot.config_value("remote.origin.url")
 
         if not (match := re.match("git@github.com:(.*)\\.git", url)):
             match = re.match("https://github.com/(.*)\\.git", url)
 
-        return f"https://github.com/{match.group(1)}/pull/new/{self._repo.active_branch}" if match else None
+        return f"https://github.com/{match.group(1)}/pull/new/{snapshot.current_branch}" if match else None
 
     def _read_dependency_file(self) -> str:
         with open(self._FILENAME, encoding="utf-8") as file:
             return file.read()
 
-    def print_outdated_packages_and_lock_if_changed(self) -> bool:
+    @classmethod
+    def _requirements(cls, dependency_file: str) -> dict[str, list[str]]:
+        """Specifications of each package declared in the dependency file, from all groups it appears in.
+
+        Keys are canonical package names, see ``canonical_name``.
+        """
+        raise NotImplementedError
+
+    def _edited_packages(self, before: dict[str, list[str]]) -> set[str]:
+        """Packages with specifications added, removed or changed since the dependency file declared ``before``.
+
+        Anything else, such as formatting or comments, doesn't need a new lock. If the edited file can't
+        be parsed, the user is asked to fix it.
+        """
+        while True:
+            try:
+                after = self._requirements(self._read_dependency_file())
+                break
+            except ValueError as exc:  # Syntax errors of all TOML parsers are its subclasses
+                secho(f"Failed to parse {self._FILENAME}: {exc}", fg="red")
+                input(f"\033[1;33mFix the {self._FILENAME} file, then continue by pressing ENTER ...\033[0m")
+        return {name for name in before.keys() | after.keys() if before.get(name) != after.get(name)}
+
+    def _packages_to_update(self, packages: Collection[str]) -> list[str]:
+        """Packages to update by name. Empty if all need updating, e.g. when only removed packages were edited."""
+        return sorted(set(packages) & self._requirements(self._read_dependency_file()).keys() - self._NOT_PACKAGES)
+
+    def print_outdated_packages_and_lock_if_changed(self, packages: Collection[str] = ()) -> set[str]:
+        """Update locked versions, show outdated packages and wait for the user to edit the dependency file.
+
+        Args:
+            packages: Update only these packages, edited in the previous round. All packages if empty.
+
+        Returns:
+            Packages edited by the user. Empty if there is nothing more to update.
+        """
         raise NotImplementedError
 
     def get_branch_name(self) -> str:
-        email = self._repo.config_reader().get_value("user", "email")
+        email = RepoSnapshot.take().config_value("user.email")
         assert email, (
             "Git config has not a commit email set. Please set it with:\n\tgit config --global user.email 'YOUR_EMAIL'"
         )
-        assert isinstance(email, str)
 
         user_name = re.sub("@.*", "", email)
         assert user_name, f"No user name could be parsed from git commit email '{email}' after removing '@.*'."
@@ -142,9 +233,10 @@ class Updater:
         )
 
     def checkout_branch(self, branch: str):
-        if str(self._repo.active_branch) == branch:
+        snapshot = RepoSnapshot.take()
+        if snapshot.current_branch == branch:
             secho(f"Branch '{branch}' already exists and active.", fg="green")
-        elif branch in self._repo.branches:
+        elif branch in snapshot.local_branches:
             secho(f"Branch '{branch}' already exists.", fg="yellow")
             _run(f"git checkout {branch}")
         else:
@@ -152,7 +244,7 @@ class Updater:
                 secho("Stashing existing changes.", fg="yellow")
                 _run("git stash")
 
-            if self._repo.active_branch != "main":
+            if snapshot.current_branch != "main":
                 secho("Checking out 'main'.", fg="yellow")
                 _run("git checkout main")
 
@@ -169,9 +261,9 @@ class Updater:
             self.checkout_branch(branch_name)
 
         if not retry:
-            while True:
-                if not self.print_outdated_packages_and_lock_if_changed():
-                    break
+            edited = self.print_outdated_packages_and_lock_if_changed()
+            while edited:
+                edited = self.print_outdated_packages_and_lock_if_changed(edited)
 
             secho("Running all tests to check the updated dependencies ... ", fg="yellow")
 
@@ -179,11 +271,13 @@ class Updater:
 class PipenvUpdater(Updater):
     _FILENAME = "Pipfile"
 
-    _SKIP_PATTERN = (
+    _NOT_PACKAGE_SECTIONS = frozenset({"source", "requires", "pipenv", "scripts"})
+
+    _SKIP_PATTERN = re.compile(
         "Skipped Update of Package (?P<package>[^:]+): (?P<installed>[^ ]+) "
         "installed.* (?P<available>[^ ]+) available.*"
     )
-    _OUTDATED_PATTEN = (
+    _OUTDATED_PATTERN = re.compile(
         "Package '(?P<package>[^']+)' out-of-date: '(?P<installed>[^']+)' "
         "installed.* '(?P<available>[^']+)' available.*"
     )
@@ -194,55 +288,95 @@ class PipenvUpdater(Updater):
         _run("pipenv lock")
         _run("pipenv sync -d")
 
-    def print_outdated_packages_and_lock_if_changed(self) -> bool:
-        spinner = Spinner("pipenv", "updating packages based on version pinning")
-        _run("pipenv update -d", spinner)
+    @classmethod
+    def _requirements(cls, dependency_file: str) -> dict[str, list[str]]:
+        requirements: dict[str, list[str]] = {}
+        for section, entries in toml_loads(dependency_file).items():
+            if section not in cls._NOT_PACKAGE_SECTIONS:  # `packages`, `dev-packages` and custom categories
+                _add_requirements(requirements, entries)
+        return requirements
 
-        spinner = Spinner("pipenv", "checking outdated packages")
-        result = _run("pipenv update --outdated", spinner)
+    @classmethod
+    def outdated_declared_packages(cls, lines: Iterable[str], declared: Collection[str]) -> dict[str, tuple[str, str]]:
+        """Installed and available versions of packages declared in Pipfile, which have a different version available.
+
+        Args:
+            lines: Output of ``pipenv update --outdated``, matched one line at a time.
+            declared: Canonical names of packages declared in Pipfile.
+        """
+        outdated = {}
+        for line in lines:
+            if not (match := cls._SKIP_PATTERN.match(line) or cls._OUTDATED_PATTERN.match(line)):
+                continue
 
-        pipfile = self._read_dependency_file()
+            package = match.group("package")
+            installed = match.group("installed").lstrip(cls._VERSION_CONSTRAINT_CHARS)
+            available = match.group("available").lstrip(cls._VERSION_CONSTRAINT_CHARS)
+            if installed != available and canonical_name(package) in declared:
+                outdated[package] = (installed, available)
+        return outdated
 
-        available_updates = []
+    def print_outdated_packages_and_lock_if_changed(self, packages: Collection[str] = ()) -> set[str]:
+        spinner = Spinner("pipenv", "updating packages based on version pinning")
+        _run(shlex.join(["pipenv", "update", "-d", *self._packages_to_update(packages)]), spinner)
 
-        for line in result.stdout.decode().split(os.linesep) + result.stderr.decode().split(os.linesep):
-            if not (match := re.match(self._SKIP_PATTERN, line) or re.match(self._OUTDATED_PATTEN, line)):
-                continue
+        declared = self._requirements(self._read_dependency_file())
+        spinner = Spinner("pipenv", "checking outdated packages")
+        with CapturedOutput(merge_stderr=True) as output:
+            _run("pipenv update --outdated", spinner, output)
+            output.stdout.seek(0)
+            lines = io.TextIOWrapper(output.stdout, encoding="utf-8", errors="replace")
+            outdated = self.outdated_declared_packages(lines, declared)
 
-            package = match.group("package")
-            installed = match.group("installed").lstrip(self._VERSION_CONSTRAINT_CHARS)
-            available = match.group("available").lstrip(self._VERSION_CONSTRAINT_CHARS)
+        available_updates = []
 
-            # Keep only packages defined in Pipfile with a different version available
-            if installed != available and re.search(f'\n"?{package}"? ', pipfile):
-                if changelog_url := self._changelog.url_for_package(package):
-                    changelog_url = f" ({changelog_url})"
-                available_updates.append(f"{package}: {installed} -> {available}{changelog_url}")
+        for package, (installed, available) in outdated.items():
+            if changelog_url := self._changelog.url_for_package(package):
+                changelog_url = f" ({changelog_url})"
+            available_updates.append(f"{package}: {installed} -> {available}{changelog_url}")
 
         if not available_updates:
-            return False
+            return set()
 
         self._show_edit_prompt_and_wait(available_updates="\n".join(sorted(available_updates)) + "\n")
 
-        return self._read_dependency_file() != pipfile
+        return self._edited_packages(declared)
 
 
 class PoetryUpdater(Updater):
     _FILENAME = "pyproject.toml"
+    _NOT_PACKAGES = frozenset({"python"})
     _ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
 
     def parse_package_name(self, line: str) -> str:
         return self._ANSI_ESCAPE.sub("", line).split(" ", maxsplit=1)[0]
 
-    def print_outdated_packages_and_lock_if_changed(self) -> bool:
+    @classmethod
+    def _requirements(cls, dependency_file: str) -> dict[str, list[str]]:
+        pyproject_toml = toml_loads(dependency_file)
+        requirements: dict[str, list[str]] = {}
+        _add_project_requirements(requirements, pyproject_toml)
+
+        poetry = pyproject_toml.get("tool", {}).get("poetry", {})
+        _add_requirements(requirements, poetry.get("dependencies", {}))
+        _add_requirements(requirements, poetry.get("dev-dependencies", {}))
+        for group in poetry.get("group", {}).values():
+            _add_requirements(requirements, group.get("dependencies", {}))
+        return requirements
+
+    def print_outdated_packages_and_lock_if_changed(self, packages: Collection[str] = ()) -> set[str]:
         spinner = Spinner("poetry", "updating packages based on version pinning")
-        _run("poetry update", spinner)
+        _run(shlex.join(["poetry", "update", *self._packages_to_update(packages)]), spinner)
 
         spinner = Spinner("poetry", "checking outdated packages")
-        if not (result := _run("poetry show --outdated --why --ansi", spinner).stdout.decode()):
-            return False
-
-        pyproject_toml = self._read_dependency_file()
+        with CapturedOutput() as output:
+            _run("poetry show --outdated --why --ansi", spinner, output)
+            output.stdout.seek(0)
+            result = output.stdout.read().decode()
+        if not result:
+            return set()
+
+        declared = self._requirements(self._read_dependency_file())
         updates = []
 
         for line in result.split(os.linesep):
@@ -257,7 +391,74 @@ class PoetryUpdater(Updater):
 
         self._show_edit_prompt_and_wait(available_updates="\n".join(updates))
 
-        return self._read_dependency_file() != pyproject_toml
+        return self._edited_packages(declared)
+
+
+class UvUpdater(Updater):
+    """Updates from a single resolution per iteration, instead of resolving again to find outdated packages.
+
+    ``uv sync --upgrade`` resolves once, upgrading packages within the constraints, and syncs the environment.
+    ``uv tree --outdated`` then only reads the lock file and looks up the latest versions in the index.
+    After the user edits ``pyproject.toml``, only the edited packages are upgraded.
+    """
+
+    _FILENAME = "pyproject.toml"
+    _OUTDATED_PATTERN = re.compile(
+        r"^\W*(?P<package>[A-Za-z0-9._-]+) v(?P<installed>\S+)\b.*\(latest: v(?P<available>[^)]+)\)"
+    )
+
+    @classmethod
+    def _lock_and_sync(cls):
+        _run("uv sync")
+
+    @classmethod
+    def parse_outdated_packages(cls, output: str) -> dict[str, tuple[str, str]]:
+        """Installed and latest versions by package from ``uv tree --outdated``, in the order of appearance."""
+        return {
+            match.group("package"): (match.group("installed"), match.group("available"))
+            for line in output.splitlines()
+            if (match := cls._OUTDATED_PATTERN.match(line))
+        }
+
+    @classmethod
+    def _requirements(cls, dependency_file: str) -> dict[str, list[str]]:
+        pyproject_toml = toml_loads(dependency_file)
+        requirements: dict[str, list[str]] = {}
+        _add_project_requirements(requirements, pyproject_toml)
+
+        for entries in pyproject_toml.get("dependency-groups", {}).values():
+            _add_requirements(requirements, entries)
+        _add_requirements(requirements, pyproject_toml.get("tool", {}).get("uv", {}).get("dev-dependencies", []))
+        return requirements
+
+    def print_outdated_packages_and_lock_if_changed(self, packages: Collection[str] = ()) -> set[str]:
+        spinner = Spinner("uv", "updating packages based on version pinning")
+        if to_update := self._packages_to_update(packages):
+            upgrade = [arg for package in to_update for arg in ("--upgrade-package", package)]
+        else:
+            upgrade = ["--upgrade"]
+        _run(shlex.join(["uv", "sync", *upgrade]), spinner)
+
+        spinner = Spinner("uv", "checking outdated packages")
+        with CapturedOutput() as output:
+            _run("uv tree --outdated --depth 1 --frozen", spinner, output)
+            output.stdout.seek(0)
+            result = output.stdout.read().decode()
+
+        if not (outdated := self.parse_outdated_packages(result)):
+            return set()
+
+        declared = self._requirements(self._read_dependency_file())
+        available_updates = []
+
+        for package, (installed, available) in outdated.items():
+            if changelog_url := self._changelog.url_for_package(package):
+                changelog_url = f" ({changelog_url})"
+            available_updates.append(f"{package}: {installed} -> {available}{changelog_url}")
+
+        self._show_edit_prompt_and_wait(available_updates="\n".join(sorted(available_updates)) + "\n")
+
+        return self._edited_packages(declared)
 
 
 @click.command("dependencies-update")
@@ -287,6 +488,8 @@ def run_dependencies_update(
         updater = PipenvUpdater(stash)
     elif app_context.package_manager == PackageManager.POETRY:
         updater = PoetryUpdater(stash)
+    elif app_context.package_manager == PackageManager.UV:
+        updater = UvUpdater(stash)
     else:
         raise AssertionError(
             f"The '{app_context.package_manager.value}' package manager is not supported by this command."
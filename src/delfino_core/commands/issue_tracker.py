@@ -1,42 +1,124 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from base64 import b64encode
+from http import HTTPStatus
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from click import Abort
 
 from delfino_core.config import IssueTrackingConfig
 
-try:
+if TYPE_CHECKING:
     import httpx
-    from httpx import codes
-except ImportError:
-    pass
+
+_ISSUE_TITLES_FILE = "issue-titles.json"
+
+
+def _issue_titles_file() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "delfino-core" / _ISSUE_TITLES_FILE
 
 
 class _BaseIssuerTrackerClient(ABC):
+    """Client of an issue tracker, caching issue titles on disk for ``IssueTrackingConfig.cache_ttl`` seconds."""
+
     def __init__(self, settings: IssueTrackingConfig):
         self._settings = settings
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Release connections kept open between requests."""
+
+    def _issue_key(self, issue_number: int) -> str:
+        return f"{self._settings.issue_prefix.rstrip('-')}-{issue_number}"
+
     @abstractmethod
+    def _fetch_issue_title(self, issue_key: str) -> str | None:
+        """Fetches the title of an issue by its key. None if the issue doesn't exist."""
+
+    def _read_cache(self) -> dict[str, Any]:
+        try:
+            cache = json.loads(_issue_titles_file().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _write_cache(self, cache: dict[str, Any]) -> None:
+        """Replace the file atomically, so that concurrent `delfino` processes never read a partial write."""
+        cache_file = _issue_titles_file()
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=cache_file.parent, delete=False, encoding="utf-8") as file:
+                json.dump(cache, file, indent=2, sort_keys=True)
+            os.replace(file.name, cache_file)
+        except OSError:  # A read-only home directory only means fetching again next time
+            pass
+
     def get_issue_title(self, issue_number: int) -> str:
-        """Fetches the title of an issue using its issue number."""
+        """Fetches the title of an issue using its issue number.
+
+        Raises:
+            click.Abort: The issue doesn't exist or the tracker failed to respond.
+        """
+        key = self._issue_key(issue_number)
+        now = time.time()
+        if self._settings.cache_ttl:
+            entry = self._read_cache().get(self._settings.tracker_url, {}).get(key)
+            if entry and now - entry[1] < self._settings.cache_ttl:
+                return entry[0]
+
+        if (title := self._fetch_issue_title(key)) is None:
+            raise Abort(f"Failed to fetch issue: {key}")
+
+        if self._settings.cache_ttl:
+            cache = self._read_cache()  # Again, it may have been updated by another process in the meantime
+            cache.setdefault(self._settings.tracker_url, {})[key] = [title, now]
+            self._write_cache(cache)
+
+        return title
 
 
 class JiraClient(_BaseIssuerTrackerClient):
-    def _headers(self) -> dict[str, str]:
-        token = b64encode(f"{self._settings.username}:{self._settings.api_key}".encode()).decode()
-        return {
-            "Accept": "application/json",
-            "Authorization": f"Basic {token}",
-        }
+    """Jira Cloud REST API v3 client, keeping connections open in a pooled ``httpx.Client``."""
 
-    def get_issue_title(self, issue_number: int) -> str:
-        issue_key = f"{self._settings.issue_prefix.rstrip('-')}-{issue_number}"
-        url = f"{self._settings.tracker_url.rstrip('/')}/rest/api/3/issue/{issue_key}"
+    def __init__(self, settings: IssueTrackingConfig):
+        super().__init__(settings)
+        self._client: httpx.Client | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            import httpx  # noqa: PLC0415 # Deferred, slower to import than most commands take to run
 
-        response = httpx.get(url, headers=self._headers())
+            self._client = httpx.Client(
+                base_url=f"{self._settings.tracker_url.rstrip('/')}/rest/api/3/",
+                auth=httpx.BasicAuth(self._settings.username or "", self._settings.api_key or ""),
+                headers={"Accept": "application/json"},
+                timeout=httpx.Timeout(10.0, connect=5.0),
+                http2=find_spec("h2") is not None,  # Optional dependency of httpx
+            )
+        return self._client
 
-        if response.status_code == codes.OK:
-            data = response.json()
-            return data["fields"]["summary"]
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
+    def _fetch_issue_title(self, issue_key: str) -> str | None:
+        response = self.client.get(f"issue/{issue_key}", params={"fields": "summary"})
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+        if response.is_success:
+            return response.json()["fields"]["summary"]
         raise Abort(f"Failed to fetch issue: {response.status_code}, {response.text}")
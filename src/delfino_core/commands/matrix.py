@@ -0,0 +1,280 @@
+"""Tests or checks run at the same time in virtualenvs of all available Python versions."""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from subprocess import PIPE
+
+import click
+from delfino.constants import PackageManager
+from delfino.execution import OnError
+from delfino.models import AppContext
+from delfino.terminal_output import print_header
+from delfino.validation import assert_package_manager_is_known
+
+from delfino_core.config import REPORTS_DIRECTORY_ENV_VAR, CorePluginConfig, pass_plugin_app_context
+from delfino_core.parallel import Job, run_jobs
+from delfino_core.probes import package_installed
+from delfino_core.spinner import Color, Style
+from delfino_core.telemetry import run
+from delfino_core.utils import assert_executable_installed, executable_installed, format_table
+from delfino_core.venv_store import VenvStore
+
+_PATCH_VERSION = re.compile(r"^\d+\.\d+\.\d+$")
+
+# Command installing locked packages into the virtualenv in `VIRTUAL_ENV` and its lock file, per package manager
+_INSTALL_COMMANDS: dict[PackageManager, tuple[list[str], str]] = {
+    PackageManager.POETRY: (["poetry", "install", "--no-root"], "poetry.lock"),
+    PackageManager.PIPENV: (["pipenv", "install", "-d", "--deploy"], "Pipfile.lock"),
+    PackageManager.UV: (["uv", "sync", "--frozen"], "uv.lock"),
+}
+
+
+@dataclass(frozen=True)
+class Interpreter:
+    version: str
+    path: Path
+    source: str
+
+    @property
+    def version_key(self) -> tuple[int, ...]:
+        return tuple(map(int, self.version.split(".")))
+
+    @property
+    def minor_version(self) -> str:
+        return ".".join(self.version.split(".")[:2])
+
+
+def parse_pyenv_versions(output: str, pyenv_root: Path) -> list[Interpreter]:
+    """Interpreters from ``pyenv versions --bare``. Virtualenvs and other than CPython versions are left out."""
+    return [
+        Interpreter(version, pyenv_root / "versions" / version / "bin" / "python", "pyenv")
+        for version in output.split()
+        if _PATCH_VERSION.match(version)
+    ]
+
+
+def parse_uv_python_list(output: str) -> list[Interpreter]:
+    """Interpreters from ``uv python list --only-installed --output-format json``. Only default CPython builds."""
+    return [
+        Interpreter(entry["version"], Path(entry["path"]), "uv")
+        for entry in json.loads(output)
+        if entry.get("implementation") == "cpython"
+        and entry.get("variant", "default") == "default"
+        and entry.get("path")
+        and _PATCH_VERSION.match(entry.get("version", ""))
+    ]
+
+
+def _output(args: list[str]) -> str | None:
+    result = run(args, stdout=PIPE, stderr=PIPE, on_error=OnError.PASS)
+    return result.stdout.decode() if result.returncode == 0 else None
+
+
+def find_interpreters() -> list[Interpreter]:
+    """Interpreters installed by pyenv and uv, one per version, ordered by version. Pyenv ones take precedence."""
+    found: list[Interpreter] = []
+    if executable_installed("pyenv") and (versions := _output(["pyenv", "versions", "--bare"])):
+        found.extend(parse_pyenv_versions(versions, Path((_output(["pyenv", "root"]) or "").strip())))
+    if executable_installed("uv") and (
+        python_list := _output(["uv", "python", "list", "--only-installed", "--output-format", "json"])
+    ):
+        found.extend(parse_uv_python_list(python_list))
+
+    by_version: dict[str, Interpreter] = {}
+    for interpreter in found:
+        if interpreter.path.exists():
+            by_version.setdefault(interpreter.version, interpreter)
+    return sorted(by_version.values(), key=lambda interpreter: interpreter.version_key)
+
+
+def _matches(version: str, requested: str) -> bool:
+    return version == requested or version.startswith(f"{requested}.")
+
+
+def select_interpreters(
+    interpreters: list[Interpreter], requested: Iterable[str], requires_python: str | None = None
+) -> list[Interpreter]:
+    """Pick the newest interpreter of each requested version, or of each MAJOR.MINOR version if none is requested.
+
+    Args:
+        interpreters: Available interpreters, ordered by version.
+        requested: Versions such as ``3.12`` or ``3.12.1``.
+        requires_python: Version specifiers of the project. Without requested versions, interpreters
+            not satisfying them are left out. Ignored when ``packaging`` is not installed.
+
+    Raises:
+        click.Abort: No interpreter matches one of the requested versions.
+    """
+    if requested := list(requested):
+        selected: list[Interpreter] = []
+        for version in requested:
+            if not (matching := [_ for _ in interpreters if _matches(_.version, version)]):
+                available = ", ".join(f"'{_.version}'" for _ in interpreters) or "none"
+                click.secho(f"❌ No pyenv or uv Python version matching Python {version} found.", fg="red", err=True)
+                click.echo(f"Available versions: {available}.", err=True)
+                raise click.Abort()
+            if matching[-1] not in selected:
+                selected.append(matching[-1])
+        return selected
+
+    selected = list({_.minor_version: _ for _ in interpreters}.values())  # Later, newer patch versions win
+    if requires_python and package_installed("packaging"):
+        from packaging.specifiers import SpecifierSet  # noqa: PLC0415
+
+        specifiers = SpecifierSet(requires_python)
+        selected = [_ for _ in selected if specifiers.contains(_.version)]
+    return selected
+
+
+@dataclass
+class _VersionRun:
+    interpreter: Interpreter
+    venv: Path
+    cached: bool
+    jobs: list[Job]
+
+    @property
+    def install(self) -> Job | None:
+        return self.jobs[-2] if len(self.jobs) > 1 else None
+
+    @property
+    def command(self) -> Job:
+        return self.jobs[-1]
+
+    def summary(self) -> list[str]:
+        if self.cached:
+            venv = "cached"
+        else:
+            venv = "built" if self.install is not None and self.install.succeeded else "✘ failed"
+
+        if self.command.skipped or self.command.returncode is None:
+            return [self.interpreter.version, self.interpreter.source, venv, "- skipped", ""]
+        result = "✔ passed" if self.command.succeeded else "✘ failed"
+        return [self.interpreter.version, self.interpreter.source, venv, result, f"{self.command.duration:.1f}s"]
+
+
+def _version_run(
+    interpreter: Interpreter,
+    venv_store: VenvStore,
+    command: str,
+    install_command: list[str],
+    reports_directory: Path,
+    rebuild: bool,
+) -> _VersionRun:
+    version = interpreter.version
+    venv = venv_store.path(version)
+    venv_env = {"VIRTUAL_ENV": venv, "UV_PROJECT_ENVIRONMENT": venv}
+    venv_path = {"PATH": venv / "bin"}
+    version_run = _VersionRun(interpreter, venv, cached=not rebuild and venv_store.is_complete(venv), jobs=[])
+
+    if not version_run.cached:
+        shutil.rmtree(venv, ignore_errors=True)
+        if install_command[0] == "uv":  # Otherwise uv may replace the virtualenv with one of a pinned version
+            install_command = [*install_command, "--python", str(interpreter.path)]
+        version_run.jobs += [
+            Job(name=f"{version} venv", args=[str(interpreter.path), "-m", "venv", str(venv)]),
+            Job(
+                name=f"{version} install",
+                args=install_command,
+                dependencies={f"{version} venv"},
+                env_update=venv_env,
+                env_update_path=venv_path,
+            ),
+        ]
+
+    version_run.jobs.append(
+        Job(
+            name=f"{version} {command}",
+            args=[str(venv / "bin" / "python"), "-m", "delfino.main", command],
+            dependencies={f"{version} install"},
+            env_update={**venv_env, REPORTS_DIRECTORY_ENV_VAR: reports_directory / version},
+            env_update_path=venv_path,
+        )
+    )
+    return version_run
+
+
+def _print_summary(version_runs: list[_VersionRun]) -> None:
+    rows = [version_run.summary() for version_run in version_runs]
+    lines = format_table(["Python", "Source", "Virtualenv", "Result", "Duration"], rows).splitlines()
+    click.echo("\n".join(lines[:2]))
+    for line, version_run in zip(lines[2:], version_runs):
+        color = Color.GREEN if version_run.command.succeeded else Color.RED
+        click.echo(f"{color}{line}{Style.RESET}")
+
+
+@click.command("matrix")
+@click.argument("command", type=click.Choice(["test", "pytest", "verify"]), default="test")
+@click.option(
+    "-p",
+    "--python",
+    "python_versions",
+    multiple=True,
+    help="Python version to run in, such as 3.12. Can be repeated. By default, the newest patch version of each "
+    "MAJOR.MINOR version satisfying `requires-python` of the project.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of Python versions to run at the same time. All of them by default.",
+)
+@click.option("--rebuild", is_flag=True, help="Install packages again even if a cached virtualenv exists.")
+@pass_plugin_app_context
+def run_matrix(
+    app_context: AppContext[CorePluginConfig],
+    command: str,
+    python_versions: tuple[str, ...],
+    jobs: int | None,
+    rebuild: bool,
+):
+    """Runs test or verify in all Python versions at once.
+
+    - COMMAND: `test` (default), `pytest` or `verify`, run as `delfino COMMAND` in each virtualenv.
+
+    Python versions are found with pyenv and uv. Each of them gets its own virtualenv, kept in
+    ``$XDG_CACHE_HOME/delfino-core/venvs`` per Python version and lock file, so packages are installed
+    again only after the lock file changes. Reports of each version, including coverage and JUnit XML,
+    are written into ``<reports_directory>/matrix/<VERSION>``.
+    """
+    package_manager = app_context.package_manager
+    assert_package_manager_is_known(package_manager)
+    if package_manager not in _INSTALL_COMMANDS:
+        click.secho("No compatible package manager detected.", fg="red", err=True)
+        raise click.Abort()
+    assert_executable_installed(package_manager.value, required_by="matrix")
+    install_command, lock_file = _INSTALL_COMMANDS[package_manager]
+
+    project = app_context.pyproject_toml.project
+    requires_python = (project.model_extra or {}).get("requires-python") if project else None
+    if not (interpreters := select_interpreters(find_interpreters(), python_versions, requires_python)):
+        click.secho("❌ No pyenv or uv Python versions found.", fg="red", err=True)
+        raise click.Abort()
+
+    print_header(f"Running {command} in Python {', '.join(_.version for _ in interpreters)}", icon="🐍")
+
+    venv_store = VenvStore(app_context.project_root, app_context.project_root / lock_file, group="matrix")
+    reports_directory = app_context.plugin_config.reports_directory / "matrix"
+    version_runs = [
+        _version_run(interpreter, venv_store, command, install_command, reports_directory, rebuild)
+        for interpreter in interpreters
+    ]
+
+    run_jobs([job for version_run in version_runs for job in version_run.jobs], max_workers=jobs or len(interpreters))
+
+    for version_run in version_runs:
+        if version_run.install is not None and version_run.install.succeeded:
+            venv_store.mark_complete(version_run.venv)
+            venv_store.prune(keep=version_run.venv)
+
+    _print_summary(version_runs)
+    click.echo(f"Reports of each version are in '{reports_directory}/<VERSION>'.")
+
+    if not all(version_run.command.succeeded for version_run in version_runs):
+        raise click.Abort()
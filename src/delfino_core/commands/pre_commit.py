@@ -4,17 +4,13 @@ from subprocess import PIPE
 import click
 from click import Abort
 from delfino.decorators import files_folders_option, pass_args
-from delfino.execution import OnError, run
+from delfino.execution import OnError
 from delfino.models import AppContext
 from delfino.terminal_output import print_header
-from delfino.validation import assert_pip_package_installed
 
 from delfino_core.config import CorePluginConfig, pass_plugin_app_context
-
-try:
-    import yaml
-except ImportError:
-    pass
+from delfino_core.probes import assert_pip_package_installed
+from delfino_core.telemetry import run
 
 
 def _selected_stages_and_hook(passed_args: list[str]) -> tuple[list[str], str | None]:
@@ -22,6 +18,8 @@ def _selected_stages_and_hook(passed_args: list[str]) -> tuple[list[str], str |
     if not pre_commit_file.is_file():
         raise Abort(f"Pre-commit config file '{pre_commit_file}' not found.")
 
+    import yaml  # noqa: PLC0415 # Deferred, only needed by this command
+
     pre_commit_config = yaml.safe_load(pre_commit_file.read_bytes())
 
     default_stages = pre_commit_config.get("default_stages", [])
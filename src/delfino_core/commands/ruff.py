@@ -1,41 +1,251 @@
 """Linting checks on source code."""
 
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterable
+from fnmatch import fnmatch
+from importlib.metadata import version
 from pathlib import Path
-from subprocess import PIPE
+from typing import Any
 
 import click
 from delfino.decorators import files_folders_option, pass_args
-from delfino.execution import OnError, run
+from delfino.execution import OnError
 from delfino.models import AppContext
-from delfino.validation import assert_pip_package_installed
 
+from delfino_core.backports import toml_loads
+from delfino_core.changed_files import select_changed
 from delfino_core.config import CorePluginConfig, pass_plugin_app_context
-from delfino_core.spinner import Spinner
+from delfino_core.output import CapturedOutput
+from delfino_core.probes import assert_pip_package_installed
+from delfino_core.result_cache import FileState, file_state
+from delfino_core.spinner import Color, Spinner, Style
+from delfino_core.telemetry import run
+from delfino_core.utils import changed_option, ensure_reports_dir
+
+_RUFF_CACHE_FILE = "ruff-cache.json"
+# In order of precedence, as ruff looks them up in each folder
+_RUFF_CONFIG_FILES = (".ruff.toml", "ruff.toml", "pyproject.toml")
+_RUFF_DEFAULT_SUFFIXES = frozenset((".py", ".pyi", ".ipynb"))
+# Include patterns matching files by their suffix anywhere, such as `*.pyw` or `**/*.pyw`
+_SUFFIX_PATTERN = re.compile(r"^(?:\*\*/)?\*(\.[^/*?\[\]]+)$")
+# Ruff's default `exclude` setting
+_RUFF_DEFAULT_EXCLUDE = (
+    ".bzr",
+    ".direnv",
+    ".eggs",
+    ".git",
+    ".git-rewrite",
+    ".hg",
+    ".ipynb_checkpoints",
+    ".mypy_cache",
+    ".nox",
+    ".pants.d",
+    ".pyenv",
+    ".pytest_cache",
+    ".pytype",
+    ".ruff_cache",
+    ".svn",
+    ".tox",
+    ".venv",
+    ".vscode",
+    "__pypackages__",
+    "_build",
+    "buck-out",
+    "dist",
+    "node_modules",
+    "site-packages",
+    "venv",
+)
+
+
+def _run_ruff(args: list[str | Path], spinner: Spinner) -> None:
+    with CapturedOutput() as output:
+        with spinner:
+            results = run(args, stdout=output.stdout, stderr=output.stderr, on_error=OnError.PASS)
+        spinner.print_results(results, output=output)
+
+
+def _run_ruff_all(dirs: list[Path]) -> None:
+    for action, spinner_action in ("check", "checking"), ("format", "formatting"):
+        _run_ruff(["ruff", action, *dirs], Spinner("ruff", f"{spinner_action} code"))
+
+
+def _root_ruff_settings() -> dict[str, Any] | None:
+    """Ruff settings of the project root. None if they can't be read, e.g. because of a TOML syntax error."""
+    for name in _RUFF_CONFIG_FILES:
+        if not (path := Path(name)).is_file():
+            continue
+        try:
+            config = toml_loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if name != "pyproject.toml":
+            return config
+        if "ruff" in (tool := config.get("tool", {})):
+            return tool["ruff"]
+    return {}
+
+
+def _ruff_suffixes(settings: dict[str, Any]) -> frozenset[str] | None:
+    """Suffixes of files ruff checks, including its ``include`` and ``extend-include`` settings.
+
+    None if any of the patterns selects files other than by their suffix, which only ruff can tell.
+    """
+    suffixes = set(_RUFF_DEFAULT_SUFFIXES) if "include" not in settings else set()
+    for pattern in [*settings.get("include", []), *settings.get("extend-include", [])]:
+        if pattern.endswith("pyproject.toml"):  # Ruff checks its own settings in these, unchanged if not dirty
+            continue
+        if not (match := _SUFFIX_PATTERN.match(pattern)):
+            return None
+        suffixes.add(match.group(1))
+    return frozenset(suffixes)
+
+
+def _ruff_excluded_folders(settings: dict[str, Any]) -> tuple[str, ...]:
+    """Patterns of folder names ruff skips by its ``exclude`` and ``extend-exclude`` settings.
+
+    Patterns with a path are left to ruff, which gets `--force-exclude` for files found in them.
+    """
+    patterns = [*settings.get("exclude", _RUFF_DEFAULT_EXCLUDE), *settings.get("extend-exclude", [])]
+    return ("__pycache__", *(pattern.rstrip("/") for pattern in patterns if "/" not in pattern.rstrip("/")))
+
+
+def _walk_targets(
+    dirs: Iterable[Path], suffixes: frozenset[str], excluded_folders: tuple[str, ...] = ()
+) -> tuple[list[Path], list[Path]]:
+    """Files with the suffixes and ruff config files in target folders and their parents, found in a single walk.
+
+    Folders with names matching any of ``excluded_folders`` are not entered.
+    """
+    files: set[Path] = set()
+    config_files: set[Path] = set()
+    for path in dirs:
+        config_files.update(parent / name for parent in path.parents for name in _RUFF_CONFIG_FILES)
+        if not path.is_dir():
+            if path.suffix in suffixes:
+                files.add(path)
+            continue
+        for root, folders, names in os.walk(path):
+            folders[:] = [
+                folder for folder in folders if not any(fnmatch(folder, pattern) for pattern in excluded_folders)
+            ]
+            for name in names:
+                if name in _RUFF_CONFIG_FILES:
+                    config_files.add(Path(root, name))
+                if os.path.splitext(name)[1] in suffixes:
+                    files.add(Path(root, name))
+    return sorted(files), sorted(config_file for config_file in config_files if config_file.is_file())
+
+
+def _ruff_fingerprint(config_files: Iterable[Path]) -> str:
+    """Identify the ruff version and configuration. Any change invalidates the whole cache."""
+    digest = hashlib.sha256(version("ruff").encode())
+    for path in config_files:
+        digest.update(str(path).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _read_ruff_cache(cache_file: Path, fingerprint: str) -> dict[str, FileState]:
+    try:
+        cache = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("fingerprint") != fingerprint:
+        return {}
+    return {path: tuple(state) for path, state in cache.get("files", {}).items()}
+
+
+def _run_ruff_cached(plugin_config: CorePluginConfig, dirs: list[Path]) -> None:
+    """Check and format only files changed since the last clean run.
+
+    Target folders are walked once and ruff gets the changed files explicitly, with `--force-exclude`
+    to keep respecting its `exclude` settings. If all files changed, ruff gets the target folders
+    instead, so that long lists of files don't exceed the limit of command line length. Files are
+    recorded in the cache only after both steps passed, with their state after ruff's fixes and formatting.
+    Files which no longer exist are dropped from the cache.
+
+    Ruff settings including files other than by their suffix can't be followed, so all files are
+    checked then, without the cache.
+    """
+    if (settings := _root_ruff_settings()) is None or (suffixes := _ruff_suffixes(settings)) is None:
+        _run_ruff_all(dirs)
+        return
+
+    files, config_files = _walk_targets(dirs, suffixes, _ruff_excluded_folders(settings))
+    cache_file = plugin_config.reports_directory / _RUFF_CACHE_FILE
+    fingerprint = _ruff_fingerprint(config_files)
+    cached = _read_ruff_cache(cache_file, fingerprint)
+
+    states = {str(path): file_state(path, cached.get(str(path))) for path in files}
+    dirty = [path for path, state in states.items() if cached.get(path, (0, 0, ""))[2] != state[2]]
+
+    # Files outside of the targets stay cached, unless they were deleted
+    kept = {path: state for path, state in cached.items() if path not in states and Path(path).is_file()}
+
+    if not dirty:
+        click.secho(f" {Color.GREEN}✔ {Style.BOLD}ruff{Style.RESET}{Color.GREEN}: no changes since last clean run")
+        if len(kept) + len(states) == len(cached):
+            return
+    elif len(dirty) == len(states):
+        _run_ruff_all(dirs)
+    else:
+        for action, spinner_action in ("check", "checking"), ("format", "formatting"):
+            _run_ruff(
+                ["ruff", action, "--force-exclude", *dirty], Spinner("ruff", f"{spinner_action} {len(dirty)} file(s)")
+            )
+
+    for path in dirty:
+        states[path] = file_state(Path(path), None)
+
+    ensure_reports_dir(plugin_config)
+    cache_file.write_text(
+        json.dumps({"fingerprint": fingerprint, "files": {**kept, **states}}, indent=0), encoding="utf-8"
+    )
 
 
 @click.command("ruff")
 @pass_args
 @files_folders_option
+@changed_option
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Check and format all files, ignoring the cache of files unchanged since the last clean run.",
+)
 @pass_plugin_app_context
-def run_ruff(app_context: AppContext[CorePluginConfig], passed_args: tuple[str, ...], files_folders: tuple[str]):
-    """Run ruff."""
+def run_ruff(
+    app_context: AppContext[CorePluginConfig],
+    passed_args: tuple[str, ...],
+    files_folders: tuple[str],
+    changed: bool,
+    no_cache: bool,
+):
+    """Run ruff.
+
+    Without extra arguments, runs ``ruff check`` and ``ruff format`` only on files changed since the last
+    clean run. Returns immediately, without starting ruff, if there are no such files. The cache is
+    disabled by ``--no-cache`` or the ``result_cache`` config option.
+    """
     assert_pip_package_installed("ruff")
 
     dirs = build_target_paths(app_context, files_folders)
 
+    if changed and (selected := select_changed(dirs, [], include_dependents=False)) is not None:
+        if not selected:
+            click.secho("No changed Python files to check.", fg="green")
+            return
+        dirs = selected
+
     if passed_args:
-        spinner = Spinner("ruff", f"{passed_args[0]}ing code")
-        results = run(
-            ["ruff", *passed_args, *dirs], stdout=PIPE, stderr=PIPE, on_error=OnError.PASS, running_hook=spinner
-        )
-        spinner.print_results(results)
+        _run_ruff(["ruff", *passed_args, *dirs], Spinner("ruff", f"{passed_args[0]}ing code"))
+    elif not no_cache and app_context.plugin_config.result_cache:
+        _run_ruff_cached(app_context.plugin_config, dirs)
     else:
-        for action, spinner_action in ("check", "checking"), ("format", "formatting"):
-            spinner = Spinner("ruff", f"{spinner_action} code")
-            results = run(
-                ["ruff", action, *dirs], stdout=PIPE, stderr=PIPE, on_error=OnError.PASS, running_hook=spinner
-            )
-            spinner.print_results(results)
+        _run_ruff_all(dirs)
 
 
 def build_target_paths(
@@ -1,20 +1,24 @@
+import shutil
 from pathlib import Path
 from subprocess import PIPE
 
 import click
 from delfino.constants import PackageManager
-from delfino.execution import OnError, run
+from delfino.execution import OnError
 from delfino.models import AppContext
 from delfino.terminal_output import print_header
 from delfino.validation import assert_package_manager_is_known, pip_package_installed
 
 from delfino_core.config import CorePluginConfig, pass_plugin_app_context
+from delfino_core.telemetry import run
+from delfino_core.venv_store import VenvStore
 
 
 @click.command("switch-python-version")
 @click.argument("version", type=str)
+@click.option("--rebuild", is_flag=True, help="Install packages again even if a cached virtualenv exists.")
 @pass_plugin_app_context
-def run_switch_python_version(app_context: AppContext[CorePluginConfig], version: str):
+def run_switch_python_version(app_context: AppContext[CorePluginConfig], version: str, rebuild: bool):
     """Switches Python venv to a different Python version.
 
     - VERSION: Desired Python version. You can use only MAJOR.MINOR (for example 3.6).
@@ -22,6 +26,10 @@ def run_switch_python_version(app_context: AppContext[CorePluginConfig], version
     Use this to test the sub-packages with a different Python version. CI pipeline always
     checks all supported versions automatically.
 
+    Virtualenvs are kept in ``$XDG_CACHE_HOME/delfino-core/venvs`` per Python version and lock file,
+    with ``.venv`` being a symlink to one of them. Switching to a version with a virtualenv built
+    for the current lock file only replaces the symlink. Otherwise, a new virtualenv is built.
+
     Notes:
         This task calls `deactivate` as a precaution for cases when the task is called
         from an active virtual environment.
@@ -34,7 +42,7 @@ def run_switch_python_version(app_context: AppContext[CorePluginConfig], version
         key=lambda value: list(map(int, value.split("."))),  # sort numerically
     )
 
-    assert Path(".venv").exists(), "Folder '.venv'."
+    assert Path(".venv").exists() or Path(".venv").is_symlink(), "Folder '.venv'."
 
     for python_version in python_versions:
         if python_version.startswith(version):
@@ -56,19 +64,31 @@ def run_switch_python_version(app_context: AppContext[CorePluginConfig], version
     package_manager = app_context.package_manager
     assert_package_manager_is_known(package_manager)
     if package_manager == PackageManager.POETRY:
-        install_command = "poetry install --no-root"
+        install_command, lock_file = "poetry install --no-root", "poetry.lock"
     elif package_manager == PackageManager.PIPENV:
-        install_command = "pipenv install -d --deploy"
+        install_command, lock_file = "pipenv install -d --deploy", "Pipfile.lock"
     else:
         click.secho("No compatible package manager detected. Skipping package installation.", fg="red", err=True)
         raise click.Abort()
 
-    click.secho("ℹ Removing current virtualenv ...", fg="blue")
-    run("git clean -fxd .venv", stdout=PIPE, stderr=PIPE, on_error=OnError.EXIT)
-
     click.secho(f"ℹ Switching to Python {pyenv_python_version} ...", fg="blue")
     run(["pyenv", "local", pyenv_python_version], stdout=PIPE, stderr=PIPE, on_error=OnError.EXIT)
 
+    venv_store = VenvStore(app_context.project_root, app_context.project_root / lock_file)
+    venv = venv_store.path(pyenv_python_version)
+
+    if not rebuild and venv_store.is_complete(venv):
+        venv_store.activate(venv)
+        click.secho(f"✔ Switched to cached virtualenv '{venv}'.", fg="green")
+        return
+
+    click.secho(f"ℹ Creating virtualenv '{venv}' ...", fg="blue")
+    shutil.rmtree(venv, ignore_errors=True)
+    prefix = run(["pyenv", "prefix", pyenv_python_version], stdout=PIPE, on_error=OnError.EXIT).stdout.decode().strip()
+    python = Path(prefix) / "bin" / "python"
+    run([str(python), "-m", "venv", str(venv)], stdout=PIPE, stderr=PIPE, on_error=OnError.EXIT)
+    venv_store.activate(venv)
+
     click.secho(f"✔ Detected {package_manager.value.capitalize()} package manager.", fg="green")
 
     if not pip_package_installed(package_manager.value, sub_process=True):
@@ -78,3 +98,7 @@ def run_switch_python_version(app_context: AppContext[CorePluginConfig], version
         click.secho(f"✔ {package_manager.value.capitalize()} is installed.", fg="green")
 
     run(install_command, on_error=OnError.EXIT)
+    venv_store.mark_complete(venv)
+
+    for removed in venv_store.prune(keep=venv):
+        click.secho(f"ℹ Removed virtualenv '{removed}' built for a previous lock file.", fg="blue")
@@ -1,22 +1,52 @@
 """Tests on source code."""
 
-import re
+from __future__ import annotations
+
+import configparser
+import functools
+import hashlib
+import json
 import shutil
 import webbrowser
+from collections.abc import Iterable
 from contextlib import suppress
 from itertools import chain
 from pathlib import Path
-from subprocess import PIPE
+from typing import Any
+from xml.etree import ElementTree
 
 import click
 from delfino.decorators import files_folders_option, pass_args
-from delfino.execution import OnError, run
+from delfino.execution import OnError
 from delfino.models import AppContext
 from delfino.terminal_output import print_header, run_command_example
-from delfino.validation import assert_pip_package_installed
 
+from delfino_core.backports import path_is_relative_to, toml_loads
+from delfino_core.changed_files import select_changed
 from delfino_core.config import CorePluginConfig, pass_plugin_app_context
-from delfino_core.utils import commands_group_help, ensure_reports_dir, execute_commands_group
+from delfino_core.parallel import Job, run_jobs
+from delfino_core.probes import assert_pip_package_installed
+from delfino_core.result_cache import cache_result
+from delfino_core.telemetry import run
+from delfino_core.utils import (
+    changed_option,
+    commands_group_help,
+    ensure_reports_dir,
+    execute_commands_group,
+    jobs_option,
+)
+
+try:
+    from coverage import Coverage, CoverageData
+    from coverage import __version__ as coverage_version
+    from coverage.files import GlobMatcher, PathAliases, prep_patterns
+    from coverage.python import PythonFileReporter
+    from coverage.results import Numbers, analysis_from_file_reporter
+except ImportError:
+    pass
+
+_COVERAGE_REPORTS_MANIFEST = "delfino-manifest.json"
+_PYTEST_DEFAULT_PYTHON_FILES = ("test_*.py", "*_test.py")
 
 
 def _delete_coverage_dat_files(reports_directory: Path, test_types: list[str]):
@@ -24,6 +54,119 @@ def _delete_coverage_dat_files(reports_directory: Path, test_types: list[str]):
         with suppress(FileNotFoundError):  # Use `missing_ok=True` from Python 3.8
             (reports_directory / f"coverage{test_type}.dat").unlink()
 
+    for test_type in test_types:
+        for shard_file in _coverage_shard_files(reports_directory, test_type):
+            shard_file.unlink()
+
+
+def _coverage_shard_files(reports_directory: Path, test_type: str) -> list[Path]:
+    """Coverage data files written by individual shards of a test type, see `_run_pytest_sharded`."""
+    return sorted(reports_directory.glob(f"coverage-{test_type}.*.dat"))
+
+
+def _ini_section(path: Path, section: str) -> dict[str, Any] | None:
+    parser = configparser.ConfigParser(interpolation=None)
+    with suppress(configparser.Error):
+        parser.read(path, encoding="utf-8")
+    return dict(parser[section]) if parser.has_section(section) else None
+
+
+def _pytest_ini_options() -> dict[str, Any]:
+    """Options from the pytest config file in the project root, looked up in the same order as pytest does."""
+    for name in ("pytest.ini", ".pytest.ini"):
+        if (path := Path(name)).is_file():
+            return _ini_section(path, "pytest") or {}
+
+    if (path := Path("pyproject.toml")).is_file():
+        with suppress(ValueError):
+            if pytest_table := toml_loads(path.read_text(encoding="utf-8")).get("tool", {}).get("pytest"):
+                return pytest_table.get("ini_options", pytest_table)
+
+    for name, section in ("tox.ini", "pytest"), ("setup.cfg", "tool:pytest"):
+        if (path := Path(name)).is_file() and (options := _ini_section(path, section)) is not None:
+            return options
+
+    return {}
+
+
+def _collect_test_files(tests_directory: Path) -> list[Path]:
+    """Find test files the same way pytest does, by the ``python_files`` option or its default patterns."""
+    python_files = _pytest_ini_options().get("python_files", _PYTEST_DEFAULT_PYTHON_FILES)
+    patterns = python_files.split() if isinstance(python_files, str) else python_files
+    return sorted({path for pattern in patterns for path in tests_directory.rglob(pattern)})
+
+
+def _test_file_from_classname(classname: str) -> Path | None:
+    """Convert JUnit `classname`, such as `tests.unit.test_utils.TestClass`, to a test file path."""
+    parts = classname.split(".")
+    for end in range(len(parts), 0, -1):
+        if (path := Path(*parts[:end]).with_suffix(".py")).is_file():
+            return path
+    return None
+
+
+def _test_file_durations(reports_directory: Path) -> dict[Path, float]:
+    """Sum durations of tests per test file from JUnit XML reports of previous runs."""
+    test_durations: dict[tuple[str, str], tuple[str, float]] = {}
+
+    for junit_file in sorted(reports_directory.glob("junit-*.xml"), key=lambda path: path.stat().st_mtime):
+        with suppress(ElementTree.ParseError):
+            for testcase in ElementTree.parse(junit_file).iter("testcase"):
+                classname = testcase.get("classname", "")
+                test_durations[(classname, testcase.get("name", ""))] = (
+                    testcase.get("file") or classname,
+                    float(testcase.get("time") or 0),
+                )
+
+    file_durations: dict[Path, float] = {}
+    resolved: dict[str, Path | None] = {}
+
+    for file_or_classname, duration in test_durations.values():
+        if file_or_classname not in resolved:
+            if file_or_classname.endswith(".py"):
+                resolved[file_or_classname] = Path(file_or_classname)
+            else:
+                resolved[file_or_classname] = _test_file_from_classname(file_or_classname)
+
+        if (path := resolved[file_or_classname]) is not None:
+            file_durations[path] = file_durations.get(path, 0.0) + duration
+
+    return file_durations
+
+
+def _changed_test_files(plugin_config: CorePluginConfig) -> list[Path] | None:
+    """Test files affected by changes against the trunk branch, or `None` if all tests should run."""
+    selected = select_changed(
+        [plugin_config.sources_directory, plugin_config.tests_directory],
+        [plugin_config.sources_directory, Path()],
+        include_dependents=True,
+    )
+    if selected is None:
+        return None
+
+    test_files = set(_collect_test_files(plugin_config.tests_directory))
+    return [path for path in selected if path in test_files]
+
+
+def _split_into_shards(test_files: list[Path], durations: dict[Path, float], shards: int) -> list[list[Path]]:
+    """Split test files into shards with similar total duration.
+
+    Files without a known duration are assumed to take an average time of known files. Longest files are
+    assigned first, each to the shard with the lowest total duration so far. Empty shards are dropped.
+    """
+    known = [durations[path] for path in test_files if path in durations]
+    default_duration = sum(known) / len(known) if known else 1.0
+
+    totals = [0.0] * shards
+    buckets: list[list[Path]] = [[] for _ in range(shards)]
+
+    for path in sorted(test_files, key=lambda path: durations.get(path, default_duration), reverse=True):
+        index = totals.index(min(totals))
+        buckets[index].append(path)
+        totals[index] += durations.get(path, default_duration)
+
+    return [sorted(bucket) for bucket in buckets if bucket]
+
 
 def _run_pytest(
     app_context: AppContext[CorePluginConfig],
@@ -44,43 +187,91 @@ def _run_pytest(
         return
 
     header_name = f"{name} " if name else ""
-    coverage_name = f"-{name}" if name else ""
+    report_name = f"-{name}" if name else ""
 
     print_header(f"️Running {header_name}tests", icon="🔎🐛")
     ensure_reports_dir(plugin_config)
 
-    args: list[str | None] = [
+    run(
+        _pytest_args(plugin_config, passed_args, files_folders, report_name, junit_report=plugin_config.record_timings),
+        on_error=OnError.ABORT,
+        env_update={"COVERAGE_FILE": plugin_config.reports_directory / f"coverage{report_name}.dat"},
+        env_update_path={"PYTHONPATH": app_context.plugin_config.sources_directory},
+    )
+
+
+def _pytest_args(
+    plugin_config: CorePluginConfig,
+    passed_args: tuple[str, ...],
+    files_folders: Iterable[str | Path],
+    report_name: str,
+    junit_report: bool,
+) -> list[str]:
+    """Arguments of a pytest run. A JUnit XML report records test durations, see `_test_file_durations`."""
+    args: list[str | Path | None] = [
         "pytest",
         "--cov",
         plugin_config.sources_directory,
         "--cov-report",
-        f"xml:{plugin_config.reports_directory / f'coverage{coverage_name}.xml'}",
+        f"xml:{plugin_config.reports_directory / f'coverage{report_name}.xml'}",
         "--cov-branch",
+        *(("--junitxml", plugin_config.reports_directory / f"junit{report_name}.xml") if junit_report else ()),
         "-vv",
         *passed_args,
         *files_folders,
     ]
 
     if plugin_config.pytest_modules:
-        args = (
-            ["python"]
-            + list(chain.from_iterable(("-m", module) for module in plugin_config.pytest_modules))
-            + ["--module"]
-            + args
-        )
+        args = [
+            "python",
+            *chain.from_iterable(("-m", module) for module in plugin_config.pytest_modules),
+            "--module",
+            *args,
+        ]
 
-    run(
-        list(filter(None, args)),
-        on_error=OnError.ABORT,
-        env_update={"COVERAGE_FILE": plugin_config.reports_directory / f"coverage{coverage_name}.dat"},
-        env_update_path={"PYTHONPATH": app_context.plugin_config.sources_directory},
-    )
+    return [str(arg) for arg in args if arg]
+
+
+def _run_pytest_sharded(app_context: AppContext[CorePluginConfig], passed_args: tuple[str, ...], shards: int) -> None:
+    """Run all test types concurrently, each split into up to `shards` shards by test file."""
+    assert_pip_package_installed("pytest")
+    assert_pip_package_installed("pytest-cov")
+    assert_pip_package_installed("coverage")
+
+    plugin_config = app_context.plugin_config
+    reports_directory = plugin_config.reports_directory
+
+    print_header(f"️Running {', '.join(plugin_config.test_types)} tests in {shards} shards", icon="🔎🐛")
+    ensure_reports_dir(plugin_config)
+
+    durations = _test_file_durations(reports_directory)
+    jobs: list[Job] = []
+
+    for test_type in plugin_config.test_types:
+        test_files = _collect_test_files(plugin_config.tests_directory / test_type)
+        test_shards = _split_into_shards(test_files, durations, shards)
+
+        for index, shard_files in enumerate(test_shards):
+            report_name = f"-{test_type}.{index}"
+            jobs.append(
+                Job(
+                    name=f"{test_type} tests ({index + 1}/{len(test_shards)})",
+                    args=_pytest_args(plugin_config, passed_args, shard_files, report_name, junit_report=True),
+                    env_update={"COVERAGE_FILE": reports_directory / f"coverage{report_name}.dat"},
+                    env_update_path={"PYTHONPATH": plugin_config.sources_directory},
+                )
+            )
+
+    # All shards of all test types run at the same time
+    if any(not job.succeeded for job in run_jobs(jobs, max_workers=max(len(jobs), 1))):
+        raise click.Abort()
 
 
 @click.command("pytest-unit", help="Run unit tests.")
 @files_folders_option
 @pass_args
 @pass_plugin_app_context
+@cache_result("pytest")
 def run_pytest_unit(
     app_context: AppContext[CorePluginConfig], passed_args: tuple[str, ...], files_folders: tuple[str, ...]
 ):
@@ -92,6 +283,7 @@ def run_pytest_unit(
 @files_folders_option
 @pass_args
 @pass_plugin_app_context
+@cache_result("pytest")
 def run_pytest_integration(
     app_context: AppContext[CorePluginConfig], passed_args: tuple[str, ...], files_folders: tuple[str, ...]
 ):
@@ -100,77 +292,194 @@ def run_pytest_integration(
     _run_pytest(app_context, passed_args, files_folders, "integration")
 
 
-def _get_total_coverage(coverage_dat: Path) -> str:
-    """Return coverage percentage, as captured in coverage dat file; e.g., returns "100%"."""
-    output = run(
-        "coverage report", stdout=PIPE, env_update={"COVERAGE_FILE": coverage_dat}, on_error=OnError.EXIT
-    ).stdout.decode()
+def _path_aliases() -> PathAliases:
+    """Remapping of measured paths configured in the ``[paths]`` section, as applied by ``coverage combine``."""
+    config = Coverage().config
+    aliases = PathAliases(relative=config.relative_files)
+    for result, *patterns in config.paths.values():
+        for pattern in patterns:
+            aliases.add(pattern, result)
+    return aliases
 
-    if (match := re.search(r"TOTAL.*?([\d.]+%)", output)) is None:
-        raise RuntimeError(f"Regex failed on output: {output}")
-    return match.group(1)
 
+def _read_coverage_data(
+    *coverage_dats: Path, basename: Path | None = None, aliases: PathAliases | None = None
+) -> CoverageData:
+    """Read and merge coverage data files in memory, without modifying them. Paths are remapped by ``aliases``."""
+    data = CoverageData(basename=str(basename) if basename else None, no_disk=basename is None)
+    map_path = functools.cache(aliases.map) if aliases else None
+    for coverage_dat in coverage_dats:
+        part = CoverageData(basename=str(coverage_dat))
+        part.read()
+        data.update(part, map_path=map_path)
+    return data
 
-def _combined_coverage_reports(reports_directory: Path, test_types: list[str]) -> Path:
-    coverage_dat_combined = reports_directory / "coverage.dat"
 
-    coverage_files = []  # we'll make a copy because `combine` will erase them
+class _CoverageTotals:
+    """Computes total coverage of several data sets, parsing each source file only once.
+
+    Files are filtered by ``[report] include/omit`` options the same way as coverage.py reports do.
+    """
+
+    def __init__(self):
+        self._coverage = Coverage()
+        self._file_reporters: dict[str, PythonFileReporter | None] = {}
+        config = self._coverage.config
+        self._include = (
+            GlobMatcher(prep_patterns(config.report_include), "report_include") if config.report_include else None
+        )
+        self._omit = GlobMatcher(prep_patterns(config.report_omit), "report_omit") if config.report_omit else None
+
+    def _reported(self, filename: str) -> bool:
+        if self._include is not None and not self._include.match(filename):
+            return False
+        return self._omit is None or not self._omit.match(filename)
+
+    def _file_reporter(self, filename: str) -> PythonFileReporter | None:
+        if filename not in self._file_reporters:
+            file_reporter = None
+            if Path(filename).is_file() and self._reported(filename):
+                file_reporter = PythonFileReporter(filename, self._coverage)
+            self._file_reporters[filename] = file_reporter
+        return self._file_reporters[filename]
+
+    def total(self, data: CoverageData) -> str:
+        """Return coverage percentage of the data; e.g., returns "100%"."""
+        precision = self._coverage.config.precision
+        numbers = Numbers(precision=precision)
+
+        for filename in data.measured_files():
+            if (file_reporter := self._file_reporter(filename)) is not None:
+                numbers += analysis_from_file_reporter(data, precision, file_reporter, filename).numbers
+
+        return f"{numbers.pc_covered_str}%"
+
+
+def _combined_coverage_reports(reports_directory: Path, test_types: list[str], totals: _CoverageTotals) -> Path:
+    coverage_dat_combined = reports_directory / "coverage.dat"
+    coverage_data = []
+    aliases = _path_aliases()
 
     for test_type in test_types:
-        if not (coverage_dat := reports_directory / f"coverage-{test_type}.dat").exists():
+        coverage_dat = reports_directory / f"coverage-{test_type}.dat"
+
+        if shard_files := _coverage_shard_files(reports_directory, test_type):
+            _read_coverage_data(*shard_files, basename=coverage_dat, aliases=aliases).write()
+            shards_coverage = Coverage(data_file=str(coverage_dat))
+            shards_coverage.load()
+            shards_coverage.xml_report(outfile=str(reports_directory / f"coverage-{test_type}.xml"))
+
+        if not coverage_dat.exists():
             click.secho(
                 f"Could not find coverage dat file for {test_type} tests: {coverage_dat}",
                 fg="yellow",
             )
         else:
-            print(f"{test_type.title()} test coverage: {_get_total_coverage(coverage_dat)}")
-
-            temp_copy = coverage_dat.with_name(coverage_dat.name.replace(".dat", "-copy.dat"))
-            shutil.copy(coverage_dat, temp_copy)
-            coverage_files.append(temp_copy)
+            data = _read_coverage_data(coverage_dat, aliases=aliases)
+            print(f"{test_type.title()} test coverage: {totals.total(data)}")
+            coverage_data.append(data)
 
-    if not coverage_files and coverage_dat_combined.exists():
+    if not coverage_data and coverage_dat_combined.exists():
         click.secho(
             "Could not find coverage dat files for individual tests but combined file exists. Using this file only.",
             fg="yellow",
         )
         return coverage_dat_combined
 
-    run(
-        ["coverage", "combine", *coverage_files],
-        env_update={"COVERAGE_FILE": coverage_dat_combined},
-        stdout=PIPE,
-        on_error=OnError.EXIT,
-    )
+    combined = CoverageData(basename=str(coverage_dat_combined))
+    combined.erase()
+    for data in coverage_data:
+        combined.update(data)
+    combined.write()
 
     return coverage_dat_combined
 
 
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _coverage_reports_manifest(coverage: Coverage) -> dict[str, Any]:
+    """Digests of everything that affects the content of coverage reports."""
+    data = coverage.get_data()
+    files: dict[str, list[str]] = {}
+
+    for filename in sorted(data.measured_files()):
+        if not (path := Path(filename)).is_file():
+            continue
+        measured = data.arcs(filename) if data.has_arcs() else data.lines(filename)
+        files[filename] = [_sha256(path.read_bytes()), _sha256(repr(sorted(measured or [])).encode())]
+
+    config_file = coverage.config.config_file
+
+    return {
+        "coverage_version": coverage_version,
+        "config": _sha256(Path(config_file).read_bytes()) if config_file else "",
+        "files": files,
+    }
+
+
+def _write_coverage_reports(coverage: Coverage, reports_directory: Path, coverage_html: Path, rebuild: bool) -> None:
+    """Write HTML, XML and JSON reports, unless none of their inputs changed since the last run.
+
+    A manifest of source file hashes and per-file coverage digests is kept next to the HTML report.
+    It only decides whether to regenerate the reports at all. If any digest changed, all files are
+    analysed again, and coverage.py itself rewrites only HTML pages of files that changed, plus the index.
+    """
+    manifest_file = coverage_html / _COVERAGE_REPORTS_MANIFEST
+    xml_report = reports_directory / "coverage.xml"
+    json_report = reports_directory / "coverage.json"
+    manifest = _coverage_reports_manifest(coverage)
+
+    if rebuild:
+        shutil.rmtree(coverage_html, ignore_errors=True)
+    elif all(path.exists() for path in (coverage_html / "index.html", xml_report, json_report, manifest_file)):
+        with suppress(ValueError):
+            if json.loads(manifest_file.read_text(encoding="utf-8")) == manifest:
+                click.secho("Coverage reports are up to date.", fg="green")
+                return
+
+    coverage.html_report(directory=str(coverage_html))
+    coverage.xml_report(outfile=str(xml_report))
+    coverage.json_report(outfile=str(json_report))
+    manifest_file.write_text(json.dumps(manifest), encoding="utf-8")
+
+
 @click.command("coverage-report")
+@click.option(
+    "--rebuild",
+    is_flag=True,
+    help="Regenerate all coverage reports from scratch. By default, reports are regenerated only "
+    "if the content or coverage of any source file changed.",
+)
 @pass_plugin_app_context
-def run_coverage_report(app_context: AppContext[CorePluginConfig], **kwargs):
+def run_coverage_report(app_context: AppContext[CorePluginConfig], rebuild: bool, **kwargs):
     """Analyse coverage and generate a term/HTML report.
 
-    Combines all test types.
+    Combines all test types. Also writes combined XML and JSON reports into the reports directory.
     """
     del kwargs  # additional unused arguments passed via `click.invoke` from other commands
     assert_pip_package_installed("coverage")
 
     print_header("Generating coverage report", icon="📃")
     plugin_config = app_context.plugin_config
+    reports_directory = plugin_config.reports_directory
     ensure_reports_dir(plugin_config)
 
-    coverage_dat_combined = _combined_coverage_reports(plugin_config.reports_directory, plugin_config.test_types)
-    coverage_html = plugin_config.reports_directory / "coverage-report/"
+    totals = _CoverageTotals()
+    coverage_dat_combined = _combined_coverage_reports(reports_directory, plugin_config.test_types, totals)
+    coverage_html = reports_directory / "coverage-report/"
 
-    run(
-        ["coverage", "html", "-d", coverage_html],
-        env_update={"COVERAGE_FILE": coverage_dat_combined},
-        stdout=PIPE,
-        on_error=OnError.EXIT,
-    )
+    combined = Coverage(data_file=str(coverage_dat_combined))
+    combined.load()
 
-    print(f"Total coverage: {_get_total_coverage(coverage_dat_combined)}\n")
+    if not combined.get_data().measured_files():
+        click.secho("No coverage data to report.", fg="yellow")
+        return
+
+    _write_coverage_reports(combined, reports_directory, coverage_html, rebuild)
+
+    print(f"Total coverage: {totals.total(combined.get_data())}\n")
     print(
         f"Refer to coverage report for full analysis in '{coverage_html}/index.html'\n"
         f"Or open the report in your default browser with:\n"
@@ -180,9 +489,27 @@ def run_coverage_report(app_context: AppContext[CorePluginConfig], **kwargs):
 
 @click.command("pytest")
 @files_folders_option
+@click.option(
+    "--shards",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Run all test types at the same time, each split into up to this many shards by test file. "
+    "Shards are balanced using durations from JUnit XML reports of previous sharded runs, "
+    "or other runs with ``record_timings`` enabled. "
+    "Ignored when files or folders are given or with ``--changed``.",
+)
+@changed_option
 @pass_plugin_app_context
 @pass_args
-def run_pytest(app_context: AppContext[CorePluginConfig], passed_args: tuple[str, ...], files_folders: tuple[str, ...]):
+@cache_result("pytest")
+def run_pytest(
+    app_context: AppContext[CorePluginConfig],
+    passed_args: tuple[str, ...],
+    files_folders: tuple[str, ...],
+    shards: int,
+    changed: bool,
+):
     """Runs pytest for individual test suites.
 
     Configration in the `pyproject.toml` file under `tool.delfino.plugins.delfino-core`:
@@ -195,20 +522,39 @@ def run_pytest(app_context: AppContext[CorePluginConfig], passed_args: tuple[str
       - `reports_directory`: test coverage information is gathered and stored here.
     """
     _delete_coverage_dat_files(app_context.plugin_config.reports_directory, app_context.plugin_config.test_types)
+
+    if changed and not files_folders and (test_files := _changed_test_files(app_context.plugin_config)) is not None:
+        if not test_files:
+            click.secho("No tests affected by changed files.", fg="green")
+
+        for name in app_context.plugin_config.test_types:
+            test_type_directory = app_context.plugin_config.tests_directory / name
+            if type_files := tuple(str(path) for path in test_files if path_is_relative_to(path, test_type_directory)):
+                _run_pytest(app_context, passed_args, type_files, name)
+        return
+
+    if shards > 1 and not files_folders:
+        _run_pytest_sharded(app_context, passed_args, shards)
+        return
+
     for name in [""] if files_folders else app_context.plugin_config.test_types:
         _run_pytest(app_context, passed_args, files_folders, name)
 
 
 @click.command("test", help=commands_group_help("test"))
 @files_folders_option
+@jobs_option
+@changed_option
 @pass_plugin_app_context
 @click.pass_context
 def run_group_test(
     click_context: click.Context,
     app_context: AppContext[CorePluginConfig],
     files_folders: tuple[Path, ...],
+    jobs: int,
+    changed: bool,
 ):
-    execute_commands_group(click_context, app_context.plugin_config, files_folders=files_folders)
+    execute_commands_group(click_context, app_context.plugin_config, jobs, files_folders=files_folders, changed=changed)
 
 
 @click.command("coverage-open")
@@ -0,0 +1,108 @@
+"""Summary of timings recorded for tools run by other commands."""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import click
+from delfino.models import AppContext
+
+from delfino_core.config import CorePluginConfig, pass_plugin_app_context
+from delfino_core.telemetry import TIMINGS_FILE, read_timings
+from delfino_core.utils import format_table
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile. Always one of the values, so it never reports a duration that did not happen."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+@dataclass
+class TimingSummary:
+    command: str
+    label: str
+    runs: int
+    failed: int
+    p50: float
+    p95: float
+    cpu_p50: float | None
+    max_rss_kib_p95: float | None
+
+
+def summarise_timings(records: Iterable[dict[str, Any]], last: int | None = None) -> list[TimingSummary]:
+    """Summarise records by command and label, in the order the pairs were first seen.
+
+    Args:
+        records: Records from ``timings.jsonl``, oldest first.
+        last: Only consider the last N records of each command and label.
+    """
+    grouped: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        grouped[(record.get("command", ""), record.get("label", ""))].append(record)
+
+    summaries = []
+    for (command, label), group in grouped.items():
+        selected = group[-last:] if last else group
+        durations = [record["duration"] for record in selected]
+        cpu = [record["cpu_user"] + record["cpu_system"] for record in selected if "cpu_user" in record]
+        rss = [record["max_rss_kib"] for record in selected if "max_rss_kib" in record]
+        summaries.append(
+            TimingSummary(
+                command=command,
+                label=label,
+                runs=len(selected),
+                failed=sum(1 for record in selected if record.get("returncode") != 0),
+                p50=_percentile(durations, 50),
+                p95=_percentile(durations, 95),
+                cpu_p50=_percentile(cpu, 50) if cpu else None,
+                max_rss_kib_p95=_percentile(rss, 95) if rss else None,
+            )
+        )
+    return summaries
+
+
+@click.command("timings")
+@click.option("--last", type=click.IntRange(min=1), help="Only summarise the last N runs of each tool.")
+@click.option(
+    "-c",
+    "--command",
+    "commands",
+    multiple=True,
+    help="Only summarise tools run by this command. Can be used multiple times.",
+)
+@pass_plugin_app_context
+def run_timings(app_context: AppContext[CorePluginConfig], last: int | None, commands: tuple[str, ...]):
+    """Summarise timings of tools run by other commands.
+
+    Shows p50 and p95 of wall time, p50 of CPU time and p95 of peak memory per command and tool,
+    across all runs recorded in ``timings.jsonl`` in the reports directory. Recording is controlled
+    by the ``record_timings`` config option.
+    """
+    timings_file = app_context.plugin_config.reports_directory / TIMINGS_FILE
+    records = (record for record in read_timings(timings_file) if not commands or record.get("command") in commands)
+
+    if not (summaries := summarise_timings(records, last)):
+        hint = "" if app_context.plugin_config.record_timings else " Enable the `record_timings` config option."
+        click.secho(f"No timings recorded in '{timings_file}'.{hint}", fg="yellow")
+        return
+
+    header = ["COMMAND", "TOOL", "RUNS", "FAILED", "P50", "P95", "CPU P50", "RSS P95"]
+    rows = [
+        [
+            summary.command,
+            summary.label,
+            str(summary.runs),
+            str(summary.failed),
+            f"{summary.p50:.2f}s",
+            f"{summary.p95:.2f}s",
+            f"{summary.cpu_p50:.2f}s" if summary.cpu_p50 is not None else "-",
+            f"{summary.max_rss_kib_p95 / 1024:.0f} MiB" if summary.max_rss_kib_p95 is not None else "-",
+        ]
+        for summary in summaries
+    ]
+    click.echo(format_table(header, rows))
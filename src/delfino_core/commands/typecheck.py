@@ -1,33 +1,65 @@
 """Type checking on source code."""
 
-from itertools import groupby
+import hashlib
+import json
+import os
 from pathlib import Path
 from subprocess import PIPE
 
 import click
 from delfino.decorators import files_folders_option, pass_args
-from delfino.execution import OnError, run
+from delfino.execution import OnError
 from delfino.models import AppContext
 from delfino.utils import ArgsList
-from delfino.validation import assert_pip_package_installed
 
+from delfino_core.changed_files import select_changed
 from delfino_core.config import CorePluginConfig, pass_plugin_app_context
+from delfino_core.output import CapturedOutput
+from delfino_core.parallel import Job, run_jobs
+from delfino_core.probes import assert_pip_package_installed
+from delfino_core.result_cache import cache_result
 from delfino_core.spinner import Spinner
-from delfino_core.utils import ensure_reports_dir
+from delfino_core.telemetry import run
+from delfino_core.utils import changed_option, ensure_reports_dir
 
 
-def _run_typecheck(
+def _dmypy_fingerprint(flags: ArgsList, mypypath: Path) -> str:
+    """Identifies the configuration a `dmypy` server has been started with."""
+    env_mypypath = str(mypypath) + (f":{os.environ['MYPYPATH']}" if "MYPYPATH" in os.environ else "")
+    return hashlib.sha256(json.dumps([[str(flag) for flag in flags], env_mypypath]).encode()).hexdigest()
+
+
+def _dmypy_args(flags: ArgsList, paths: list[Path], reports_file: Path, mypypath: Path, group: str) -> ArgsList:
+    """Build arguments for `dmypy run`, stopping the daemon first if its configuration has changed.
+
+    `dmypy run` restarts the daemon on its own when mypy flags change, but not when `MYPYPATH` changes,
+    because the daemon keeps the environment it has been started with.
+    """
+    status_file = reports_file.parent / f"dmypy-{group}.json"
+    fingerprint_file = status_file.with_suffix(".fingerprint")
+    status_file.parent.mkdir(parents=True, exist_ok=True)
+
+    fingerprint = _dmypy_fingerprint(flags, mypypath)
+    if status_file.exists() and (not fingerprint_file.exists() or fingerprint_file.read_text() != fingerprint):
+        run(["dmypy", "--status-file", status_file, "stop"], stdout=PIPE, stderr=PIPE, on_error=OnError.PASS)
+    fingerprint_file.write_text(fingerprint)
+
+    return ["dmypy", "--status-file", status_file, "run", "--junit-xml", reports_file, "--", *flags, *paths]
+
+
+def _typecheck_args(
     paths: list[Path],
     strict: bool,
-    reports_file: Path,
+    plugin_config: CorePluginConfig,
     summary_only: bool,
-    mypypath: Path,
     passed_args: tuple[str, ...],
-):
-    spinner = Spinner("mypy", f"checking {'strict' if strict else 'optional'} types")
+    daemon: bool,
+) -> ArgsList:
+    group = "strict" if strict else "nonstrict"
+    mypy_reports_directory = plugin_config.reports_directory / "mypy"
+    reports_file = mypy_reports_directory / f"junit-{group}.xml"
 
-    args: ArgsList = [
-        "mypy",
+    flags: ArgsList = [
         "--show-column-numbers",
         "--show-error-codes",
         "--color-output",
@@ -36,29 +68,77 @@ def _run_typecheck(
         "--color-output",
         "--allow-untyped-decorators",
         "--follow-imports",
-        "silent",
-        "--junit-xml",
-        reports_file,
+        # The daemon doesn't support `silent`. `normal` is the closest one still following imports.
+        "normal" if daemon else "silent",
+        # Each group has its own cache so that groups running concurrently don't overwrite each other's cache
+        "--cache-dir",
+        mypy_reports_directory / f"cache-{group}",
         *passed_args,
     ]
 
     if strict:
-        args.append("--strict")
+        flags.append("--strict")
 
-    args.extend(paths)
+    if daemon:
+        args = _dmypy_args(flags, paths, reports_file, plugin_config.sources_directory, group)
+    else:
+        args = ["mypy", *flags, "--junit-xml", reports_file, *paths]
 
     if summary_only:
         args.extend(["|", "tail", "-n", "1"])
 
-    results = run(
-        args,
-        env_update_path={"MYPYPATH": mypypath},
-        on_error=OnError.PASS,
-        running_hook=spinner,
-        stdout=PIPE,
-        stderr=PIPE,
-    )
-    spinner.print_results(results)
+    return args
+
+
+def _run_typecheck(
+    paths: list[Path],
+    strict: bool,
+    plugin_config: CorePluginConfig,
+    summary_only: bool,
+    passed_args: tuple[str, ...],
+    daemon: bool = False,
+):
+    spinner = Spinner("mypy", f"checking {'strict' if strict else 'optional'} types{' (daemon)' if daemon else ''}")
+
+    with CapturedOutput() as output:
+        with spinner:
+            results = run(
+                _typecheck_args(paths, strict, plugin_config, summary_only, passed_args, daemon),
+                env_update_path={"MYPYPATH": plugin_config.sources_directory},
+                on_error=OnError.PASS,
+                stdout=output.stdout,
+                stderr=output.stderr,
+            )
+        spinner.print_results(results, output=output)
+
+
+def _run_typecheck_groups(
+    paths_by_strictness: dict[bool, list[Path]],
+    plugin_config: CorePluginConfig,
+    summary_only: bool,
+    passed_args: tuple[str, ...],
+    daemon: bool,
+):
+    """Run strict and non-strict groups concurrently, each as a single mypy process."""
+    if not paths_by_strictness:
+        return
+
+    if len(paths_by_strictness) == 1:
+        strict, paths = next(iter(paths_by_strictness.items()))
+        _run_typecheck(paths, strict, plugin_config, summary_only, passed_args, daemon)
+        return
+
+    jobs = [
+        Job(
+            name=f"mypy ({'strict' if strict else 'optional'} types)",
+            args=[str(arg) for arg in _typecheck_args(paths, strict, plugin_config, summary_only, passed_args, daemon)],
+            env_update_path={"MYPYPATH": plugin_config.sources_directory},
+        )
+        for strict, paths in paths_by_strictness.items()
+    ]
+
+    if not all(job.succeeded for job in run_jobs(jobs, max_workers=len(jobs))):
+        raise click.Abort()
 
 
 def is_path_relative_to_paths(path: Path, paths: list[Path]) -> bool:
@@ -71,20 +151,39 @@ def is_path_relative_to_paths(path: Path, paths: list[Path]) -> bool:
     return False
 
 
+def partition_by_strictness(target_paths: list[Path], strict_paths: list[Path]) -> dict[bool, list[Path]]:
+    """Target paths inside and outside of strict directories, in their original order. Empty groups are left out."""
+    paths_by_strictness: dict[bool, list[Path]] = {True: [], False: []}
+    for target_path in target_paths:
+        paths_by_strictness[is_path_relative_to_paths(target_path, strict_paths)].append(target_path)
+    return {strict: paths for strict, paths in paths_by_strictness.items() if paths}
+
+
 @click.command("mypy")
 @click.option(
     "--summary-only",
     is_flag=True,
     help="Suppress error messages and show only summary error count.",
 )
+@click.option(
+    "--daemon/--no-daemon",
+    default=None,
+    help="Use a persistent mypy daemon (dmypy) for each of strict/non-strict groups, making repeated runs "
+    "incremental. Unlike regular runs, also reports errors in imported modules outside the checked paths. "
+    "Defaults to the ``mypy.daemon`` settings option.",
+)
 @files_folders_option
+@changed_option
 @pass_args
 @pass_plugin_app_context
+@cache_result("mypy")
 def run_mypy(
     app_context: AppContext[CorePluginConfig],
     passed_args: tuple[str, ...],
     summary_only: bool,
+    daemon: bool | None,
     files_folders: tuple[str, ...],
+    changed: bool,
 ):
     """Run type checking on source code.
 
@@ -103,21 +202,18 @@ def run_mypy(
             folder for folder in app_context.pyproject_toml.tool.delfino.local_command_folders if folder.exists()
         )
 
-    strict_paths = plugin_config.mypy.strict_directories
-    grouped_paths = groupby(
-        target_paths,
-        lambda current_path: is_path_relative_to_paths(current_path, strict_paths),
+    if changed:
+        selected = select_changed(target_paths, [plugin_config.sources_directory, Path()], include_dependents=True)
+        if selected is not None:
+            if not selected:
+                click.secho("No changed Python files to check.", fg="green")
+                return
+            target_paths = selected
+
+    _run_typecheck_groups(
+        partition_by_strictness(target_paths, plugin_config.mypy.strict_directories),
+        plugin_config,
+        summary_only,
+        passed_args,
+        plugin_config.mypy.daemon if daemon is None else daemon,
     )
-
-    for force_typing, group in grouped_paths:
-        report_filepath = (
-            plugin_config.reports_directory / "mypy" / f"junit-{'strict' if force_typing else 'nonstrict'}.xml"
-        )
-        _run_typecheck(
-            list(group),
-            force_typing,
-            report_filepath,
-            summary_only,
-            plugin_config.sources_directory,
-            passed_args,
-        )
@@ -4,18 +4,20 @@ from subprocess import PIPE
 from typing import Literal
 
 import click
-from delfino import run
 from delfino.decorators import pass_args
 from delfino.execution import OnError
 from delfino.models import AppContext
 
 from delfino_core.config import CorePluginConfig, pass_plugin_app_context
+from delfino_core.pipeline import Step, StepValues, run_pipeline
+from delfino_core.telemetry import run
 from delfino_core.utils import assert_executable_installed
 from delfino_core.vcs_tools import (
     consume_args_until_next_option,
     get_new_branch_name_or_switch_to_branch,
     get_trunk_branch,
     get_vcs_cli_tool,
+    repo_snapshot,
     title_and_branch_prefix_from_issue_tracker,
 )
 
@@ -239,40 +241,116 @@ def run_vcs_mr_start(
     _run_vcs_start(app_context, click_context, passed_args)
 
 
+def _git(*args: str) -> str:
+    return run(["git", *args], stdout=PIPE, stderr=PIPE, on_error=OnError.ABORT).stdout.decode()
+
+
+class _VcsStart:
+    """Steps of `pr start`/`mr start`. Fetching trunk and checking the working tree overlap with the title lookup."""
+
+    def __init__(
+        self,
+        app_context: AppContext[CorePluginConfig],
+        click_context: click.Context,
+        passed_args: tuple[str, ...],
+        vcs_cli_tool: Literal["gh", "glab"],
+    ):
+        self.app_context = app_context
+        self.click_context = click_context
+        self.title, self.args = consume_args_until_next_option(list(passed_args))
+        self.vcs_cli_tool = vcs_cli_tool
+        self.trunk_branch = get_trunk_branch()
+        self.current_branch = repo_snapshot().current_branch
+        self.branch_prefix: str | None = None
+        self.branch_name = ""
+        self.create_branch = False
+
+    def look_up_title(self, _: StepValues):
+        title, self.branch_prefix = title_and_branch_prefix_from_issue_tracker(
+            self.vcs_cli_tool, self.title, self.app_context.plugin_config.vcs
+        )
+        self.title = title
+
+    def name_branch(self, _: StepValues):
+        self.branch_name, self.create_branch = get_new_branch_name_or_switch_to_branch(self.branch_prefix, self.title)
+
+    def update_trunk(self, _: StepValues):
+        # Trunk was fetched in the meantime, so fast-forward is enough unless the local trunk diverged
+        if self.trunk_branch:
+            merge = run(
+                ["git", "merge", "--ff-only", f"origin/{self.trunk_branch}"], stdout=PIPE, on_error=OnError.PASS
+            )
+            if not merge.returncode:
+                return
+        run(["git", "pull"], on_error=OnError.ABORT)
+
+    def empty_commit(self, _: StepValues):
+        # Create an empty commit to be able to create a PR, unless the last commit is already the one
+        if not _git("log", "-1", "--pretty=%B").startswith(self.title):
+            run(["git", "commit", "--allow-empty", "-m", self.title], on_error=OnError.ABORT)
+
+    def create(self, _: StepValues):
+        func = run_gh_pr_create if self.vcs_cli_tool == "gh" else run_glab_mr_create
+        self.click_context.forward(func, passed_args=["--title", self.title, *self.args])
+
+    def if_branch_exists(self, _: StepValues) -> str | None:
+        return None if self.create_branch else "the branch already exists"
+
+    def if_nothing_to_stash(self, values: StepValues) -> str | None:
+        return self.if_branch_exists(values) or (None if values["check working tree"] else "the working tree is clean")
+
+    def if_trunk_unknown(self, _: StepValues) -> str | None:
+        return None if self.trunk_branch else "the trunk branch is unknown"
+
+    def if_on_trunk(self, values: StepValues) -> str | None:
+        on_trunk = self.current_branch == self.trunk_branch
+        return (
+            self.if_branch_exists(values)
+            or self.if_trunk_unknown(values)
+            or ("it is already checked out" if on_trunk else None)
+        )
+
+    def steps(self) -> list[Step]:
+        create = f"create {'PR' if self.vcs_cli_tool == 'gh' else 'MR'}"
+        return [
+            Step(
+                "fetch trunk",
+                lambda _: _git("fetch", "--quiet", "origin", self.trunk_branch),
+                skip=self.if_trunk_unknown,
+            ),
+            Step("check working tree", lambda _: _git("status", "--porcelain", "--untracked-files=no").strip()),
+            Step("look up title", self.look_up_title, interactive=True),
+            Step("name branch", self.name_branch, {"look up title"}, interactive=True),
+            Step("stash", lambda _: _git("stash"), {"name branch", "check working tree"}, self.if_nothing_to_stash),
+            Step("check out trunk", lambda _: _git("checkout", self.trunk_branch), {"stash"}, self.if_on_trunk),
+            Step("update trunk", self.update_trunk, {"check out trunk", "fetch trunk"}, self.if_branch_exists),
+            Step(
+                "create branch",
+                lambda _: _git("checkout", "-b", self.branch_name),
+                {"update trunk"},
+                self.if_branch_exists,
+            ),
+            Step("empty commit", self.empty_commit, {"create branch"}, self.if_branch_exists),
+            Step(
+                "push",
+                lambda _: _git("push", "--set-upstream", "origin", self.branch_name),
+                {"empty commit"},
+                self.if_branch_exists,
+            ),
+            Step(create, self.create, {"push"}),
+            Step(
+                "pop stash",
+                lambda _: _git("stash", "pop"),
+                {create},
+                lambda values: None if "stash" in values else "nothing was stashed",
+            ),
+        ]
+
+
 def _run_vcs_start(
     app_context: AppContext[CorePluginConfig],
     click_context: click.Context,
     passed_args: tuple[str, ...],
     vcs_cli_tool: Literal["gh", "glab"] | None = None,
 ):
-    args = list(passed_args)
-    title, args = consume_args_until_next_option(args)
-    if not vcs_cli_tool:
-        vcs_cli_tool = get_vcs_cli_tool()
-
-    title, branch_prefix = title_and_branch_prefix_from_issue_tracker(
-        vcs_cli_tool, title, app_context.plugin_config.vcs
-    )
-    branch_name, create_branch = get_new_branch_name_or_switch_to_branch(branch_prefix, title)
-
-    if create_branch:
-        run(["git", "stash"], on_error=OnError.ABORT)
-        run(["git", "checkout", get_trunk_branch()], on_error=OnError.ABORT)
-        run(["git", "pull"], on_error=OnError.ABORT)
-        run(["git", "checkout", "-b", branch_name], on_error=OnError.ABORT)
-
-        # Check if last commit messages is not title
-        last_commit_message = run(
-            ["git", "log", "-1", "--pretty=%B"], stdout=PIPE, on_error=OnError.ABORT
-        ).stdout.decode()
-        if not last_commit_message.startswith(title):
-            # Create and empty commit to be able to create a PR
-            run(["git", "commit", "--allow-empty", "-m", title], on_error=OnError.ABORT)
-
-        run(["git", "push", "--set-upstream", "origin", branch_name], on_error=OnError.ABORT)
-
-    # Create the PR using gh
-    func = run_gh_pr_create if vcs_cli_tool == "gh" else run_glab_mr_create
-    click_context.forward(func, passed_args=["--title", title, *args])
-
-    run(["git", "stash", "pop"], on_error=OnError.ABORT)
+    run_pipeline(_VcsStart(app_context, click_context, passed_args, vcs_cli_tool or get_vcs_cli_tool()).steps())
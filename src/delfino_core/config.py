@@ -1,17 +1,26 @@
 import logging
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Annotated
 
 from delfino.decorators import pass_app_context
 from delfino.models.pyproject_toml import PluginConfig
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 _LOG = logging.getLogger(__name__)
 
+# Overrides `reports_directory`, so that sub-processes of the same project can keep their reports apart
+REPORTS_DIRECTORY_ENV_VAR = "DELFINO_CORE_REPORTS_DIRECTORY"
+
 
 class MypyConfig(BaseModel):
     strict_directories: list[Path] = []
+    daemon: bool = Field(
+        False,
+        description="Keep a mypy daemon (dmypy) running for each of strict/non-strict groups "
+        "to speed up repeated runs.",
+    )
 
 
 class IssueTrackingConfig(BaseModel):
@@ -39,6 +48,11 @@ class IssueTrackingConfig(BaseModel):
         f"If not set, '{_DEFAULT_API_KEY_ENV_VAR}' will be used by default.",
     )
 
+    cache_ttl: int = Field(
+        default=24 * 60 * 60,
+        description="How many seconds to cache issue titles for. Set to 0 to disable the cache.",
+    )
+
     @staticmethod
     def _get_env_var(name: str, purpose: str) -> str | None:
         if (value := os.getenv(name)) is None:
@@ -46,11 +60,11 @@ class IssueTrackingConfig(BaseModel):
 
         return value
 
-    @property
+    @cached_property
     def api_key(self) -> str | None:
         return self._get_env_var(self.api_key_env_var, "Issue tracking API key")
 
-    @property
+    @cached_property
     def username(self) -> str | None:
         return self._get_env_var(self.username_env_var, "Issue tracking username")
 
@@ -70,9 +84,29 @@ class CorePluginConfig(PluginConfig):
     test_types: list[str] = ["unit", "integration"]
     verify_commands: tuple[str, ...] = ("ensure-pre-commit", "ruff", "mypy", "test")
     test_commands: tuple[str, ...] = ("pytest", "coverage-report")
+    command_dependencies: dict[str, list[str]] = {
+        "test": ["ensure-pre-commit"],
+        "coverage-report": ["pytest"],
+    }
     disable_pre_commit: bool = False
+    result_cache: bool = Field(
+        True,
+        description="Skip mypy and pytest if they succeeded before with the same arguments, "
+        "config, tool version and input files. Run ruff only on files changed since its last clean run.",
+    )
+    record_timings: bool = Field(
+        False,
+        description="Record duration, exit code, CPU time and peak memory of every tool run "
+        "into `timings.jsonl` in the reports directory. Summarised by the `timings` command.",
+    )
     mypy: Annotated[MypyConfig, Field(default_factory=MypyConfig)]
     vcs: Annotated[VCSConfig, Field(default_factory=VCSConfig)]
 
+    @model_validator(mode="after")
+    def _override_reports_directory(self) -> "CorePluginConfig":
+        if reports_directory := os.getenv(REPORTS_DIRECTORY_ENV_VAR):
+            self.reports_directory = Path(reports_directory)
+        return self
+
 
 pass_plugin_app_context = pass_app_context(plugin_config_type=CorePluginConfig)
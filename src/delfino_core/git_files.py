@@ -0,0 +1,270 @@
+"""Read-only access to git state by reading files in the `.git` directory, without starting git."""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+_MAX_INCLUDE_DEPTH = 10
+_MAX_SYMREF_DEPTH = 5
+_SYMREF_PREFIX = "ref: "
+_HEADS_PREFIX = "refs/heads/"
+_SECTION = re.compile(r'\[\s*([\w.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+_SUBSECTION_ESCAPE = re.compile(r"\\(.)")
+_KEY = re.compile(r"([A-Za-z][\w-]*)\s*(=?)")
+_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", "\\": "\\", '"': '"'}
+_GIT_ENV_VARS = ("GIT_DIR", "GIT_WORK_TREE", "GIT_COMMON_DIR", "GIT_CONFIG_COUNT", "GIT_CONFIG_PARAMETERS")
+
+
+class UnsupportedGitStateError(Exception):
+    """Git state which only git itself can read reliably. Callers fall back to the git binary."""
+
+
+def _read_text(path: Path) -> str | None:
+    """Content of a file, or None if it doesn't exist.
+
+    Raises:
+        UnsupportedGitStateError: The file can't be read or isn't UTF-8, e.g. a Latin-1 user name in a config.
+            Git reads any bytes, so it is left to git.
+    """
+    try:
+        return path.read_bytes().decode("utf-8")
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except (OSError, UnicodeDecodeError) as exc:
+        raise UnsupportedGitStateError(f"Failed to read '{path}': {exc}") from exc
+
+
+def _unescape(text: str, line_number: int, path: Path, value: str = "") -> tuple[str, bool]:
+    """Append a line of a config value without quotes, escapes and comments. Also return if the value continues.
+
+    Whitespace outside quotes is trimmed at both ends and each whitespace character inside is kept as a space.
+    """
+    chars = [value]
+    in_quotes = False
+    spaces = 0
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "\\":
+            if index + 1 == len(text):
+                return "".join(chars) + " " * spaces, True
+            if (escaped := _ESCAPES.get(text[index + 1])) is None:
+                raise UnsupportedGitStateError(f"Invalid escape in {path}:{line_number}.")
+            chars.append(" " * spaces + escaped)
+            spaces = 0
+            index += 2
+            continue
+        if char == '"':
+            in_quotes = not in_quotes
+        elif not in_quotes and char in "#;":
+            break
+        elif not in_quotes and char.isspace():
+            spaces += 1 if any(chars) else 0
+        else:
+            chars.append(" " * spaces + char)
+            spaces = 0
+        index += 1
+    return "".join(chars), False
+
+
+def parse_config(text: str, path: Path) -> Iterator[tuple[str, str]]:
+    """Entries of a git config file as ``section[.subsection].key`` and value pairs, in the file order.
+
+    Section and key names are lower-cased, the same as in the output of ``git config --list``.
+    """
+    section = ""
+    lines = iter(enumerate(text.splitlines(), start=1))
+    for line_number, raw_line in lines:
+        line = raw_line.strip()
+        if match := _SECTION.match(line):
+            name, subsection = match.groups()
+            if subsection is None:
+                name, _, subsection_name = name.partition(".")  # Deprecated `[section.subsection]` syntax
+                section = name.lower() + (f".{subsection_name.lower()}" if subsection_name else "")
+            else:
+                section = f"{name.lower()}." + _SUBSECTION_ESCAPE.sub(r"\1", subsection)
+            line = line[match.end() :].strip()
+
+        if not line or line[0] in "#;":
+            continue
+
+        if not section or not (match := _KEY.match(line)):
+            raise UnsupportedGitStateError(f"Unexpected line in {path}:{line_number}.")
+
+        key, equals = match.groups()
+        if not equals:
+            yield f"{section}.{key.lower()}", "true"
+            continue
+
+        value, continues = _unescape(line[match.end() :], line_number, path)
+        while continues:
+            line_number_continued, line_continued = next(lines, (line_number, ""))
+            value, continues = _unescape(line_continued, line_number_continued, path, value)
+        yield f"{section}.{key.lower()}", value
+
+
+def _wildmatch(pattern: str, text: str, ignore_case: bool = False) -> bool:
+    """Match a path against a pattern, where ``**`` crosses directories and ``*`` doesn't."""
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            regex, index = regex + "(?:.*/)?", index + 3
+        elif pattern.startswith("**", index):
+            regex, index = regex + ".*", index + 2
+        else:
+            char = pattern[index]
+            regex += {"*": "[^/]*", "?": "[^/]"}.get(char, re.escape(char))
+            index += 1
+    return re.fullmatch(regex, text, re.IGNORECASE if ignore_case else 0) is not None
+
+
+@dataclass(frozen=True)
+class GitDir:
+    """A repository found from the current directory.
+
+    Args:
+        path: The git directory of the work tree, e.g. ``.git`` or ``.git/worktrees/<NAME>`` of a linked work tree.
+        common_dir: The git directory shared by all work trees, holding refs and config.
+        work_tree: Root of the work tree.
+    """
+
+    path: Path
+    common_dir: Path
+    work_tree: Path
+
+    @classmethod
+    def discover(cls, start: Path | None = None) -> GitDir:
+        """Find the repository the same way git does, following ``gitdir:`` files of linked work trees and submodules.
+
+        Raises:
+            UnsupportedGitStateError: No repository was found or git environment variables change where it is.
+        """
+        if overrides := [name for name in _GIT_ENV_VARS if name in os.environ]:
+            raise UnsupportedGitStateError(f"Repository location is changed by {', '.join(overrides)}.")
+
+        for folder in [start := (start or Path.cwd()).resolve(), *start.parents]:
+            dot_git = folder / ".git"
+            if dot_git.is_dir():
+                git_dir = dot_git
+            elif dot_git.is_file():
+                content = _read_text(dot_git) or ""
+                if not content.startswith("gitdir:"):
+                    raise UnsupportedGitStateError(f"Unexpected content of '{dot_git}'.")
+                git_dir = (folder / content.removeprefix("gitdir:").strip()).resolve()
+            else:
+                continue
+
+            if not (git_dir / "HEAD").is_file():
+                raise UnsupportedGitStateError(f"'{git_dir}' is not a git directory.")
+            common_dir = git_dir
+            if (common_dir_file := _read_text(git_dir / "commondir")) is not None:
+                common_dir = (git_dir / common_dir_file.strip()).resolve()
+            if (common_dir / "reftable").exists():
+                raise UnsupportedGitStateError("Refs are stored in the reftable format.")
+            return cls(path=git_dir, common_dir=common_dir, work_tree=folder)
+
+        raise UnsupportedGitStateError(f"No git repository found in '{start}' or any parent folder.")
+
+    def _ref_file(self, name: str) -> Path:
+        # HEAD and other pseudo-refs are per work tree, everything under `refs/` is shared
+        return (self.common_dir if name.startswith("refs/") else self.path) / name
+
+    def _packed_refs(self) -> dict[str, str]:
+        refs = {}
+        for line in (_read_text(self.common_dir / "packed-refs") or "").splitlines():
+            if line and line[0] not in "#^":
+                sha, _, name = line.partition(" ")
+                refs[name] = sha
+        return refs
+
+    def symbolic_ref(self, name: str) -> str | None:
+        """Name of the ref a symbolic ref points to, e.g. ``refs/heads/main`` for ``HEAD``. None if not symbolic."""
+        content = (_read_text(self._ref_file(name)) or "").strip()
+        return content.removeprefix(_SYMREF_PREFIX) if content.startswith(_SYMREF_PREFIX) else None
+
+    def read_ref(self, name: str) -> str | None:
+        """Commit a ref points to, following symbolic refs. None if the ref doesn't exist."""
+        for _ in range(_MAX_SYMREF_DEPTH):
+            if (content := _read_text(self._ref_file(name))) is None:
+                return self._packed_refs().get(name)
+            if not (content := content.strip()).startswith(_SYMREF_PREFIX):
+                return content
+            name = content.removeprefix(_SYMREF_PREFIX)
+        raise UnsupportedGitStateError(f"Symbolic ref '{name}' is nested too deep.")
+
+    def current_branch(self) -> str | None:
+        """Name of the checked out branch. None if HEAD is detached."""
+        head = self.symbolic_ref("HEAD")
+        return head.removeprefix(_HEADS_PREFIX) if head and head.startswith(_HEADS_PREFIX) else None
+
+    def branches(self) -> set[str]:
+        """Names of all local branches, loose and packed."""
+        names = {name.removeprefix(_HEADS_PREFIX) for name in self._packed_refs() if name.startswith(_HEADS_PREFIX)}
+        heads = self.common_dir / _HEADS_PREFIX
+        for root, _, files in os.walk(heads):
+            names.update((Path(root) / file).relative_to(heads).as_posix() for file in files)
+        return names
+
+    def _config_files(self) -> list[Path]:
+        """Config files in the order of increasing priority. Only ``/etc/gitconfig`` is read as the system config."""
+        files = []
+        if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+            files.append(Path(os.environ.get("GIT_CONFIG_SYSTEM", "/etc/gitconfig")))
+        if global_config := os.environ.get("GIT_CONFIG_GLOBAL"):
+            files.append(Path(global_config))
+        else:
+            xdg_config_home = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+            files.extend([Path(xdg_config_home) / "git" / "config", Path.home() / ".gitconfig"])
+        files.append(self.common_dir / "config")
+        return files
+
+    def _include_applies(self, condition: str, config_file: Path) -> bool:
+        kind, _, pattern = condition.partition(":")
+        if kind == "onbranch":
+            return (branch := self.current_branch()) is not None and _wildmatch(
+                pattern + "**" if pattern.endswith("/") else pattern, branch
+            )
+        if kind not in {"gitdir", "gitdir/i"}:
+            raise UnsupportedGitStateError(f"Unsupported includeIf condition '{condition}'.")
+
+        if pattern.startswith("~/"):
+            pattern = str(Path.home() / pattern[2:]) + ("/" if pattern.endswith("/") else "")
+        elif pattern.startswith("./"):
+            pattern = str(config_file.parent / pattern[2:]) + ("/" if pattern.endswith("/") else "")
+        elif not pattern.startswith("/"):
+            pattern = "**/" + pattern
+        if pattern.endswith("/"):
+            pattern += "**"
+        return _wildmatch(pattern, self.path.resolve().as_posix(), ignore_case=kind == "gitdir/i")
+
+    def _read_config(self, config_file: Path, config: dict[str, list[str]], depth: int = 0):
+        if depth > _MAX_INCLUDE_DEPTH:
+            raise UnsupportedGitStateError(f"Includes of '{config_file}' are nested too deep.")
+        if (text := _read_text(config_file)) is None:
+            return
+
+        for key, value in parse_config(text, config_file):
+            config.setdefault(key, []).append(value)
+            section, _, name = key.rpartition(".")
+            if name != "path" or not (section == "include" or section.startswith("includeif.")):
+                continue
+            if section == "include" or self._include_applies(section.removeprefix("includeif."), config_file):
+                include = Path(value).expanduser()
+                self._read_config(include if include.is_absolute() else config_file.parent / include, config, depth + 1)
+
+    def config(self) -> dict[str, list[str]]:
+        """All config values by key, the same as ``git config --list`` would show them."""
+        config: dict[str, list[str]] = {}
+        for config_file in self._config_files():
+            self._read_config(config_file, config)
+
+        if config.get("extensions.refstorage", [""])[-1] == "reftable":
+            raise UnsupportedGitStateError("Refs are stored in the reftable format.")
+        if config.get("extensions.worktreeconfig", ["false"])[-1].lower() in {"true", "yes", "on", "1"}:
+            self._read_config(self.path / "config.worktree", config)
+        return config
@@ -0,0 +1,96 @@
+"""Static import graph of Python files, used to find files affected by a change."""
+
+from __future__ import annotations
+
+import ast
+from collections import deque
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from delfino_core.backports import path_is_relative_to
+
+
+def python_files(paths: Iterable[Path]) -> list[Path]:
+    """Expand folders into Python files they contain. Files are kept as they are."""
+    files: set[Path] = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(path.rglob("*.py"))
+            files.update(path.rglob("*.pyi"))
+        elif path.suffix in {".py", ".pyi"}:
+            files.add(path)
+    return sorted(files)
+
+
+def module_name(path: Path, roots: Sequence[Path]) -> str:
+    """Dotted module name of a file, relative to the first root it is in.
+
+    Example:
+        ``src/package/module.py`` with roots ``[Path("src"), Path(".")]`` is ``package.module``.
+    """
+    for root in roots:
+        if path_is_relative_to(path, root):
+            parts = list(path.relative_to(root).with_suffix("").parts)
+            if parts and parts[-1] == "__init__":
+                parts.pop()
+            return ".".join(parts)
+    return ".".join(path.with_suffix("").parts)
+
+
+def _imported_modules(path: Path, name: str) -> set[str]:
+    """Names of all modules a file may import, including parent packages and `from x import submodule`."""
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError, OSError):
+        return set()
+
+    package = name if path.stem == "__init__" else name.rpartition(".")[0]
+    imported: set[str] = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_parts = package.split(".") if package else []
+                base_parts = base_parts[: len(base_parts) - node.level + 1]
+                base = ".".join([*base_parts, node.module] if node.module else base_parts)
+            else:
+                base = node.module or ""
+            if base:
+                imported.add(base)
+            imported.update(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+
+    # Importing `a.b.c` also executes `a/__init__.py` and `a/b/__init__.py`
+    with_parents: set[str] = set()
+    for module in imported:
+        parts = module.split(".")
+        with_parents.update(".".join(parts[:end]) for end in range(1, len(parts) + 1))
+
+    return with_parents
+
+
+class ImportGraph:
+    """Which files import which, limited to the given files."""
+
+    def __init__(self, files: Iterable[Path], roots: Sequence[Path]):
+        self._files_by_module: dict[str, Path] = {module_name(path, roots): path for path in files}
+        self._imported_by: dict[Path, set[Path]] = {path: set() for path in self._files_by_module.values()}
+
+        for name, path in self._files_by_module.items():
+            for imported in _imported_modules(path, name):
+                if (imported_path := self._files_by_module.get(imported)) is not None and imported_path != path:
+                    self._imported_by[imported_path].add(path)
+
+    def dependents(self, changed: Iterable[Path]) -> set[Path]:
+        """Return changed files known to the graph plus all files importing them, directly or transitively."""
+        affected = {path for path in changed if path in self._imported_by}
+        queue = deque(affected)
+
+        while queue:
+            for importer in self._imported_by[queue.popleft()]:
+                if importer not in affected:
+                    affected.add(importer)
+                    queue.append(importer)
+
+        return affected
@@ -0,0 +1,64 @@
+"""Commands registered by name and help only, importing their implementation when they run."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+import click
+
+
+class LazyCommand(click.Command):
+    """A placeholder of a command implemented in a module which is imported only when needed.
+
+    Listing commands (``delfino --help``, shell completion of command names) uses only the name and the short
+    help given here. Anything else, such as running the command, its ``--help`` or reading its parameters,
+    imports the implementation and delegates to it.
+
+    Args:
+        name: Name of the command. Must match the name of the implementation.
+        import_path: Where the implementation is, in the ``module:attribute`` format.
+        short_help: Help shown in the list of commands. Must match the first line of the implementation's help.
+    """
+
+    def __init__(self, name: str, import_path: str, short_help: str):
+        self.import_path = import_path
+        self._command: click.Command | None = None
+        super().__init__(name, help=short_help)
+
+    def load(self) -> click.Command:
+        """Import the implementation of the command."""
+        if self._command is None:
+            module_name, _, attribute = self.import_path.partition(":")
+            command = getattr(import_module(module_name), attribute)
+            if not isinstance(command, click.Command):
+                raise TypeError(f"'{self.import_path}' is not a click command.")
+            self._command = command
+        return self._command
+
+    # `click.Command.__init__` assigns these attributes. Reads go to the implementation, assignments are ignored.
+    @property
+    def params(self) -> list[click.Parameter]:
+        return self.load().params
+
+    @params.setter
+    def params(self, value: list[click.Parameter]):
+        del value
+
+    @property
+    def callback(self):
+        return self.load().callback
+
+    @callback.setter
+    def callback(self, value):
+        del value
+
+    def make_context(self, info_name: str | None, args: list[str], parent: click.Context | None = None, **extra: Any):
+        """Parse arguments with the implementation, which then also handles ``invoke``."""
+        return self.load().make_context(info_name, args, parent, **extra)
+
+    def invoke(self, ctx: click.Context) -> Any:
+        return self.load().invoke(ctx)
+
+    def get_help(self, ctx: click.Context) -> str:
+        return self.load().get_help(ctx)
@@ -0,0 +1,105 @@
+"""Capture of sub-process output with bounded memory usage."""
+
+from __future__ import annotations
+
+import codecs
+import os
+import tempfile
+from collections import deque
+from typing import IO
+
+import click
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class CapturedOutput:
+    """Output of a sub-process, written by the OS straight into temporary files instead of memory.
+
+    Pass ``stdout`` and ``stderr`` to ``run``. Afterward, the output can be streamed, searched
+    or summarised in chunks, without ever holding all of it in memory.
+
+    Example:
+        with CapturedOutput() as output:
+            result = run(["mypy", "src"], stdout=output.stdout, stderr=output.stderr, on_error=OnError.PASS)
+            spinner.print_results(result, output=output)
+
+    Args:
+        merge_stderr: Capture stderr into the same file as stdout, in the order it was written.
+        tail_threshold: Outputs larger than this many bytes are followed by their last lines when echoed,
+            so the end of the output is visible without scrolling.
+        tail_lines: How many of the last lines to repeat.
+    """
+
+    def __init__(self, merge_stderr: bool = False, tail_threshold: int = 1024 * 1024, tail_lines: int = 20):
+        self.stdout: IO[bytes] = tempfile.TemporaryFile()
+        self.stderr: IO[bytes] = self.stdout if merge_stderr else tempfile.TemporaryFile()
+        self.tail_threshold = tail_threshold
+        self.tail_lines = tail_lines
+
+    @property
+    def _files(self) -> list[IO[bytes]]:
+        return [self.stdout] if self.stderr is self.stdout else [self.stdout, self.stderr]
+
+    def close(self):
+        for file in self._files:
+            file.close()
+
+    def __enter__(self) -> CapturedOutput:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def size(self) -> int:
+        return sum(os.fstat(file.fileno()).st_size for file in self._files)
+
+    def _chunks(self, file: IO[bytes]):
+        file.seek(0)
+        while chunk := file.read(_CHUNK_SIZE):
+            yield chunk
+
+    def contains(self, text: str) -> bool:
+        """Whether any of the streams contains the text, searched chunk by chunk."""
+        needle = text.encode()
+        for file in self._files:
+            previous = b""
+            for chunk in self._chunks(file):
+                if needle in previous + chunk:
+                    return True
+                previous = chunk[-len(needle) + 1 :] if len(needle) > 1 else b""
+        return False
+
+    def tail(self) -> list[str]:
+        """Last ``tail_lines`` lines of the output, collected in a ring buffer while reading the files."""
+        last_lines: deque[bytes] = deque(maxlen=self.tail_lines)
+        for file in self._files:
+            file.seek(0)
+            last_lines.extend(file)
+        return [line.decode(errors="replace").rstrip("\r\n") for line in last_lines]
+
+    def read(self) -> bytes:
+        """All the output at once. Use only when the output is known to be small."""
+        return b"".join(chunk for file in self._files for chunk in self._chunks(file))
+
+    def echo(self):
+        """Print all streams in chunks, followed by the last lines if the output is large."""
+        ends_with_newline = True
+
+        for file in self._files:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for chunk in self._chunks(file):
+                if text := decoder.decode(chunk):
+                    click.echo(text, nl=False)
+                    ends_with_newline = text.endswith("\n")
+            if text := decoder.decode(b"", final=True):
+                click.echo(text, nl=False)
+                ends_with_newline = text.endswith("\n")
+            if not ends_with_newline:
+                click.echo()
+                ends_with_newline = True
+
+        if (size := self.size) > self.tail_threshold:
+            click.secho(f"\nLast {self.tail_lines} lines of {size / 1024 / 1024:.1f} MiB output:", bold=True)
+            click.echo("\n".join(self.tail()))
@@ -0,0 +1,155 @@
+"""Concurrent execution of commands with declared dependencies between them."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from subprocess import DEVNULL
+from typing import Any
+
+import click
+from delfino.execution import OnError
+
+from delfino_core.output import CapturedOutput
+from delfino_core.spinner import SpinnerGroup
+from delfino_core.telemetry import run
+
+
+@dataclass
+class Job:
+    """A single command to run in a sub-process as part of a parallel group."""
+
+    name: str
+    args: list[str]
+    returncode: int | None = None
+    output: CapturedOutput | None = None
+    duration: float = 0.0
+    skipped: bool = False
+    dependencies: set[str] = field(default_factory=set)
+    env_update: dict[str, Any] = field(default_factory=dict)
+    env_update_path: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        return self.skipped or self.returncode is not None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.returncode == 0
+
+
+def delfino_args(command: click.Command, kwargs: Mapping[str, Any]) -> list[str]:
+    """Turn keyword arguments of a command back into command line arguments of a `delfino` sub-process.
+
+    Only options known by the command are converted. Unknown keyword arguments are ignored, the same way
+    commands in a group ignore them via `**kwargs`.
+    """
+    args: list[str] = [sys.executable, "-m", "delfino.main", command.name or ""]
+
+    for param in command.params:
+        if not isinstance(param, click.Option) or param.name not in kwargs or not param.opts:
+            continue
+
+        value = kwargs[param.name]
+        option = max(param.opts, key=len)
+
+        if param.is_flag:
+            if value:
+                args.append(option)
+        elif param.multiple:
+            for item in value or ():
+                args.extend([option, str(item)])
+        elif value is not None:
+            args.extend([option, str(value)])
+
+    return args
+
+
+def _run_job(job: Job, click_context: click.Context | None, spinner_group: SpinnerGroup) -> Job:
+    spinner_group.start(job.name)  # Only now, jobs may wait for a free worker
+    job.output = CapturedOutput(merge_stderr=True)
+    start = time.monotonic()
+    # Click keeps the current context per thread. Jobs run in worker threads need it for telemetry.
+    with click_context.scope(cleanup=False) if click_context is not None else nullcontext():
+        result = run(
+            job.args,
+            stdin=DEVNULL,
+            stdout=job.output.stdout,
+            stderr=job.output.stderr,
+            on_error=OnError.PASS,
+            env_update=job.env_update,
+            env_update_path=job.env_update_path,
+            label=job.name,
+        )
+    job.duration = time.monotonic() - start
+    job.returncode = result.returncode
+    return job
+
+
+def _skip_dependents(failed: str, jobs: Mapping[str, Job]) -> None:
+    for job in jobs.values():
+        if failed in job.dependencies and not job.finished:
+            job.skipped = True
+            _skip_dependents(job.name, jobs)
+
+
+def run_jobs(jobs: Iterable[Job], max_workers: int) -> list[Job]:
+    """Run jobs concurrently, respecting their dependencies.
+
+    Progress is shown by a `SpinnerGroup`. Output of each job is buffered and printed in the order
+    the jobs were given, as soon as the job and all the jobs before it have finished. Jobs depending
+    on a failed job are skipped.
+
+    Args:
+        jobs: Jobs to run. Dependencies on jobs not in this collection are ignored.
+        max_workers: Maximum number of jobs running at the same time.
+
+    Returns:
+        Jobs in the original order, with their results filled in. Captured output is already closed.
+
+    Raises:
+        graphlib.CycleError: If the dependencies contain a cycle.
+    """
+    ordered = {job.name: job for job in jobs}
+    for job in ordered.values():
+        job.dependencies &= ordered.keys()
+
+    sorter = TopologicalSorter({name: job.dependencies for name, job in ordered.items()})
+    sorter.prepare()
+
+    running: dict[Future, Job] = {}
+    click_context = click.get_current_context(silent=True)
+
+    try:
+        with SpinnerGroup(ordered) as spinner_group, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while sorter.is_active():
+                for name in sorter.get_ready():
+                    job = ordered[name]
+                    if job.skipped:
+                        spinner_group.skip(name, "a dependency failed")
+                        sorter.done(name)
+                    else:
+                        running[executor.submit(_run_job, job, click_context, spinner_group)] = job
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    future.result()
+                    spinner_group.finish(job.name, job.succeeded, job.duration, job.output or b"")
+                    if not job.succeeded:
+                        _skip_dependents(job.name, ordered)
+                    sorter.done(job.name)
+    finally:
+        for job in ordered.values():
+            if job.output is not None:
+                job.output.close()
+
+    return list(ordered.values())
@@ -0,0 +1,120 @@
+"""Steps of a workflow run as soon as the steps they depend on finish, overlapping independent ones."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+import click
+
+from delfino_core.spinner import Color, Style
+
+# Values returned by finished steps, by step name. Skipped steps have no value.
+StepValues = dict[str, Any]
+
+
+@dataclass
+class Step:
+    """A single step of a pipeline.
+
+    Args:
+        name: Unique name of the step, also used as the key of its value in ``StepValues``.
+        func: Does the work, given values of all steps finished so far.
+        dependencies: Names of steps which must finish or be skipped first. Must be declared before this step.
+        skip: Returns a reason to skip the step, e.g. because it would have no effect. Evaluated after
+            the dependencies finish.
+        interactive: Runs in the main thread, e.g. because it asks the user for input. Other steps run in
+            worker threads, so that they can overlap with each other and with interactive steps.
+    """
+
+    name: str
+    func: Callable[[StepValues], Any]
+    dependencies: set[str] = field(default_factory=set)
+    skip: Callable[[StepValues], str | None] | None = None
+    interactive: bool = False
+
+
+@dataclass
+class StepResult:
+    name: str
+    duration: float = 0.0
+    skip_reason: str | None = None
+
+
+def _in_click_context(click_context: click.Context | None, step: Step, values: StepValues) -> Any:
+    # Click keeps the current context per thread. Steps run in worker threads need it for telemetry.
+    with click_context.scope(cleanup=False) if click_context is not None else nullcontext():
+        return step.func(values)
+
+
+async def _run_step(
+    step: Step,
+    tasks: dict[str, asyncio.Future],
+    values: StepValues,
+    results: list[StepResult],
+    click_context: click.Context | None,
+) -> None:
+    for dependency in step.dependencies:
+        await tasks[dependency]
+
+    if step.skip is not None and (reason := step.skip(values)):
+        results.append(StepResult(step.name, skip_reason=reason))
+        return
+
+    start = time.monotonic()
+    if step.interactive:
+        values[step.name] = step.func(values)
+    else:
+        values[step.name] = await asyncio.to_thread(_in_click_context, click_context, step, values)
+    results.append(StepResult(step.name, duration=time.monotonic() - start))
+
+
+async def _run_steps(steps: list[Step], results: list[StepResult]) -> StepValues:
+    values: StepValues = {}
+    tasks: dict[str, asyncio.Future] = {}
+    click_context = click.get_current_context(silent=True)
+
+    for step in steps:
+        if unknown := step.dependencies - tasks.keys():
+            raise ValueError(f"Step '{step.name}' depends on steps not declared before it: {', '.join(unknown)}")
+        tasks[step.name] = asyncio.ensure_future(_run_step(step, tasks, values, results, click_context))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    return values
+
+
+def print_step_results(results: Iterable[StepResult]) -> None:
+    for result in results:
+        if result.skip_reason is None:
+            click.secho(f" {Color.GREEN}✔ {result.name} ({result.duration:.1f}s){Style.RESET}")
+        else:
+            click.secho(f" {Color.YELLOW}- {result.name} skipped because {result.skip_reason}{Style.RESET}")
+
+
+def run_pipeline(steps: Iterable[Step], report: bool = True) -> StepValues:
+    """Run steps, each as soon as all its dependencies finish or are skipped.
+
+    Args:
+        steps: Steps in an order where each step is declared after its dependencies.
+        report: Print duration of each finished step and reason of each skipped step, in the order they ended.
+
+    Returns:
+        Values returned by the steps.
+    """
+    results: list[StepResult] = []
+    try:
+        return asyncio.run(_run_steps(list(steps), results))
+    finally:
+        if report:
+            print_step_results(results)
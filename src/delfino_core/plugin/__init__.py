@@ -0,0 +1,57 @@
+"""Commands of the plugin, as discovered by delfino via the ``delfino.plugin`` entry point.
+
+Implementations live in ``delfino_core.commands`` and are imported only when a command runs, so listing
+commands and shell completion don't pay for importing all of them and their dependencies. When adding a
+command, add it here too. ``tests/unit/test_plugin_manifest.py`` checks the two stay in sync.
+"""
+
+from delfino_core.lazy_command import LazyCommand
+
+run_coverage_open = LazyCommand(
+    "coverage-open", "delfino_core.commands.test:run_coverage_open", "Open coverage results in default browser."
+)
+run_coverage_report = LazyCommand(
+    "coverage-report",
+    "delfino_core.commands.test:run_coverage_report",
+    "Analyse coverage and generate a term/HTML report.",
+)
+run_dependencies_update = LazyCommand(
+    "dependencies-update",
+    "delfino_core.commands.dependencies_update:run_dependencies_update",
+    "Manages the process of updating dependencies.",
+)
+run_ensure_pre_commit = LazyCommand(
+    "ensure-pre-commit",
+    "delfino_core.commands.pre_commit:run_ensure_pre_commit",
+    "Ensures pre-commit is installed and enabled.",
+)
+run_gh = LazyCommand("gh", "delfino_core.commands.vcs:run_gh", "Extends `gh` or passes through.")
+run_glab = LazyCommand("glab", "delfino_core.commands.vcs:run_glab", "Extends `glab` or passes through.")
+run_matrix = LazyCommand(
+    "matrix", "delfino_core.commands.matrix:run_matrix", "Runs test or verify in all Python versions at once."
+)
+run_mypy = LazyCommand("mypy", "delfino_core.commands.typecheck:run_mypy", "Run type checking on source code.")
+run_pre_commit = LazyCommand(
+    "pre-commit",
+    "delfino_core.commands.pre_commit:run_pre_commit",
+    "Run all pre-commit stages in the current project (alias for `pre-commit run ...`).",
+)
+run_pytest = LazyCommand("pytest", "delfino_core.commands.test:run_pytest", "Runs pytest for individual test suites.")
+run_pytest_integration = LazyCommand(
+    "pytest-integration", "delfino_core.commands.test:run_pytest_integration", "Run integration tests."
+)
+run_pytest_unit = LazyCommand("pytest-unit", "delfino_core.commands.test:run_pytest_unit", "Run unit tests.")
+run_ruff = LazyCommand("ruff", "delfino_core.commands.ruff:run_ruff", "Run ruff.")
+run_switch_python_version = LazyCommand(
+    "switch-python-version",
+    "delfino_core.commands.switch_python_version:run_switch_python_version",
+    "Switches Python venv to a different Python version.",
+)
+run_group_test = LazyCommand("test", "delfino_core.commands.test:run_group_test", "Runs pytest, coverage-report.")
+run_timings = LazyCommand(
+    "timings", "delfino_core.commands.timings:run_timings", "Summarise timings of tools run by other commands."
+)
+run_vcs = LazyCommand("vcs", "delfino_core.commands.vcs:run_vcs", "Alias for `gh`/`glab` with auto-detection.")
+run_group_verify = LazyCommand(
+    "verify", "delfino_core.commands.verify:run_group_verify", "Runs ensure-pre-commit, ruff, mypy, test."
+)
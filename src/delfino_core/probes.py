@@ -0,0 +1,109 @@
+"""Presence checks of executables and Python packages, memoized in the process and between runs."""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from subprocess import run
+from typing import Any
+
+from delfino.validation import pip_package_installed
+
+_PROBES_FILE = "probes.json"
+
+
+@dataclass(frozen=True)
+class ExecutableProbe:
+    path: str
+    version: str
+
+
+# (name, version flags) -> probe, or None when not installed
+_PROBES: dict[tuple[str, tuple[str, ...]], ExecutableProbe | None] = {}
+
+
+def _probes_file() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "delfino-core" / _PROBES_FILE
+
+
+def _read_probes(probes_file: Path) -> dict[str, Any]:
+    try:
+        probes = json.loads(probes_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return probes if isinstance(probes, dict) else {}
+
+
+def _write_probes(probes_file: Path, probes: dict[str, Any]) -> None:
+    """Replace the file atomically, so that concurrent `delfino` processes never read a partial write."""
+    try:
+        probes_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=probes_file.parent, delete=False, encoding="utf-8") as file:
+            json.dump(probes, file, indent=2, sort_keys=True)
+        os.replace(file.name, probes_file)
+    except OSError:  # A read-only home directory only means probing again next time
+        pass
+
+
+def _stat_key(path: str) -> list[int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def probe_executable(name: str, *flags: str) -> ExecutableProbe | None:
+    """Resolved path and version of an executable, or None if it is not installed.
+
+    The version is the first line printed by the executable with ``flags`` (``--version`` by default).
+    Results are memoized in the process. Found executables are also stored in
+    ``$XDG_CACHE_HOME/delfino-core/probes.json``, valid while ``PATH`` and the modification time
+    and size of the executable stay the same. Then no process is started at all.
+    """
+    flags = flags or ("--version",)
+    if (name, flags) in _PROBES:
+        return _PROBES[(name, flags)]
+
+    probes_file = _probes_file()
+    probes = _read_probes(probes_file)
+    key = " ".join([name, *flags])
+    search_path = os.environ.get("PATH", "")
+
+    if (
+        isinstance(cached := probes.get(key), dict)
+        and cached.get("search_path") == search_path
+        and _stat_key(cached.get("path", "")) == cached.get("stat")
+    ):
+        probe: ExecutableProbe | None = ExecutableProbe(path=cached["path"], version=cached["version"])
+    elif (path := shutil.which(name)) is None:
+        probe = None  # Not stored on disk, so that a newly installed executable is found next time
+    else:
+        try:
+            result = run([path, *flags], capture_output=True, check=True)
+        except FileNotFoundError:
+            probe = None
+        else:
+            probe = ExecutableProbe(path=path, version=next(iter(result.stdout.decode().splitlines()), "").strip())
+            probes[key] = {**asdict(probe), "search_path": search_path, "stat": _stat_key(path)}
+            _write_probes(probes_file, probes)
+
+    _PROBES[(name, flags)] = probe
+    return probe
+
+
+@functools.cache
+def package_installed(name: str) -> bool:
+    """Same as ``delfino.validation.pip_package_installed``, memoized in the process."""
+    return pip_package_installed(name)
+
+
+def assert_pip_package_installed(name: str, required_by: str = "this command") -> None:
+    """Same as ``delfino.validation.assert_pip_package_installed``, memoized in the process."""
+    assert package_installed(name), f"Optional Python package '{name}' is required by {required_by} but not installed."
@@ -0,0 +1,171 @@
+"""Persistent cache of successful command results, skipping commands whose inputs did not change."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+import click
+from delfino.models import AppContext
+
+from delfino_core.changed_files import CONFIG_FILES
+from delfino_core.config import CorePluginConfig
+from delfino_core.spinner import Color, Style
+
+_Func = TypeVar("_Func", bound=Callable[..., Any])
+
+# Path -> (mtime in ns, size, sha256 of the content)
+FileState = tuple[int, int, str]
+
+_NO_CACHE = "no_cache"
+
+no_cache_option = click.option(
+    "--no-cache",
+    _NO_CACHE,
+    is_flag=True,
+    help="Run even if the command succeeded before with the same arguments, config, tool and input files.",
+)
+
+# Files in the project root which affect results of any command.
+_ROOT_INPUT_FILES = (*sorted(CONFIG_FILES), "conftest.py")
+
+
+def file_state(path: Path, cached: FileState | None) -> FileState:
+    """Current state of a file. Content is hashed only when modification time or size differ from the cache."""
+    stat = path.stat()
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached
+    return stat.st_mtime_ns, stat.st_size, hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _walk_files(folder: Path, exclude: Path) -> Iterator[Path]:
+    for root, dirs, files in os.walk(folder):
+        root_path = Path(root)
+        dirs[:] = sorted(
+            name for name in dirs if not name.startswith(".") and name != "__pycache__" and root_path / name != exclude
+        )
+        yield from (root_path / name for name in sorted(files))
+
+
+def input_files(app_context: AppContext[CorePluginConfig]) -> list[Path]:
+    """All files which may affect the result of a command: sources, tests, local commands and project config."""
+    plugin_config = app_context.plugin_config
+    folders = [
+        plugin_config.sources_directory,
+        plugin_config.tests_directory,
+        *app_context.pyproject_toml.tool.delfino.local_command_folders,
+    ]
+
+    files: set[Path] = {path for name in _ROOT_INPUT_FILES if (path := Path(name)).is_file()}
+    for folder in folders:
+        if folder.is_dir():
+            files.update(_walk_files(folder, plugin_config.reports_directory))
+    return sorted(files)
+
+
+def _tool_version(tool: str) -> str:
+    try:
+        return version(tool)
+    except PackageNotFoundError:
+        return ""
+
+
+class ResultCache:
+    """Last successful result of a single command, stored in ``reports_directory/cache/<command>.json``."""
+
+    def __init__(self, command: str, tool: str, app_context: AppContext[CorePluginConfig]):
+        self.command = command
+        self.tool = tool
+        self.app_context = app_context
+        self.path = app_context.plugin_config.reports_directory / "cache" / f"{command}.json"
+        self._entry = self._read()
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            entry = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return entry if isinstance(entry, dict) else {}
+
+    def _file_states(self) -> dict[str, FileState]:
+        cached = {path: tuple(state) for path, state in self._entry.get("files", {}).items()}
+        return {
+            str(path): file_state(path, cast(FileState, cached.get(str(path))))
+            for path in input_files(self.app_context)
+        }
+
+    def fingerprint(self, arguments: dict[str, Any], files: dict[str, FileState]) -> str:
+        """Hash of everything the result depends on. Any change in inputs produces a different value."""
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    "command": self.command,
+                    "arguments": arguments,
+                    "config": self.app_context.plugin_config.model_dump(mode="json"),
+                    "tool": [self.tool, _tool_version(self.tool)],
+                    "python": sys.version,
+                    "files": {path: state[2] for path, state in files.items()},
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+    def lookup(self, arguments: dict[str, Any]) -> float | None:
+        """Return duration of the cached successful run, if inputs did not change since."""
+        if not self._entry or self._entry.get("fingerprint") != self.fingerprint(arguments, self._file_states()):
+            return None
+        return float(self._entry.get("duration", 0.0))
+
+    def store(self, arguments: dict[str, Any], duration: float) -> None:
+        """Remember a successful run. Files are hashed after the run, in case the command modified them."""
+        files = self._file_states()
+        self._entry = {"fingerprint": self.fingerprint(arguments, files), "duration": duration, "files": files}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._entry, indent=0), encoding="utf-8")
+
+
+def cache_result(tool: str) -> Callable[[_Func], _Func]:
+    """Skip the decorated command if it succeeded before with the same arguments, config, tool and inputs.
+
+    Must be placed below ``pass_plugin_app_context``. Commands running with ``--no-cache``, or with
+    ``result_cache`` disabled in the config, always run. The ``--no-cache`` option is added to the command,
+    unless the command declares its own ``no_cache`` parameter, e.g. to also bypass other caches.
+
+    Args:
+        tool: Name of the Python package running the checks. Its version is part of the fingerprint.
+    """
+
+    def decorator(func: _Func) -> _Func:
+        declares_no_cache = _NO_CACHE in inspect.signature(func).parameters
+
+        @functools.wraps(func)
+        def new_func(*args, app_context: AppContext[CorePluginConfig], **kwargs):
+            no_cache = kwargs.get(_NO_CACHE) if declares_no_cache else kwargs.pop(_NO_CACHE, False)
+            if not app_context.plugin_config.result_cache or no_cache:
+                return func(*args, app_context=app_context, **kwargs)
+
+            command = click.get_current_context().command.name or func.__name__
+            cache = ResultCache(command, tool, app_context)
+
+            if (duration := cache.lookup(kwargs)) is not None:
+                click.secho(f" {Color.GREEN}cached ✔ {Style.BOLD}{command}{Style.RESET}{Color.GREEN} ({duration:.1f}s)")
+                return None
+
+            start = time.monotonic()
+            result = func(*args, app_context=app_context, **kwargs)
+            cache.store(kwargs, time.monotonic() - start)
+            return result
+
+        return cast(_Func, new_func if declares_no_cache else no_cache_option(new_func))
+
+    return decorator
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import os
+import sys
+import threading
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 from itertools import cycle
 from subprocess import CompletedProcess
 
 import click
 
+from delfino_core.output import CapturedOutput
+
 
 def _spinner(chars: str = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"):
     """A spinner for showing progress."""
@@ -15,11 +21,10 @@ def _spinner(chars: str = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"):
         yield next(frames)
 
 
-def _timer():
-    """A timer which shows total time elapsed on each iteration."""
-    start = time.monotonic()
-    while True:
-        yield f"{time.monotonic() - start:.1f}s"
+def is_interactive() -> bool:
+    """Whether stdout is a terminal able to redraw lines, as opposed to a pipe or a CI log file."""
+    isatty = getattr(sys.stdout, "isatty", None)
+    return bool(isatty and isatty()) and os.environ.get("TERM") != "dumb"
 
 
 @dataclass(frozen=True)
@@ -53,51 +58,258 @@ class BoldColor:
 
 
 class Spinner:
-    def __init__(self, name: str, description: str | None = None, fps: float = 0.05):
+    """Progress of a single running command.
+
+    Use as a context manager around the command. On a terminal, frames are redrawn from a background
+    thread at most once per ``fps`` seconds, while the command itself is waited for without polling.
+    On other outputs, such as CI logs, only a start line and a result line are printed.
+
+    Example:
+        with Spinner("ruff", "checking code") as spinner:
+            results = run(["ruff", "check"], stdout=PIPE, stderr=PIPE, on_error=OnError.PASS)
+        spinner.print_results(results)
+
+    An instance can be also passed as ``running_hook`` to ``delfino.execution.run``. The process is
+    then polled once per ``fps`` seconds.
+    """
+
+    def __init__(self, name: str, description: str | None = None, fps: float = 0.1):
         self.name = name
         self.description = f": {description}" if description else ""
         self.fps = fps
-        self._timer = _timer()
+        self.interactive = is_interactive()
         self._spinner = _spinner()
+        self._start = time.monotonic()
         self._last_timer_msg = ""
+        self._started = False
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
 
-    def __call__(self):
+    def _elapsed(self) -> str:
+        return f"{time.monotonic() - self._start:.1f}s"
+
+    def _render(self):
         self._last_timer_msg = (
-            f"\r {BoldColor.BLUE}{next(self._spinner)} {self.name}{Style.RESET}{Color.BLUE} ({next(self._timer)})"
+            f"\r {BoldColor.BLUE}{next(self._spinner)} {self.name}{Style.RESET}{Color.BLUE} ({self._elapsed()})"
             f"{self.description}{Style.RESET}"
         )
         click.echo(self._last_timer_msg, nl=False)
+
+    def _render_until_stopped(self):
+        while not self._stopped.wait(self.fps):
+            self._render()
+
+    def start(self) -> Spinner:
+        """Start showing progress. Calling it again has no effect."""
+        if self._started:
+            return self
+
+        self._started = True
+        self._start = time.monotonic()
+
+        if self.interactive:
+            self._render()
+            self._thread = threading.Thread(target=self._render_until_stopped, name=f"spinner-{self.name}", daemon=True)
+            self._thread.start()
+        else:
+            click.secho(f" {Color.BLUE}▶ {self.name}{self.description}{Style.RESET}")
+
+        return self
+
+    def stop(self):
+        """Stop redrawing frames. The final result is printed by ``print_results``."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Spinner:
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def __call__(self):
+        """Compatibility with ``running_hook``, which is called in a loop until the process finishes."""
+        self.start()
         time.sleep(self.fps)
 
     def _result_msg(self, color: str) -> str:
         return (
-            f" {Style.BOLD}{self.name}{Style.RESET}{color} ({next(self._timer)}){self.description}{Style.RESET}"
+            f" {Style.BOLD}{self.name}{Style.RESET}{color} ({self._elapsed()}){self.description}{Style.RESET}"
         ).ljust(len(self._last_timer_msg), " ")
 
-    def _print_failure(self, result: CompletedProcess):
-        output = "\n".join(stream.decode() for stream in [result.stdout, result.stderr] if stream)
-        msg = f"{self._result_msg(Color.RED)}\n\n{output}" if output else self._result_msg
-        click.secho(f"\r {Color.RED}✘{msg}")
+    def _print_result(self, msg: str):
+        click.secho(f"\r{msg}" if self.interactive else msg)
+
+    def _print_failure(self, result: CompletedProcess, output: CapturedOutput | None):
+        if output is not None:
+            self._print_result(f" {Color.RED}✘{self._result_msg(Color.RED)}")
+            if output.size:
+                click.echo()
+                output.echo()
+            return
+
+        text = "\n".join(stream.decode() for stream in [result.stdout, result.stderr] if stream)
+        msg = f"{self._result_msg(Color.RED)}\n\n{text}" if text else self._result_msg(Color.RED)
+        self._print_result(f" {Color.RED}✘{msg}")
 
     def _print_success(self):
-        click.secho(f"\r {Color.GREEN}✔{self._result_msg(Color.GREEN)}")
+        self._print_result(f" {Color.GREEN}✔{self._result_msg(Color.GREEN)}")
 
-    def print_results(self, result: CompletedProcess, error_msg_match: str = "", error_cls: type = click.Abort):
+    def print_results(
+        self,
+        result: CompletedProcess,
+        error_msg_match: str = "",
+        error_cls: type = click.Abort,
+        output: CapturedOutput | None = None,
+    ):
         """Prints the result of a command run.
 
         The command must be run with `stdout=PIPE` and `stderr=PIPE` to capture the output
-        and show it after the command has finished.
+        and show it after the command has finished, or with files of ``output``.
 
         Args:
             result: The result of the command.
             error_msg_match: A string to match against the stdout and stderr. If any of the
                 streams contains this string, the command is considered to have failed.
             error_cls: The error to raise if the command failed.
+            output: Output captured into files, streamed in chunks on failure.
         """
-        if result.returncode > 0 or (
-            error_msg_match and (error_msg_match in result.stdout.decode() or error_msg_match in result.stderr.decode())
-        ):
-            self._print_failure(result)
+        self.stop()
+
+        if error_msg_match:
+            if output is not None:
+                matched = output.contains(error_msg_match)
+            else:
+                matched = error_msg_match in result.stdout.decode() or error_msg_match in result.stderr.decode()
+        else:
+            matched = False
+
+        if result.returncode > 0 or matched:
+            self._print_failure(result, output)
             raise error_cls()
 
         self._print_success()
+
+
+@dataclass
+class _Row:
+    name: str
+    started_at: float | None = None
+    result: str | None = None
+    output: bytes | CapturedOutput = b""
+
+
+class SpinnerGroup:
+    """Progress of several commands running at the same time, one row per command.
+
+    On a terminal, rows of unfinished commands are redrawn in place from a background thread. A finished
+    command shows its result in its row. Once all commands declared before it have finished too, its
+    captured output and result are printed above the rows and the row is removed. On other outputs,
+    only the captured output and results are printed, in the declared order.
+
+    Example:
+        with SpinnerGroup(["ruff", "mypy"]) as group:
+            group.start("mypy")
+            ...
+            group.finish("mypy", succeeded=True, duration=1.2, output=b"...")
+    """
+
+    _CURSOR_UP_TO_LINE_START = "\033[{}F"
+    _CLEAR_LINE = "\033[2K"
+    _CLEAR_TO_END = "\033[J"
+
+    def __init__(self, names: Iterable[str], fps: float = 0.1):
+        self.fps = fps
+        self.interactive = is_interactive()
+        self._rows = {name: _Row(name) for name in names}
+        self._spinner = _spinner()
+        self._drawn_lines = 0
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _row_line(row: _Row, frame: str) -> str:
+        if row.result is not None:
+            return row.result
+        if row.started_at is None:
+            return f" {Color.WHITE}· {row.name} (waiting){Style.RESET}"
+        return (
+            f" {BoldColor.BLUE}{frame} {row.name}{Style.RESET}"
+            f"{Color.BLUE} ({time.monotonic() - row.started_at:.1f}s){Style.RESET}"
+        )
+
+    def _clear(self):
+        if self._drawn_lines:
+            click.echo(f"{self._CURSOR_UP_TO_LINE_START.format(self._drawn_lines)}{self._CLEAR_TO_END}", nl=False)
+            self._drawn_lines = 0
+
+    def _redraw(self):
+        with self._lock:
+            if not self.interactive:
+                return
+            frame = next(self._spinner)
+            lines = [self._row_line(row, frame) for row in self._rows.values()]
+            up = self._CURSOR_UP_TO_LINE_START.format(self._drawn_lines) if self._drawn_lines else ""
+            rows = "".join(f"{self._CLEAR_LINE}{line}\n" for line in lines)
+            click.echo(f"{up}{rows}{self._CLEAR_TO_END}", nl=False)
+            self._drawn_lines = len(lines)
+
+    def _redraw_until_stopped(self):
+        while not self._stopped.wait(self.fps):
+            self._redraw()
+
+    def _flush_finished(self):
+        """Print output and results of finished commands with no unfinished command declared before them."""
+        while self._rows and (row := next(iter(self._rows.values()))).result is not None:
+            self._clear()
+            if isinstance(row.output, CapturedOutput):
+                row.output.echo()
+            elif row.output:
+                click.echo(row.output.decode(errors="replace"), nl=not row.output.endswith(b"\n"))
+            click.secho(row.result)
+            del self._rows[row.name]
+
+    def start(self, name: str):
+        """Mark a command as running."""
+        with self._lock:
+            self._rows[name].started_at = time.monotonic()
+            self._redraw()
+
+    def finish(self, name: str, succeeded: bool, duration: float, output: bytes | CapturedOutput = b""):
+        """Mark a command as finished with its captured output."""
+        with self._lock:
+            row = self._rows[name]
+            row.output = output
+            mark = f"{Color.GREEN}✔" if succeeded else f"{Color.RED}✘"
+            row.result = f" {mark} {name} ({duration:.1f}s){Style.RESET}"
+            self._flush_finished()
+            self._redraw()
+
+    def skip(self, name: str, reason: str):
+        """Mark a command as not run."""
+        with self._lock:
+            self._rows[name].result = f" {Color.YELLOW}- {name} skipped because {reason}{Style.RESET}"
+            self._flush_finished()
+            self._redraw()
+
+    def __enter__(self) -> SpinnerGroup:
+        self._redraw()
+        if self.interactive:
+            self._thread = threading.Thread(target=self._redraw_until_stopped, name="spinner-group", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._clear()
+            for row in self._rows.values():  # Commands which never finished, e.g. after an interrupt
+                if row.result is None:
+                    row.result = f" {Color.YELLOW}- {row.name} did not finish{Style.RESET}"
+            self._flush_finished()
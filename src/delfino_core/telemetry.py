@@ -0,0 +1,144 @@
+"""Timing telemetry of sub-processes, recorded as JSON Lines in the reports directory."""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from subprocess import CalledProcessError, CompletedProcess
+from typing import Any
+
+import click
+from delfino import execution
+from delfino.models import AppContext
+from delfino.utils import ArgsType
+
+from delfino_core.config import CorePluginConfig
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+TIMINGS_FILE = "timings.jsonl"
+# Key in `click.Context.meta`, which is shared by all contexts of a single invocation
+_TIMINGS_FILE_META = "delfino_core.timings_file"
+
+
+def _children_usage() -> tuple[float, float, int] | None:
+    """User CPU, system CPU and peak RSS in KiB of all finished child processes so far."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss  # bytes on macOS
+    return usage.ru_utime, usage.ru_stime, max_rss
+
+
+def _label(args: ArgsType) -> str:
+    """Name of the program, e.g. ``mypy`` for ``mypy src`` and ``pytest`` for ``python -m pytest``."""
+    if isinstance(args, bytes):
+        args = args.decode()
+    parts = args.split() if isinstance(args, str) else [str(arg) for arg in args]
+    if len(parts) > 2 and parts[1] == "-m":  # noqa: PLR2004
+        return parts[2]
+    return Path(parts[0]).name if parts else ""
+
+
+def _resolved_timings_file(ctx: click.Context, app_context: AppContext) -> Path | None:
+    """Where to record timings, resolved once per plugin config and kept in the click context. None if disabled."""
+    plugin_config = app_context.plugin_config
+    resolved_config, timings_file = ctx.meta.get(_TIMINGS_FILE_META, (None, None))
+    if resolved_config is plugin_config:
+        return timings_file
+
+    core_config = plugin_config
+    if not isinstance(core_config, CorePluginConfig):  # Not parsed yet if run by commands of other plugins
+        core_config = CorePluginConfig(**core_config.model_dump())
+    timings_file = (core_config.reports_directory / TIMINGS_FILE).absolute() if core_config.record_timings else None
+    ctx.meta[_TIMINGS_FILE_META] = (plugin_config, timings_file)
+    return timings_file
+
+
+def _timings_file() -> tuple[str, Path] | None:
+    """Name of the running command and where to record its timings. None if recording is disabled."""
+    if (ctx := click.get_current_context(silent=True)) is None or (app_context := ctx.find_object(AppContext)) is None:
+        return None
+    if (timings_file := _resolved_timings_file(ctx, app_context)) is None:
+        return None
+    return ctx.command.name or "", timings_file
+
+
+def run(
+    args: ArgsType,
+    *popenargs,
+    label: str | None = None,
+    **kwargs,
+) -> CompletedProcess:
+    """Same as ``delfino.execution.run``, recording duration, exit code and resource usage of the process.
+
+    Records are appended to ``<reports_directory>/timings.jsonl`` when ``record_timings`` is enabled.
+    CPU time and peak RSS come from ``resource.getrusage(RUSAGE_CHILDREN)``. When processes run
+    concurrently, CPU time of processes finishing in the meantime is attributed to each of them and
+    peak RSS is the largest of all processes finished so far.
+
+    Args:
+        args: Program to run with all its arguments.
+        *popenargs: Passed to ``delfino.execution.run``.
+        label: Name of the process in the timings summary. Defaults to the program name.
+        **kwargs: Passed to ``delfino.execution.run``.
+    """
+    if (target := _timings_file()) is None:
+        return execution.run(args, *popenargs, **kwargs)
+
+    command, timings_file = target
+
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    usage_before = _children_usage()
+    returncode: int | None = None
+
+    try:
+        result = execution.run(args, *popenargs, **kwargs)
+        returncode = result.returncode
+        return result
+    except (click.exceptions.Exit, click.Abort) as exc:  # Raised by `OnError.EXIT` and `OnError.ABORT`
+        if isinstance(exc.__cause__, CalledProcessError):
+            returncode = exc.__cause__.returncode
+        raise
+    finally:
+        record: dict[str, Any] = {
+            "command": command,
+            "label": label or _label(args),
+            "argv": [str(arg) for arg in args] if isinstance(args, (list, tuple)) else str(args),
+            "start": started_at.isoformat(),
+            "end": datetime.now(timezone.utc).isoformat(),
+            "duration": round(time.monotonic() - start, 3),
+            "returncode": returncode,
+        }
+        if usage_before is not None and (usage_after := _children_usage()) is not None:
+            record["cpu_user"] = round(usage_after[0] - usage_before[0], 3)
+            record["cpu_system"] = round(usage_after[1] - usage_before[1], 3)
+            record["max_rss_kib"] = usage_after[2]
+
+        timings_file.parent.mkdir(parents=True, exist_ok=True)
+        with timings_file.open("a", encoding="utf-8") as file:  # One write per line keeps concurrent appends whole
+            file.write(json.dumps(record) + "\n")
+
+
+def read_timings(timings_file: Path) -> Iterator[dict[str, Any]]:
+    """Parse recorded timings, skipping lines which are not valid JSON objects (e.g. cut by an interrupt)."""
+    try:
+        lines = timings_file.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return
+
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            yield record
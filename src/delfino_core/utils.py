@@ -1,6 +1,6 @@
 from collections import ChainMap
+from collections.abc import Sequence
 from logging import getLogger
-from subprocess import PIPE, run
 from typing import cast
 
 import click
@@ -9,6 +9,8 @@ from delfino.decorators.files_folders import FILES_FOLDERS_OPTION_CALLBACK
 from delfino.decorators.pass_args import PASS_ARGS_CALLBACK
 
 from delfino_core.config import CorePluginConfig
+from delfino_core.parallel import Job, delfino_args, run_jobs
+from delfino_core.probes import probe_executable
 
 _LOG = getLogger(__name__)
 
@@ -23,11 +25,33 @@ def commands_group_help(name: str) -> str:
     return f"Runs {command_names}.\n\nConfigured by the ``{name}_commands`` settings option."
 
 
-def execute_commands_group(click_context: click.Context, plugin_config: CorePluginConfig, **kwargs):
+jobs_option = click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of commands to run concurrently. Output of each command is buffered and shown in order. "
+    "Order of commands is constrained by the ``command_dependencies`` settings option.",
+)
+
+
+changed_option = click.option(
+    "--changed",
+    is_flag=True,
+    help="Check only files changed against the trunk branch, including staged, unstaged and untracked changes. "
+    "Type checking and tests also include files importing the changed files.",
+)
+
+
+def execute_commands_group(click_context: click.Context, plugin_config: CorePluginConfig, jobs: int = 1, **kwargs):
     """Executes a group of commands.
 
     Group default commands are defined in `delfino_core.config.CorePluginConfig.<NAME>_commands`.
     They can be overridden by `<NAME>_commands` option in the `pyproject.toml` config.
+
+    With more than one job, commands are run as `delfino` sub-processes in parallel, ordered
+    only by `delfino_core.config.CorePluginConfig.command_dependencies`.
     """
     root = get_root_command(click_context)
     if (name := click_context.command.name) is None:
@@ -40,6 +64,8 @@ def execute_commands_group(click_context: click.Context, plugin_config: CorePlug
         for command in root.list_commands(click_context)
     }
 
+    selected: list[click.Command] = []
+
     for target_name in getattr(plugin_config, option_name):
         if target_name not in commands:
             _LOG.warning(
@@ -51,8 +77,13 @@ def execute_commands_group(click_context: click.Context, plugin_config: CorePlug
             _LOG.debug(f"Skipping disabled command '{target_name}'.")
             continue
 
-        command = commands[target_name]
+        selected.append(commands[target_name])
+
+    if jobs > 1:
+        _execute_commands_in_parallel(selected, plugin_config, jobs, **kwargs)
+        return
 
+    for command in selected:
         parameter_from_config = ChainMap(
             *(
                 callback.parameter_from_config_in_group(click_context, command)
@@ -60,19 +91,42 @@ def execute_commands_group(click_context: click.Context, plugin_config: CorePlug
             )
         )
 
-        click_context.forward(command, **kwargs, **parameter_from_config)
+        # Not `click_context.forward`, which would pass all parameters of the group, such as `jobs`, to every
+        # command. Only parameters the command accepts are passed, so that options of the group don't break it.
+        command_kwargs = {name: value for name, value in kwargs.items() if name in _param_names(command)}
+        click_context.invoke(command, **command_kwargs, **parameter_from_config)
+
+
+def _param_names(command: click.Command) -> set[str]:
+    return {param.name for param in command.params if param.name}
+
+
+def _execute_commands_in_parallel(
+    commands: list[click.Command], plugin_config: CorePluginConfig, jobs: int, **kwargs
+) -> None:
+    results = run_jobs(
+        (
+            Job(
+                name=command.name or "",
+                args=delfino_args(command, kwargs),
+                dependencies=set(plugin_config.command_dependencies.get(command.name or "", [])),
+            )
+            for command in commands
+        ),
+        max_workers=jobs,
+    )
+
+    if failed := [job.name for job in results if not job.succeeded]:
+        click.secho(f"Failed or skipped commands: {', '.join(failed)}", fg="red")
+        raise click.exceptions.Exit(code=1)
 
 
 def executable_installed(name: str, *flags: str) -> bool:
-    """Returns True if the executable is installed."""
-    if not flags:
-        flags = ("--version",)
+    """Returns True if the executable is installed.
 
-    try:
-        run([name, *flags], stdout=PIPE, check=True)
-    except FileNotFoundError:
-        return False
-    return True
+    Probes are memoized, see `delfino_core.probes.probe_executable`.
+    """
+    return probe_executable(name, *flags) is not None
 
 
 def assert_executable_installed(name: str, *flags: str, required_by: str = "this command") -> None:
@@ -81,5 +135,13 @@ def assert_executable_installed(name: str, *flags: str, required_by: str = "this
     )
 
 
+def format_table(header: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
+    """Plain text table with left-aligned columns and a line under the header."""
+    widths = [max(len(row[index]) for row in [header, *rows]) for index in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [header, *rows]]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
 def ask(question: str) -> bool:
     return not bool(input(f"\033[1;33m{question} [Y/n]: \033[0m").lower() == "n")
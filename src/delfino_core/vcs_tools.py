@@ -2,30 +2,173 @@ from __future__ import annotations
 
 import logging
 import re
+from dataclasses import dataclass, field
 from functools import lru_cache
+from pathlib import Path
 from subprocess import PIPE
 from typing import Literal
 
-from delfino import run
 from delfino.execution import OnError
-from delfino.validation import assert_pip_package_installed
 
 from delfino_core.commands.issue_tracker import JiraClient
 from delfino_core.config import VCSConfig
+from delfino_core.git_files import GitDir, UnsupportedGitStateError
+from delfino_core.probes import assert_pip_package_installed
+from delfino_core.telemetry import run
 from delfino_core.utils import ask, assert_executable_installed
 
+_ORIGIN_HEAD = "refs/remotes/origin/HEAD"
+_ORIGIN_PREFIX = "refs/remotes/origin/"
+_HEADS_PREFIX = "refs/heads/"
+_REFS_FORMAT = "%(HEAD)%00%(refname)%00%(symref)"
+_LOGGER = logging.getLogger(__name__)
+_INVALID_BRANCH_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_/-]+")
 
-@lru_cache(maxsize=1)
-def get_trunk_branch():
-    """To dynamically figure out if it's `main`, `master` or something else."""
-    ref = run(["git", "symbolic-ref", "refs/remotes/origin/HEAD"], stdout=PIPE, on_error=OnError.PASS)
 
-    # The ref is expected to be like 'refs/remotes/origin/main'
-    return ref.stdout.decode().strip().split("/")[-1]
+@dataclass(frozen=True)
+class RepoSnapshot:
+    """Git metadata read at once, instead of starting a git process for each piece of it.
+
+    Use ``repo_snapshot()`` to get the snapshot of the current repository, taken once per process.
+    It reflects the state at the time it was taken. Use ``RepoSnapshot.take()`` to read the state
+    again after the repository is modified.
+    """
+
+    trunk_branch: str = ""
+    current_branch: str | None = None
+    local_branches: frozenset[str] = frozenset()
+    remote_urls: tuple[str, ...] = ()
+    config: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_git_output(cls, config_output: str, refs_output: str) -> RepoSnapshot:
+        """Parse ``git config --list -z`` and ``git for-each-ref`` with the ``_REFS_FORMAT``."""
+        config: dict[str, list[str]] = {}
+        for entry in config_output.split("\0"):
+            if entry:
+                key, _, value = entry.partition("\n")
+                config.setdefault(key, []).append(value)
+
+        trunk_branch = ""
+        current_branch = None
+        local_branches = set()
+        for line in refs_output.splitlines():
+            head, refname, symref = line.split("\0")
+            if refname == _ORIGIN_HEAD:
+                trunk_branch = symref.removeprefix(_ORIGIN_PREFIX)
+            elif refname.startswith(_HEADS_PREFIX):
+                local_branches.add(refname.removeprefix(_HEADS_PREFIX))
+                if head == "*":
+                    current_branch = refname.removeprefix(_HEADS_PREFIX)
+
+        return cls(
+            trunk_branch=trunk_branch,
+            current_branch=current_branch,
+            local_branches=frozenset(local_branches),
+            remote_urls=_remote_urls(config),
+            config=config,
+        )
+
+    @classmethod
+    def from_git_dir(cls, git_dir: GitDir) -> RepoSnapshot:
+        """Read files in the ``.git`` directory."""
+        config = git_dir.config()
+        return cls(
+            trunk_branch=(git_dir.symbolic_ref(_ORIGIN_HEAD) or "").removeprefix(_ORIGIN_PREFIX),
+            current_branch=git_dir.current_branch(),
+            local_branches=frozenset(git_dir.branches()),
+            remote_urls=_remote_urls(config),
+            config=config,
+        )
+
+    @classmethod
+    def take(cls) -> RepoSnapshot:
+        """Snapshot of the repository in the current directory.
+
+        Read from files in the ``.git`` directory, without starting any process. If the repository
+        is in a state only git can read, taken with two git processes instead.
+        """
+        try:
+            return cls.from_git_dir(GitDir.discover())
+        except UnsupportedGitStateError as exc:
+            _LOGGER.debug(f"Reading git state with git, because: {exc}")
+
+        config_output = run(["git", "config", "--list", "-z"], stdout=PIPE, stderr=PIPE, on_error=OnError.PASS)
+        refs_output = run(
+            ["git", "for-each-ref", f"--format={_REFS_FORMAT}", "refs/heads", _ORIGIN_HEAD],
+            stdout=PIPE,
+            stderr=PIPE,
+            on_error=OnError.PASS,
+        )
+        # Config values are bytes to git, which doesn't require any encoding
+        return cls.from_git_output(
+            config_output.stdout.decode(errors="replace") if config_output.returncode == 0 else "",
+            refs_output.stdout.decode(errors="replace") if refs_output.returncode == 0 else "",
+        )
+
+    def config_value(self, key: str) -> str:
+        """Last value of a config key, which is the one git uses. Empty string if not set."""
+        return values[-1] if (values := self.config.get(key)) else ""
+
+
+def _remote_urls(config: dict[str, list[str]]) -> tuple[str, ...]:
+    return tuple(
+        url
+        for key, values in config.items()
+        if key.startswith("remote.") and key.endswith((".url", ".pushurl"))
+        for url in values
+    )
 
 
-_LOGGER = logging.getLogger(__name__)
-_INVALID_BRANCH_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_/-]+")
+@lru_cache(maxsize=1)
+def repo_snapshot() -> RepoSnapshot:
+    """Snapshot of the repository in the current directory, taken once per process."""
+    return RepoSnapshot.take()
+
+
+def get_trunk_branch() -> str:
+    """To dynamically figure out if it's `main`, `master` or something else."""
+    return repo_snapshot().trunk_branch
+
+
+def parse_name_status(output: str) -> list[Path]:
+    """Paths from ``git diff --name-status -z``, including both old and new paths of renamed or copied files."""
+    paths: list[Path] = []
+    fields = iter(output.split("\0"))
+    for status in fields:
+        if not status:
+            continue
+        paths.append(Path(next(fields)))
+        if status[0] in "RC":
+            paths.append(Path(next(fields)))
+    return paths
+
+
+def get_changed_files() -> list[Path]:
+    """Files changed against the trunk branch, including staged, unstaged and untracked files.
+
+    Paths are relative to the current working directory and limited to it. Deleted files and old paths
+    of renamed files are included, because files importing them are affected too. They don't exist anymore,
+    so callers checking files must leave them out. If the trunk branch cannot be determined, only uncommitted
+    changes are returned.
+    """
+    base = "HEAD"
+    if trunk_branch := get_trunk_branch():
+        merge_base = run(
+            ["git", "merge-base", "HEAD", f"origin/{trunk_branch}"], stdout=PIPE, stderr=PIPE, on_error=OnError.PASS
+        )
+        if merge_base.returncode == 0:
+            base = merge_base.stdout.decode().strip()
+
+    diff = run(["git", "diff", "--name-status", "-z", "--relative", base], stdout=PIPE, on_error=OnError.ABORT)
+    untracked = run(["git", "ls-files", "--others", "--exclude-standard", "-z"], stdout=PIPE, on_error=OnError.ABORT)
+
+    return sorted(
+        {
+            *parse_name_status(diff.stdout.decode()),
+            *(Path(path) for path in untracked.stdout.decode().split("\0") if path),
+        }
+    )
 
 
 def consume_args_until_next_option(passed_args: list[str]) -> tuple[str, list[str]]:
@@ -41,7 +184,7 @@ def _sanitize_branch_name(branch_name: str) -> str:
 
 def _get_user_name() -> str:
     # Get the current username from git config
-    username = run(["git", "config", "user.email"], stdout=PIPE, on_error=OnError.ABORT).stdout.decode().strip()
+    username = repo_snapshot().config_value("user.email").strip()
 
     if not username:  # If not available, use the system username
         _LOGGER.warning("No git user.email found, using system username.")
@@ -62,13 +205,11 @@ def get_new_branch_name_or_switch_to_branch(branch_prefix: str | None, title: st
 
     branch_name = branch_prefix + _sanitize_branch_name(title)
 
-    # Check if not already on the branch
-    branch_exists = (
-        run(["git", "branch", "--list", branch_name], stdout=PIPE, on_error=OnError.PASS).stdout.decode().strip()
-    )
+    snapshot = repo_snapshot()
+    branch_exists = branch_name in snapshot.local_branches
 
     if branch_exists:
-        if branch_exists.startswith("* "):
+        if snapshot.current_branch == branch_name:  # Check if not already on the branch
             _LOGGER.warning(f"Already on branch '{branch_name}'.")
         else:
             _LOGGER.warning(f"Branch '{branch_name}' already exists, switching to it.")
@@ -88,7 +229,7 @@ def get_new_branch_name_or_switch_to_branch(branch_prefix: str | None, title: st
 @lru_cache(maxsize=1)
 def get_vcs_cli_tool() -> Literal["gh", "glab"]:
     """Determine if `gh` or `glab` should be used."""
-    remote_url = run(["git", "remote", "-v"], stdout=PIPE, on_error=OnError.PASS).stdout.decode()
+    remote_url = " ".join(repo_snapshot().remote_urls)
 
     if "github" in remote_url:
         return "gh"
@@ -122,7 +263,8 @@ def title_and_branch_prefix_from_issue_tracker(
         pass
 
     if issue_number is not None:
-        issue_title = JiraClient(command_config.issue_tracking).get_issue_title(issue_number).lower()
+        with JiraClient(command_config.issue_tracking) as client:
+            issue_title = client.get_issue_title(issue_number).lower()
         title = f"{command_config.issue_tracking.issue_prefix}{issue_number}/{issue_title}"
         branch_prefix = ""  # allow completely custom branch name
 
@@ -0,0 +1,78 @@
+"""Virtual environments of a project kept per Python version and lock file, swapped in as `.venv`."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+_COMPLETE_MARKER = ".delfino-complete"
+
+
+class VenvStore:
+    """Virtual environments of a project in ``$XDG_CACHE_HOME/delfino-core/venvs``.
+
+    Each environment is stored under a key of the Python version and a hash of the lock file. The project's
+    `.venv` is a symlink to one of them, so switching to an already built environment only replaces
+    the symlink. Tools installing into the environment do it through `.venv`, so that paths they write
+    into it stay valid for whichever environment `.venv` points to.
+
+    Args:
+        project_root: Folder with the `.venv` of the project.
+        lock_file: File which determines installed packages, e.g. ``poetry.lock``.
+        group: Keep environments in a sub-folder, apart from the ones `.venv` points to. Used for environments
+            installed and used directly from the store, where paths written into them point to the store.
+    """
+
+    def __init__(self, project_root: Path, lock_file: Path, group: str | None = None):
+        self.venv = project_root / ".venv"
+        self.lock_file = lock_file
+        project_hash = hashlib.sha256(str(project_root.resolve()).encode()).hexdigest()[:16]
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        self.directory = Path(cache_home) / "delfino-core" / "venvs" / f"{project_root.resolve().name}-{project_hash}"
+        if group:
+            self.directory /= group
+
+    def _lock_hash(self) -> str:
+        content = self.lock_file.read_bytes() if self.lock_file.is_file() else b""
+        return hashlib.sha256(content).hexdigest()[:16]
+
+    def path(self, python_version: str) -> Path:
+        """Where the environment for the Python version and the current lock file is stored."""
+        return self.directory / f"{python_version}-{self._lock_hash()}"
+
+    @staticmethod
+    def is_complete(path: Path) -> bool:
+        return (path / _COMPLETE_MARKER).is_file()
+
+    @staticmethod
+    def mark_complete(path: Path) -> None:
+        """Mark an environment as fully installed, so it can be switched to."""
+        (path / _COMPLETE_MARKER).touch()
+
+    def remove_unmanaged(self) -> None:
+        """Remove `.venv` which is a folder, not a symlink to the store.
+
+        It's not known which lock file its packages were installed from, so it can't be kept in the store.
+        """
+        if not self.venv.is_symlink() and self.venv.is_dir():
+            shutil.rmtree(self.venv)
+
+    def activate(self, path: Path) -> None:
+        """Point `.venv` to an environment. The symlink is replaced atomically."""
+        self.remove_unmanaged()
+        temporary = self.venv.with_name(f"{self.venv.name}.{os.getpid()}.tmp")
+        temporary.unlink(missing_ok=True)
+        temporary.symlink_to(path, target_is_directory=True)
+        os.replace(temporary, self.venv)
+
+    def prune(self, keep: Path) -> list[Path]:
+        """Remove environments of the same Python version built for other lock files. Returns removed paths."""
+        python_version = keep.name.rsplit("-", 1)[0]
+        removed = []
+        for path in self.directory.glob(f"{python_version}-*"):
+            if path != keep and path.name.rsplit("-", 1)[0] == python_version:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path)
+        return removed
@@ -0,0 +1,93 @@
+"""Benchmarks of the plugin overhead, compared against the baseline committed in ``tests/benchmarks/baseline.json``.
+
+They are not part of the default test paths, because the timings depend on the machine. Run them with
+``pytest tests/benchmarks``, which is also a dedicated job in CI. The latest results are written to the git-ignored
+``.benchmarks/results.json``.
+
+Each benchmark takes several samples and compares the fastest one, which is the least affected by other
+processes. Each comparison starts with timing a fixed calibration workload. The baseline is scaled by the ratio
+of the calibration time to the one recorded with the baseline, so a slower or busy machine doesn't fail the
+benchmarks. The baseline is never scaled down, so a machine faster than the one which recorded it doesn't
+turn noise into failures.
+
+Environment variables:
+    DELFINO_BENCHMARK_TOLERANCE: Allowed slowdown against the baseline, 0.5 (50 %) by default. A result also
+        passes when it is within the noise of the baseline, which is the spread of its samples, but at least 0.5 ms.
+    DELFINO_BENCHMARK_UPDATE_BASELINE: Set to 1 to store the results as the new baseline instead of comparing.
+"""
+
+import json
+import os
+import statistics
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks.helpers import calibration_time
+
+_BASELINE_FILE = Path(__file__).parent / "baseline.json"
+_RESULTS_FILE = Path(".benchmarks") / "results.json"
+_MIN_NOISE_SECONDS = 0.0005
+_CALIBRATION = "calibration"
+
+
+@pytest.fixture(scope="session")
+def update_baseline() -> bool:
+    return os.environ.get("DELFINO_BENCHMARK_UPDATE_BASELINE", "") == "1"
+
+
+@pytest.fixture(scope="session")
+def baseline() -> dict[str, float]:
+    return json.loads(_BASELINE_FILE.read_text()) if _BASELINE_FILE.exists() else {}
+
+
+def _write_json(path: Path, values: dict[str, float]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({name: round(seconds, 6) for name, seconds in values.items()}, indent=2, sort_keys=True) + "\n"
+    )
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(project_root, baseline, update_baseline):
+    results: dict[str, float] = {}
+    yield results
+
+    if not results:
+        return
+
+    _write_json(project_root / _RESULTS_FILE, results)
+
+    if update_baseline:
+        _write_json(_BASELINE_FILE, {**baseline, **results})
+
+
+@pytest.fixture(scope="session")
+def check_benchmark(baseline, update_baseline, benchmark_results) -> Callable[[str, list[float]], None]:
+    """Record the fastest of the samples and fail if it is slower than the baseline by more than the tolerance."""
+    tolerance = float(os.environ.get("DELFINO_BENCHMARK_TOLERANCE", "0.5"))
+
+    def _check(name: str, samples: list[float]):
+        calibration = calibration_time()
+        seconds = min(samples)
+        benchmark_results[name] = seconds
+        benchmark_results[_CALIBRATION] = min(calibration, benchmark_results.get(_CALIBRATION, calibration))
+
+        if update_baseline:
+            return
+
+        if (recorded := baseline.get(name)) is None:
+            pytest.skip(f"No baseline for '{name}'. Record it with DELFINO_BENCHMARK_UPDATE_BASELINE=1.")
+
+        speed_ratio = max(calibration / baseline.get(_CALIBRATION, calibration), 1.0)
+        expected = recorded * speed_ratio
+        noise = max(statistics.median(samples) - seconds, _MIN_NOISE_SECONDS)
+        limit = max(expected * (1 + tolerance), expected + noise)
+        assert seconds <= limit, (
+            f"'{name}' took {seconds * 1000:.2f} ms, more than {limit * 1000:.2f} ms "
+            f"allowed by the baseline of {recorded * 1000:.2f} ms, scaled by {speed_ratio:.2f} "
+            f"to the speed of the machine, tolerance of {tolerance:.0%} and noise of {noise * 1000:.2f} ms."
+        )
+
+    return _check
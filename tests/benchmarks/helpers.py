@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+_IMPORT_TIMER = (
+    "import importlib, time\n"
+    "start = time.perf_counter()\n"
+    "importlib.import_module({module!r})\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def import_time(module: str, pycache_prefix: Path) -> float:
+    """Seconds to import a module in a new interpreter, reading and writing bytecode under ``pycache_prefix``.
+
+    An empty ``pycache_prefix`` means a cold import, which compiles all imported modules. A prefix
+    filled by a previous import means a warm import, which only loads bytecode.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run(
+        [sys.executable, "-X", f"pycache_prefix={pycache_prefix}", "-c", _IMPORT_TIMER.format(module=module)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def import_times(module: str, pycache_prefixes: list[Path]) -> list[float]:
+    """Seconds to import a module, one sample per bytecode cache in ``pycache_prefixes``."""
+    return [import_time(module, pycache_prefix) for pycache_prefix in pycache_prefixes]
+
+
+def call_times(func: Callable[[], object], repeat: int = 7, number: int = 20) -> list[float]:
+    """Seconds per call, one sample per batch of ``number`` calls."""
+    return [seconds / number for seconds in timeit.repeat(func, repeat=repeat, number=number)]
+
+
+def calibration_time() -> float:
+    """Seconds per call of a fixed pure Python workload, to compare the current speed of the machine with it."""
+    return min(call_times(lambda: sorted(str(number) for number in range(10_000)), repeat=15, number=10))
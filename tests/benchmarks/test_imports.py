@@ -0,0 +1,47 @@
+import pytest
+
+from tests.benchmarks.helpers import import_time, import_times
+
+_MODULES = [
+    "delfino_core.plugin",
+    "delfino_core.commands",
+    "delfino_core.commands.dependencies_update",
+    "delfino_core.commands.issue_tracker",
+    "delfino_core.commands.matrix",
+    "delfino_core.commands.pre_commit",
+    "delfino_core.commands.ruff",
+    "delfino_core.commands.switch_python_version",
+    "delfino_core.commands.test",
+    "delfino_core.commands.timings",
+    "delfino_core.commands.typecheck",
+    "delfino_core.commands.vcs",
+    "delfino_core.commands.verify",
+]
+
+_COLD_RUNS = 5
+_WARM_RUNS = 7
+
+
+@pytest.mark.parametrize("module", _MODULES)
+class TestImportTime:
+    @staticmethod
+    def test_cold(module, tmp_path, check_benchmark):
+        # GIVEN an empty bytecode cache for each run
+        pycache_prefixes = [tmp_path / str(run) for run in range(_COLD_RUNS)]
+
+        # WHEN
+        samples = import_times(module, pycache_prefixes)
+
+        # THEN
+        check_benchmark(f"import.cold.{module}", samples)
+
+    @staticmethod
+    def test_warm(module, tmp_path, check_benchmark):
+        # GIVEN a bytecode cache filled by a previous import
+        import_time(module, tmp_path)
+
+        # WHEN
+        samples = import_times(module, [tmp_path] * _WARM_RUNS)
+
+        # THEN
+        check_benchmark(f"import.warm.{module}", samples)
@@ -0,0 +1,61 @@
+import click
+import pytest
+from delfino.models import AppContext, PluginConfig
+
+from delfino_core.commands.verify import run_group_verify
+from delfino_core.config import CorePluginConfig
+from tests.benchmarks.helpers import call_times
+
+_LARGE = 500
+
+
+def _large_config() -> dict:
+    """A config as parsed from ``pyproject.toml``, with every collection holding hundreds of items."""
+    commands = [f"command-{index}" for index in range(_LARGE)]
+    return {
+        "sources_directory": "src",
+        "tests_directory": "tests",
+        "pytest_modules": [f"module_{index}" for index in range(_LARGE)],
+        "test_types": [f"type_{index}" for index in range(_LARGE)],
+        "verify_commands": commands,
+        "test_commands": commands,
+        "disable_commands": commands,
+        "command_dependencies": {command: commands[:10] for command in commands},
+        "mypy": {"strict_directories": [f"src/package_{index}" for index in range(_LARGE)]},
+        "vcs": {"branch_prefix": "feature/", "issue_tracking": {"issue_prefix": "ISSUE-"}},
+        "ruff": {"pass_args": "--select ALL"},
+    }
+
+
+def _stub(name: str) -> click.Command:
+    return click.Command(name, callback=lambda: None)
+
+
+def _delfino_with_stubs(context_obj: AppContext, verify_commands: list[str]):
+    """Root command with ``verify`` dispatching to commands which do nothing."""
+    root = click.Group("delfino", commands=[run_group_verify, *map(_stub, verify_commands)])
+    app_context = context_obj.model_copy(update={"plugin_config": PluginConfig(verify_commands=verify_commands)})
+
+    def _run():
+        root.main(["verify"], obj=app_context, standalone_mode=False)
+
+    return _run
+
+
+class TestConfigValidation:
+    @staticmethod
+    def test_default(check_benchmark):
+        check_benchmark("config.default", call_times(CorePluginConfig))
+
+    @staticmethod
+    def test_large(check_benchmark):
+        config = _large_config()
+        check_benchmark("config.large", call_times(lambda: CorePluginConfig(**config)))
+
+
+class TestDispatch:
+    @staticmethod
+    @pytest.mark.parametrize("commands_count", [4, 100])
+    def test_verify(context_obj, check_benchmark, commands_count):
+        run = _delfino_with_stubs(context_obj, [f"stub-{index}" for index in range(commands_count)])
+        check_benchmark(f"dispatch.verify.{commands_count}", call_times(run))
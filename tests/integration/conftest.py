@@ -0,0 +1,10 @@
+import pytest
+
+from delfino_core.config import REPORTS_DIRECTORY_ENV_VAR
+
+
+@pytest.fixture(autouse=True)
+def reports_directory(tmp_path, monkeypatch):
+    """Keep reports of commands run against the project out of its working tree."""
+    monkeypatch.setenv(REPORTS_DIRECTORY_ENV_VAR, str(tmp_path / "reports"))
+    return tmp_path / "reports"
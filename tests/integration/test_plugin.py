@@ -5,6 +5,7 @@ from delfino.click_utils.command import CommandRegistry
 from delfino.models.pyproject_toml import PluginConfig
 
 from delfino_core.commands.dependencies_update import run_dependencies_update
+from delfino_core.commands.matrix import run_matrix
 from delfino_core.commands.pre_commit import run_ensure_pre_commit, run_pre_commit
 from delfino_core.commands.ruff import run_ruff
 from delfino_core.commands.switch_python_version import run_switch_python_version
@@ -16,6 +17,7 @@ from delfino_core.commands.test import (
     run_pytest_integration,
     run_pytest_unit,
 )
+from delfino_core.commands.timings import run_timings
 from delfino_core.commands.typecheck import run_mypy
 from delfino_core.commands.vcs import run_gh, run_glab, run_vcs
 from delfino_core.commands.verify import run_group_verify
@@ -53,6 +55,7 @@ class TestPlugin:
             run_coverage_report,
             run_dependencies_update,
             run_ensure_pre_commit,
+            run_matrix,
             run_mypy,
             run_pre_commit,
             run_switch_python_version,
@@ -61,6 +64,7 @@ class TestPlugin:
             run_pytest_integration,
             run_pytest_unit,
             run_ruff,
+            run_timings,
             run_group_verify,
             run_gh,
             run_glab,
@@ -0,0 +1,174 @@
+from pathlib import Path
+
+import click
+import pytest
+
+from delfino_core.commands import dependencies_update
+from delfino_core.commands.dependencies_update import PipenvUpdater, PoetryUpdater, UvUpdater, _run
+from delfino_core.output import CapturedOutput
+
+_PYPROJECT_TOML = """
+[tool.poetry.dependencies]
+python = "^3.10"
+httpx = "^0.28"
+
+[tool.poetry.group.dev.dependencies]
+pytest = {version = "^8.2", optional = true}
+"""
+
+
+class TestRun:
+    @staticmethod
+    def test_should_capture_output_for_caller():
+        with CapturedOutput() as output:
+            _run("python -c 'print(1)'", output=output)
+
+            assert output.read() == b"1\n"
+
+    @staticmethod
+    def test_should_print_output_and_exit_on_failure(capsys):
+        with pytest.raises(click.exceptions.Exit):
+            _run("python -c 'import sys; print(\"out\"); sys.exit(3)'")
+
+        assert "out" in capsys.readouterr().out
+
+
+class TestUvUpdater:
+    @staticmethod
+    def test_should_parse_outdated_direct_dependencies():
+        # GIVEN
+        output = (
+            "delfino-core v10.0.1\n"
+            "├── delfino v5.0.1\n"
+            "├── httpx v0.28.1 (extra: vcs) (latest: v0.29.0)\n"
+            "├── ruff v0.11.0 (group: dev) (latest: v0.12.3)\n"
+            "└── pytest-cov v6.0.0 (group: dev)\n"
+        )
+
+        # WHEN
+        outdated = UvUpdater.parse_outdated_packages(output)
+
+        # THEN
+        assert outdated == {"httpx": ("0.28.1", "0.29.0"), "ruff": ("0.11.0", "0.12.3")}
+
+    @staticmethod
+    def test_should_read_requirements_from_all_groups():
+        pyproject_toml = (
+            '[project]\ndependencies = ["delfino>=5.0.1"]\n'
+            "[project.optional-dependencies]\nvcs = [\"httpx ; python_version >= '3.10'\"]\n"
+            '[dependency-groups]\ndev = ["ruff>=0.11", {include-group = "lint"}]\n'
+        )
+
+        assert UvUpdater._requirements(pyproject_toml) == {
+            "delfino": ["delfino>=5.0.1"],
+            "httpx": ["httpx ; python_version >= '3.10'"],
+            "ruff": ["ruff>=0.11"],
+        }
+
+
+class TestPipenvUpdater:
+    @staticmethod
+    def test_should_read_requirements_from_package_categories_only():
+        pipfile = '[[source]]\nname = "pypi"\n[packages]\nhttpx = "*"\n[dev-packages]\nruff = "==0.11"\n'
+
+        assert PipenvUpdater._requirements(pipfile) == {"httpx": ['"*"'], "ruff": ['"==0.11"']}
+
+    @staticmethod
+    def test_should_match_outdated_packages_by_canonical_names():
+        # GIVEN
+        declared = PipenvUpdater._requirements('[packages]\n"Ruamel.YAML" = "*"\n"zope.interface" = "*"\n')
+        lines = [
+            "Skipped Update of Package ruamel_yaml: 0.17.0 installed, 0.18.0 available.",
+            "Package 'zope.interface' out-of-date: '==6.0' installed, '==6.0' available.",
+            "Package 'zopeXinterface' out-of-date: '==1.0' installed, '==2.0' available.",
+            "Package 'certifi' out-of-date: '==2024.2.2' installed, '==2025.1.31' available.",
+        ]
+
+        # WHEN
+        outdated = PipenvUpdater.outdated_declared_packages(lines, declared)
+
+        # THEN
+        assert outdated == {"ruamel_yaml": ("0.17.0", "0.18.0")}
+
+    @staticmethod
+    def test_should_read_outdated_packages_from_both_captured_streams(mocker, tmp_path, monkeypatch):
+        # GIVEN pipenv reporting outdated packages on stdout and stderr
+        def _pipenv(args, spinner=None, output=None):
+            if output is not None:
+                output.stdout.write(b"Package 'httpx' out-of-date: '==0.28.0' installed, '==0.29.0' available.\n")
+                output.stderr.write(b"Skipped Update of Package ruff: 0.11.0 installed, 0.12.0 available.\n")
+
+        monkeypatch.chdir(tmp_path)
+        Path("Pipfile").write_text('[packages]\nhttpx = "*"\n[dev-packages]\nruff = "*"\n', encoding="utf-8")
+        mocker.patch.object(dependencies_update, "_run", side_effect=_pipenv)
+        updater = PipenvUpdater.__new__(PipenvUpdater)  # No git repository needed for reading Pipfile
+        updater._changelog = mocker.Mock(url_for_package=mocker.Mock(return_value=""))
+        show_edit_prompt = mocker.patch.object(updater, "_show_edit_prompt_and_wait")
+
+        # WHEN
+        updater.print_outdated_packages_and_lock_if_changed()
+
+        # THEN
+        show_edit_prompt.assert_called_once_with(available_updates="httpx: 0.28.0 -> 0.29.0\nruff: 0.11.0 -> 0.12.0\n")
+
+
+class TestPoetryUpdater:
+    @staticmethod
+    @pytest.fixture
+    def updater(tmp_path: Path, monkeypatch) -> PoetryUpdater:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "pyproject.toml").write_text(_PYPROJECT_TOML, encoding="utf-8")
+        return PoetryUpdater.__new__(PoetryUpdater)  # No git repository needed for reading pyproject.toml
+
+    @staticmethod
+    def test_should_ignore_edits_other_than_requirements(updater: PoetryUpdater):
+        # GIVEN
+        Path("pyproject.toml").write_text("# Dependencies\n" + _PYPROJECT_TOML.replace(" = ", "="), encoding="utf-8")
+
+        # WHEN
+        edited = updater._edited_packages(PoetryUpdater._requirements(_PYPROJECT_TOML))
+
+        # THEN
+        assert edited == set()
+
+    @staticmethod
+    def test_should_update_only_edited_packages(updater: PoetryUpdater):
+        # GIVEN
+        Path("pyproject.toml").write_text(
+            _PYPROJECT_TOML.replace("^0.28", "^0.29").replace("^8.2", "^8.3"), encoding="utf-8"
+        )
+
+        # WHEN
+        edited = updater._edited_packages(PoetryUpdater._requirements(_PYPROJECT_TOML))
+
+        # THEN
+        assert edited == {"httpx", "pytest"}
+        assert updater._packages_to_update(edited) == ["httpx", "pytest"]
+
+    @staticmethod
+    def test_should_update_everything_when_only_python_or_removed_packages_are_edited(updater: PoetryUpdater):
+        # GIVEN
+        Path("pyproject.toml").write_text(
+            _PYPROJECT_TOML.replace("^3.10", "^3.11").replace('httpx = "^0.28"\n', ""), encoding="utf-8"
+        )
+
+        # WHEN
+        edited = updater._edited_packages(PoetryUpdater._requirements(_PYPROJECT_TOML))
+
+        # THEN
+        assert edited == {"python", "httpx"}
+        assert updater._packages_to_update(edited) == []
+
+    @staticmethod
+    def test_should_ask_to_fix_dependency_file_which_cannot_be_parsed(updater: PoetryUpdater, monkeypatch, capsys):
+        # GIVEN an edit with a syntax error
+        Path("pyproject.toml").write_text(_PYPROJECT_TOML.replace('"^0.28"', '"^0.29'), encoding="utf-8")
+        fixed = _PYPROJECT_TOML.replace("^0.28", "^0.29")
+        monkeypatch.setattr("builtins.input", lambda _: Path("pyproject.toml").write_text(fixed, encoding="utf-8"))
+
+        # WHEN
+        edited = updater._edited_packages(PoetryUpdater._requirements(_PYPROJECT_TOML))
+
+        # THEN
+        assert "Failed to parse pyproject.toml" in capsys.readouterr().out
+        assert edited == {"httpx"}
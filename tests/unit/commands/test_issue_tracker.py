@@ -0,0 +1,96 @@
+import json
+import threading
+from base64 import b64encode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from click import Abort
+
+from delfino_core.commands.issue_tracker import JiraClient
+from delfino_core.config import IssueTrackingConfig
+
+_ISSUES = {f"ISSUE-{number}": f"Title {number}" for number in range(1, 4)}
+_AUTHORIZATION = "Basic " + b64encode(b"user:key").decode()
+
+
+class _JiraStub(BaseHTTPRequestHandler):
+    """Issue endpoint of Jira REST API v3, recording received requests."""
+
+    requests: list[str] = []
+
+    def _reply(self, status: int, body: dict):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def do_GET(self):  # noqa: N802
+        self.requests.append(self.path)
+        key = self.path.split("?")[0].rsplit("/", 1)[-1]
+        if self.headers["Authorization"] != _AUTHORIZATION:
+            self._reply(401, {})
+        elif key in _ISSUES:
+            self._reply(200, {"key": key, "fields": {"summary": _ISSUES[key]}})
+        else:
+            self._reply(404, {"errorMessages": ["Issue does not exist"]})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _JiraStub.requests = []
+    with ThreadingHTTPServer(("127.0.0.1", 0), _JiraStub) as server:
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+@pytest.fixture
+def settings(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("JIRA_USER", "user")
+    monkeypatch.setenv("JIRA_KEY", "key")
+    return IssueTrackingConfig(
+        issue_prefix="ISSUE-",
+        tracker_url=f"http://127.0.0.1:{server.server_address[1]}",
+        username_env_var="JIRA_USER",
+        api_key_env_var="JIRA_KEY",
+    )
+
+
+class TestJiraClient:
+    @staticmethod
+    def test_should_get_issue_title(settings):
+        with JiraClient(settings) as client:
+            assert client.get_issue_title(1) == "Title 1"
+
+    @staticmethod
+    def test_should_reuse_cached_title_in_another_client(settings):
+        # GIVEN
+        with JiraClient(settings) as client:
+            client.get_issue_title(1)
+
+        # WHEN
+        with JiraClient(settings) as client:
+            title = client.get_issue_title(1)
+
+        # THEN
+        assert title == "Title 1"
+        assert len(_JiraStub.requests) == 1
+
+    @staticmethod
+    def test_should_fetch_again_after_cache_expires(settings):
+        settings.cache_ttl = 0
+        with JiraClient(settings) as client:
+            client.get_issue_title(1)
+            client.get_issue_title(1)
+
+        assert len(_JiraStub.requests) == 2  # noqa: PLR2004
+
+    @staticmethod
+    def test_should_abort_for_missing_issue(settings):
+        with JiraClient(settings) as client, pytest.raises(Abort, match="ISSUE-999"):
+            client.get_issue_title(999)
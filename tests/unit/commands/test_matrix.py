@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import click
+import pytest
+
+from delfino_core.commands.matrix import (
+    Interpreter,
+    parse_pyenv_versions,
+    parse_uv_python_list,
+    select_interpreters,
+)
+
+
+def _interpreters(*versions: str) -> list[Interpreter]:
+    return [Interpreter(version, Path(f"/python{version}"), "pyenv") for version in versions]
+
+
+class TestParsePyenvVersions:
+    @staticmethod
+    def test_should_skip_virtualenvs_and_other_implementations():
+        output = "3.10.14\n3.12.1\n3.12.1/envs/project\nproject\npypy3.10-7.3.16\nsystem\n"
+
+        interpreters = parse_pyenv_versions(output, Path("/pyenv"))
+
+        assert interpreters == [
+            Interpreter("3.10.14", Path("/pyenv/versions/3.10.14/bin/python"), "pyenv"),
+            Interpreter("3.12.1", Path("/pyenv/versions/3.12.1/bin/python"), "pyenv"),
+        ]
+
+
+class TestParseUvPythonList:
+    @staticmethod
+    def test_should_keep_installed_default_cpython_builds():
+        output = json.dumps(
+            [
+                {
+                    "version": "3.13.1",
+                    "path": "/uv/3.13/bin/python3.13t",
+                    "implementation": "cpython",
+                    "variant": "freethreaded",
+                },
+                {
+                    "version": "3.13.1",
+                    "path": "/uv/3.13/bin/python3.13",
+                    "implementation": "cpython",
+                    "variant": "default",
+                },
+                {"version": "3.10.14", "path": "/uv/pypy/bin/pypy3", "implementation": "pypy", "variant": "default"},
+                {"version": "3.11.9", "path": None, "implementation": "cpython", "variant": "default"},
+            ]
+        )
+
+        assert parse_uv_python_list(output) == [Interpreter("3.13.1", Path("/uv/3.13/bin/python3.13"), "uv")]
+
+
+class TestSelectInterpreters:
+    @staticmethod
+    def test_should_pick_newest_patch_version_of_each_minor_version():
+        interpreters = _interpreters("3.10.13", "3.10.14", "3.11.9", "3.12.0", "3.12.1")
+
+        selected = select_interpreters(interpreters, ())
+
+        assert [_.version for _ in selected] == ["3.10.14", "3.11.9", "3.12.1"]
+
+    @staticmethod
+    def test_should_leave_out_versions_not_required_by_project():
+        interpreters = _interpreters("3.9.19", "3.10.14", "3.11.9")
+
+        selected = select_interpreters(interpreters, (), requires_python=">=3.10")
+
+        assert [_.version for _ in selected] == ["3.10.14", "3.11.9"]
+
+    @staticmethod
+    def test_should_pick_requested_versions_without_prefix_collisions():
+        interpreters = _interpreters("3.1.5", "3.10.14", "3.11.9", "3.12.1")
+
+        selected = select_interpreters(interpreters, ("3.1", "3.12.1", "3.12"))
+
+        assert [_.version for _ in selected] == ["3.1.5", "3.12.1"]
+
+    @staticmethod
+    def test_should_abort_when_requested_version_is_missing():
+        with pytest.raises(click.Abort):
+            select_interpreters(_interpreters("3.11.9"), ("3.13",))
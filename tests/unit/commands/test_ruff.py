@@ -0,0 +1,139 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from delfino_core.commands import ruff
+from delfino_core.commands.ruff import (
+    _root_ruff_settings,
+    _ruff_excluded_folders,
+    _ruff_fingerprint,
+    _ruff_suffixes,
+    _run_ruff_cached,
+    _walk_targets,
+)
+from delfino_core.config import CorePluginConfig
+from tests.integration.helpers import tmpdir_in_path
+
+
+def _write(path: str, content: str = "") -> Path:
+    file = Path(path)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content, encoding="utf-8")
+    return file
+
+
+def _root_settings() -> dict[str, Any]:
+    settings = _root_ruff_settings()
+    assert settings is not None
+    return settings
+
+
+class TestRuffSuffixes:
+    @staticmethod
+    def test_should_add_extended_suffixes_to_defaults():
+        with tmpdir_in_path(chdir=True):
+            _write("pyproject.toml", '[tool.ruff]\nextend-include = ["*.pyw", "**/*.ipy"]\n')
+
+            assert _ruff_suffixes(_root_settings()) == {".py", ".pyi", ".ipynb", ".pyw", ".ipy"}
+
+    @staticmethod
+    def test_should_prefer_ruff_toml_and_replace_defaults_with_include():
+        with tmpdir_in_path(chdir=True):
+            _write("pyproject.toml", '[tool.ruff]\nextend-include = ["*.pyw"]\n')
+            _write("ruff.toml", 'include = ["*.py", "pyproject.toml"]\n')
+
+            assert _ruff_suffixes(_root_settings()) == {".py"}
+
+    @staticmethod
+    def test_should_give_up_on_patterns_other_than_suffixes():
+        with tmpdir_in_path(chdir=True):
+            _write("ruff.toml", 'extend-include = ["scripts/*"]\n')
+
+            assert _ruff_suffixes(_root_settings()) is None
+
+
+class TestWalkTargets:
+    @staticmethod
+    def test_should_find_nested_and_parent_config_files():
+        with tmpdir_in_path(chdir=True):
+            # GIVEN
+            root_config = _write("pyproject.toml")
+            parent_config = _write("src/ruff.toml")
+            nested_config = _write("src/package/sub/.ruff.toml")
+            module = _write("src/package/sub/module.py")
+            notebook = _write("src/package/notebook.ipynb")
+            _write("src/package/data.json")
+
+            # WHEN
+            files, config_files = _walk_targets([Path("src/package")], frozenset((".py", ".ipynb")))
+
+            # THEN
+            assert files == [notebook, module]
+            assert config_files == [root_config, nested_config, parent_config]
+
+            # AND a change of a nested config file changes the fingerprint
+            fingerprint = _ruff_fingerprint(config_files)
+            nested_config.write_text("line-length = 80\n", encoding="utf-8")
+            assert _ruff_fingerprint(config_files) != fingerprint
+
+    @staticmethod
+    def test_should_skip_folders_excluded_by_ruff():
+        with tmpdir_in_path(chdir=True):
+            # GIVEN
+            _write("ruff.toml", 'extend-exclude = ["generated_*", "src/keep/"]\n')
+            module = _write("src/module.py")
+            kept = _write("src/keep/module.py")
+            for folder in (".venv", ".git", "__pycache__", "generated_api"):
+                _write(f"src/{folder}/module.py")
+
+            # WHEN
+            files, _ = _walk_targets([Path("src")], frozenset((".py",)), _ruff_excluded_folders(_root_settings()))
+
+            # THEN
+            assert files == [kept, module]
+
+
+class TestRunRuffCached:
+    @staticmethod
+    def test_should_pass_folders_when_all_files_are_dirty_and_files_otherwise(mocker):
+        run_ruff = mocker.patch.object(ruff, "_run_ruff")
+
+        with tmpdir_in_path(chdir=True):
+            # GIVEN
+            plugin_config = CorePluginConfig()
+            dirs = [Path("src")]
+            _write("src/first.py")
+            second = _write("src/second.py")
+
+            # WHEN
+            _run_ruff_cached(plugin_config, dirs)
+            second.write_text("x = 1\n", encoding="utf-8")
+            _run_ruff_cached(plugin_config, dirs)
+            _run_ruff_cached(plugin_config, dirs)
+
+        # THEN
+        assert [call.args[0] for call in run_ruff.call_args_list] == [
+            ["ruff", "check", Path("src")],
+            ["ruff", "format", Path("src")],
+            ["ruff", "check", "--force-exclude", str(Path("src/second.py"))],
+            ["ruff", "format", "--force-exclude", str(Path("src/second.py"))],
+        ]
+
+    @staticmethod
+    def test_should_drop_deleted_files_from_cache(mocker):
+        mocker.patch.object(ruff, "_run_ruff")
+
+        with tmpdir_in_path(chdir=True):
+            # GIVEN
+            plugin_config = CorePluginConfig()
+            kept = _write("src/kept.py")
+            deleted = _write("src/deleted.py")
+            _run_ruff_cached(plugin_config, [Path("src")])
+
+            # WHEN
+            deleted.unlink()
+            _run_ruff_cached(plugin_config, [Path("src")])
+
+            # THEN
+            cache = json.loads((plugin_config.reports_directory / "ruff-cache.json").read_text(encoding="utf-8"))
+            assert list(cache["files"]) == [str(kept)]
@@ -0,0 +1,248 @@
+import importlib
+import io
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from coverage import Coverage, CoverageData
+
+from delfino_core.commands.test import (
+    _collect_test_files,
+    _combined_coverage_reports,
+    _CoverageTotals,
+    _pytest_args,
+    _split_into_shards,
+    _test_file_durations,
+    _write_coverage_reports,
+)
+from delfino_core.config import CorePluginConfig
+from tests.integration.helpers import tmpdir_in_path
+
+
+def _write(path: str, content: str = "") -> Path:
+    file = Path(path)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content, encoding="utf-8")
+    return file
+
+
+class TestCollectTestFiles:
+    @staticmethod
+    def test_should_use_default_patterns_without_config():
+        with tmpdir_in_path(chdir=True):
+            # GIVEN
+            for name in ("test_first.py", "second_test.py", "helpers.py"):
+                _write(f"tests/unit/{name}")
+
+            # WHEN
+            test_files = _collect_test_files(Path("tests"))
+
+            # THEN
+            assert test_files == [Path("tests/unit/second_test.py"), Path("tests/unit/test_first.py")]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "config_file, content",
+        [
+            ("pytest.ini", "[pytest]\npython_files = check_*.py\n"),
+            ("pyproject.toml", '[tool.pytest.ini_options]\npython_files = ["check_*.py"]\n'),
+            ("tox.ini", "[pytest]\npython_files = check_*.py\n"),
+            ("setup.cfg", "[tool:pytest]\npython_files = check_*.py\n"),
+        ],
+    )
+    def test_should_use_python_files_option(config_file, content):
+        with tmpdir_in_path(chdir=True):
+            # GIVEN
+            _write(config_file, content)
+            for name in ("check_first.py", "test_second.py"):
+                _write(f"tests/unit/{name}")
+
+            # WHEN
+            test_files = _collect_test_files(Path("tests"))
+
+            # THEN
+            assert test_files == [Path("tests/unit/check_first.py")]
+
+
+class TestPytestArgs:
+    @staticmethod
+    @pytest.mark.parametrize("junit_report", [False, True])
+    def test_should_write_junit_report_only_when_requested(junit_report):
+        args = _pytest_args(CorePluginConfig(), (), ["tests/unit"], "-unit", junit_report=junit_report)
+
+        assert ("--junitxml" in args) == junit_report
+
+
+class TestSplitIntoShards:
+    @staticmethod
+    def test_should_balance_shards_by_duration():
+        durations = {Path("a.py"): 10.0, Path("b.py"): 6.0, Path("c.py"): 5.0, Path("d.py"): 1.0}
+
+        shards = _split_into_shards(list(durations), durations, 2)
+
+        assert shards == [[Path("a.py"), Path("d.py")], [Path("b.py"), Path("c.py")]]
+
+    @staticmethod
+    def test_should_use_average_duration_for_unknown_files():
+        durations = {Path("a.py"): 4.0, Path("b.py"): 2.0}
+
+        shards = _split_into_shards([Path("a.py"), Path("b.py"), Path("new.py")], durations, 2)
+
+        assert shards == [[Path("a.py")], [Path("b.py"), Path("new.py")]]
+
+    @staticmethod
+    def test_should_drop_empty_shards():
+        assert _split_into_shards([Path("a.py")], {}, 4) == [[Path("a.py")]]
+
+
+class TestTestFileDurations:
+    @staticmethod
+    def test_should_sum_durations_per_test_file_from_classname():
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN a test file and a JUnit report from a previous run
+            (tmpdir / "tests").mkdir()
+            (tmpdir / "tests" / "test_x.py").touch()
+            (tmpdir / "junit-unit.xml").write_text(
+                '<testsuites><testsuite name="pytest">'
+                '<testcase classname="tests.test_x.TestX" name="test_a" time="1.5" />'
+                '<testcase classname="tests.test_x" name="test_b" time="0.5" />'
+                '<testcase classname="tests.test_removed" name="test_c" time="9" />'
+                "</testsuite></testsuites>",
+                encoding="utf-8",
+            )
+
+            # WHEN durations are read
+            durations = _test_file_durations(tmpdir)
+
+        # THEN they are summed per existing test file
+        assert durations == {Path("tests/test_x.py"): 2.0}
+
+
+class TestCoverageTotals:
+    @staticmethod
+    def test_should_match_coverage_report_with_branches():
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN a partially covered module with branches
+            (tmpdir / "measured_module.py").write_text(
+                "def f(x):\n    if x:\n        return 1\n    return 2\n\n\ndef g():\n    return 3\n",
+                encoding="utf-8",
+            )
+            coverage = Coverage(data_file=str(tmpdir / "coverage.dat"), branch=True)
+            coverage.start()
+            importlib.import_module("measured_module").f(1)
+            coverage.stop()
+            coverage.save()
+
+            expected = coverage.report(file=io.StringIO())
+
+            # WHEN the total is computed in-process
+            total = _CoverageTotals().total(coverage.get_data())
+
+        # THEN it matches the coverage report
+        assert total == f"{expected:.0f}%"
+
+    @staticmethod
+    def test_should_leave_out_files_omitted_from_reports():
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN a fully covered module and an uncovered one omitted from reports
+            (tmpdir / ".coveragerc").write_text("[report]\nomit = *omitted_module.py\n", encoding="utf-8")
+            (tmpdir / "reported_module.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+            (tmpdir / "omitted_module.py").write_text("def g():\n    return 2\n\n\nX = 3\n", encoding="utf-8")
+            coverage = Coverage(data_file=str(tmpdir / "coverage.dat"))
+            coverage.start()
+            importlib.import_module("reported_module").f()
+            importlib.import_module("omitted_module")
+            coverage.stop()
+            coverage.save()
+
+            expected = coverage.report(file=io.StringIO())
+
+            # WHEN the total is computed in-process
+            total = _CoverageTotals().total(coverage.get_data())
+
+        # THEN it matches the coverage report, which leaves the omitted module out
+        assert total == f"{expected:.0f}%" == "100%"
+
+
+class TestCombinedCoverageReports:
+    @staticmethod
+    def test_should_remap_paths_configured_in_paths_section():
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN coverage data measured in another location of the sources, mapped by the `[paths]` section
+            (tmpdir / ".coveragerc").write_text("[paths]\nsource =\n    src/\n    /ci/project/src/\n", encoding="utf-8")
+            module = tmpdir / "src" / "module.py"
+            module.parent.mkdir()
+            module.write_text("X = 1\n", encoding="utf-8")
+            for shard in range(2):
+                data = CoverageData(basename=str(tmpdir / f"coverage-unit.{shard}.dat"))
+                data.add_lines({"/ci/project/src/module.py": [1]})
+                data.write()
+
+            # WHEN
+            coverage_dat = _combined_coverage_reports(tmpdir, ["unit"], _CoverageTotals())
+
+            # THEN
+            combined = CoverageData(basename=str(coverage_dat))
+            combined.read()
+            assert combined.measured_files() == {str(module)}
+
+
+class TestImportWithoutCoverage:
+    @staticmethod
+    def test_should_import_commands_without_optional_coverage_package():
+        # GIVEN coverage is not installed
+        code = (
+            "import sys\n"
+            "class Block:\n"
+            "    def find_spec(self, name, *args):\n"
+            "        if name.split('.')[0] == 'coverage':\n"
+            "            raise ImportError(name)\n"
+            "sys.meta_path.insert(0, Block())\n"
+            "import delfino_core.commands.test\n"
+        )
+
+        # WHEN the module is imported THEN it doesn't fail
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def _measure(tmpdir: Path, module: str, call: bool) -> Coverage:
+    coverage = Coverage(data_file=str(tmpdir / "coverage.dat"))
+    coverage.erase()
+    coverage.start()
+    imported = importlib.reload(sys.modules[module]) if module in sys.modules else importlib.import_module(module)
+    if call:
+        imported.f()
+    coverage.stop()
+    coverage.save()
+    return coverage
+
+
+def _reports_written(coverage: Coverage, tmpdir: Path, rebuild: bool = False) -> bool:
+    """Write reports and return whether the JSON report was written again."""
+    json_report = tmpdir / "coverage.json"
+    if json_report.exists():
+        os.utime(json_report, ns=(0, 0))
+    _write_coverage_reports(coverage, tmpdir, tmpdir / "coverage-report", rebuild)
+    return json_report.stat().st_mtime_ns != 0
+
+
+class TestWriteCoverageReports:
+    @staticmethod
+    def test_should_skip_unchanged_and_regenerate_changed_or_rebuilt_reports():
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN reports written for coverage data of a module
+            (tmpdir / "reports_module.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+            assert _reports_written(_measure(tmpdir, "reports_module", call=False), tmpdir)
+            assert (tmpdir / "coverage-report" / "index.html").exists()
+
+            # WHEN the coverage data is the same THEN reports are not written again
+            assert not _reports_written(_measure(tmpdir, "reports_module", call=False), tmpdir)
+
+            # WHEN the coverage data changes THEN reports are written again
+            assert _reports_written(_measure(tmpdir, "reports_module", call=True), tmpdir)
+            assert not _reports_written(_measure(tmpdir, "reports_module", call=True), tmpdir)
+
+            # WHEN a rebuild is requested THEN reports are written again
+            assert _reports_written(_measure(tmpdir, "reports_module", call=True), tmpdir, rebuild=True)
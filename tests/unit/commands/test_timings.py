@@ -0,0 +1,42 @@
+import pytest
+
+from delfino_core.commands.timings import _percentile, summarise_timings
+
+
+class TestPercentile:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "percent, expected",
+        [
+            pytest.param(50, 5.0, id="median"),
+            pytest.param(95, 10.0, id="p95"),
+            pytest.param(0, 1.0, id="minimum"),
+        ],
+    )
+    def test_should_return_nearest_rank(percent, expected):
+        assert _percentile([float(value) for value in range(10, 0, -1)], percent) == expected
+
+
+class TestSummariseTimings:
+    @staticmethod
+    def test_should_group_by_command_and_label():
+        records = [
+            {"command": "mypy", "label": "mypy", "duration": 2.0, "returncode": 0},
+            {"command": "verify", "label": "mypy", "duration": 3.0, "returncode": 1},
+            {"command": "mypy", "label": "mypy", "duration": 4.0, "returncode": 0, "cpu_user": 1, "cpu_system": 1},
+        ]
+
+        summaries = summarise_timings(records)
+
+        assert [(summary.command, summary.label, summary.runs, summary.failed) for summary in summaries] == [
+            ("mypy", "mypy", 2, 0),
+            ("verify", "mypy", 1, 1),
+        ]
+        assert summaries[0].cpu_p50 == 2.0  # noqa: PLR2004
+        assert summaries[1].cpu_p50 is None
+
+    @staticmethod
+    def test_should_use_last_records_only():
+        records = [{"command": "ruff", "label": "ruff", "duration": float(value)} for value in range(1, 11)]
+
+        assert summarise_timings(records, last=2)[0].p50 == 9.0  # noqa: PLR2004
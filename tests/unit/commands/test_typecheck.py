@@ -0,0 +1,124 @@
+from pathlib import Path
+
+from delfino_core.commands import typecheck
+from delfino_core.commands.typecheck import (
+    _dmypy_args,
+    _dmypy_fingerprint,
+    _run_typecheck_groups,
+    _typecheck_args,
+    partition_by_strictness,
+)
+from delfino_core.config import CorePluginConfig
+from delfino_core.parallel import Job
+
+
+class TestDmypyFingerprint:
+    @staticmethod
+    def test_should_change_with_mypypath_environment_variable(monkeypatch):
+        monkeypatch.delenv("MYPYPATH", raising=False)
+        without_env = _dmypy_fingerprint(["--strict"], Path("src"))
+
+        monkeypatch.setenv("MYPYPATH", "stubs")
+
+        assert _dmypy_fingerprint(["--strict"], Path("src")) != without_env
+
+    @staticmethod
+    def test_should_change_with_flags(monkeypatch):
+        monkeypatch.delenv("MYPYPATH", raising=False)
+
+        assert _dmypy_fingerprint(["--strict"], Path("src")) != _dmypy_fingerprint([], Path("src"))
+
+
+class TestDmypyArgs:
+    @staticmethod
+    def test_should_stop_daemon_only_when_flags_or_mypypath_change(mocker, tmp_path, monkeypatch):
+        # GIVEN a daemon started with the same configuration
+        run = mocker.patch.object(typecheck, "run")
+        monkeypatch.delenv("MYPYPATH", raising=False)
+        reports_file = tmp_path / "junit-strict.xml"
+        _dmypy_args(["--strict"], [Path("src")], reports_file, Path("src"), "strict")
+        (tmp_path / "dmypy-strict.json").write_text("{}", encoding="utf-8")
+
+        # WHEN the configuration is the same THEN the daemon keeps running
+        _dmypy_args(["--strict"], [Path("src")], reports_file, Path("src"), "strict")
+        assert not run.called
+
+        # WHEN the flags change THEN the daemon is stopped
+        _dmypy_args([], [Path("src")], reports_file, Path("src"), "strict")
+        assert run.call_count == 1
+
+        # WHEN `MYPYPATH` changes THEN the daemon is stopped
+        monkeypatch.setenv("MYPYPATH", "stubs")
+        _dmypy_args([], [Path("src")], reports_file, Path("src"), "strict")
+        assert run.call_args.args[0][-1] == "stop"
+        assert run.call_count == 2  # noqa: PLR2004
+
+
+class TestPartitionByStrictness:
+    @staticmethod
+    def test_should_keep_order_of_interleaved_paths():
+        # GIVEN
+        target_paths = [Path("src/strict/a.py"), Path("src/loose.py"), Path("src/strict/b"), Path("tests")]
+
+        # WHEN
+        paths_by_strictness = partition_by_strictness(target_paths, [Path("src/strict")])
+
+        # THEN
+        assert paths_by_strictness == {
+            True: [Path("src/strict/a.py"), Path("src/strict/b")],
+            False: [Path("src/loose.py"), Path("tests")],
+        }
+
+    @staticmethod
+    def test_should_leave_out_empty_groups():
+        assert partition_by_strictness([Path("src"), Path("tests")], []) == {False: [Path("src"), Path("tests")]}
+        assert partition_by_strictness([Path("src/strict")], [Path("src/strict")]) == {True: [Path("src/strict")]}
+        assert not partition_by_strictness([], [Path("src")])
+
+
+class TestTypecheckArgs:
+    @staticmethod
+    def test_should_give_each_group_its_own_cache_and_report():
+        # GIVEN
+        plugin_config = CorePluginConfig(reports_directory="reports")
+        reports = Path("reports", "mypy")
+
+        # WHEN
+        strict = _typecheck_args([Path("src")], True, plugin_config, False, (), daemon=False)
+        nonstrict = _typecheck_args([Path("tests")], False, plugin_config, False, (), daemon=False)
+
+        # THEN
+        assert strict[strict.index("--cache-dir") + 1] == reports / "cache-strict"
+        assert nonstrict[nonstrict.index("--cache-dir") + 1] == reports / "cache-nonstrict"
+        assert strict[-3:] == ["--junit-xml", reports / "junit-strict.xml", Path("src")]
+        assert nonstrict[-3:] == ["--junit-xml", reports / "junit-nonstrict.xml", Path("tests")]
+        assert "--strict" in strict
+        assert "--strict" not in nonstrict
+
+
+class TestRunTypecheckGroups:
+    @staticmethod
+    def test_should_not_run_anything_without_paths(mocker):
+        run_typecheck = mocker.patch.object(typecheck, "_run_typecheck")
+        run_jobs = mocker.patch.object(typecheck, "run_jobs")
+
+        _run_typecheck_groups({}, CorePluginConfig(), False, (), daemon=False)
+
+        run_typecheck.assert_not_called()
+        run_jobs.assert_not_called()
+
+    @staticmethod
+    def test_should_run_groups_as_concurrent_jobs(mocker):
+        def _succeed(jobs: list[Job], **_) -> list[Job]:
+            for job in jobs:
+                job.returncode = 0
+            return jobs
+
+        run_jobs = mocker.patch.object(typecheck, "run_jobs", side_effect=_succeed)
+        paths_by_strictness = {True: [Path("src")], False: [Path("tests")]}
+
+        _run_typecheck_groups(paths_by_strictness, CorePluginConfig(), False, (), daemon=False)
+
+        jobs = run_jobs.call_args.args[0]
+        assert [job.args[-1] for job in jobs] == ["src", "tests"]
+        assert run_jobs.call_args.kwargs == {"max_workers": 2}
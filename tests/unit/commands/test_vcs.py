@@ -0,0 +1,106 @@
+from subprocess import CompletedProcess
+
+import pytest
+
+from delfino_core.commands import vcs
+from delfino_core.config import CorePluginConfig
+from delfino_core.pipeline import run_pipeline
+from delfino_core.vcs_tools import RepoSnapshot
+
+_TITLE = "fix typo"
+_BRANCH = "user/fix_typo"
+
+
+def _run_start(mocker, context_obj, trunk="main", current="feature", dirty=False, new_branch=True) -> list[str]:
+    """Run steps of `gh pr start` with git stubbed. Returns git commands, e.g. ``checkout main``, sorted."""
+    commands: list[str] = []
+
+    def _git(*args: str) -> str:
+        commands.append(" ".join(args))
+        return " M module.py\n" if dirty and args[0] == "status" else ""
+
+    def _run(args: list[str], **_) -> CompletedProcess:
+        commands.append(" ".join(args[1:]))
+        return CompletedProcess(args, 0, b"", b"")
+
+    mocker.patch.object(vcs, "_git", side_effect=_git)
+    mocker.patch.object(vcs, "run", side_effect=_run)
+    mocker.patch.object(vcs, "get_trunk_branch", return_value=trunk)
+    mocker.patch.object(vcs, "repo_snapshot", return_value=RepoSnapshot(trunk_branch=trunk, current_branch=current))
+    mocker.patch.object(vcs, "title_and_branch_prefix_from_issue_tracker", return_value=(_TITLE, "user"))
+    mocker.patch.object(vcs, "get_new_branch_name_or_switch_to_branch", return_value=(_BRANCH, new_branch))
+    click_context = mocker.Mock()
+    click_context.forward.side_effect = lambda *_, **__: commands.append("pr create")
+
+    context_obj.plugin_config = CorePluginConfig()
+    run_pipeline(vcs._VcsStart(context_obj, click_context, (_TITLE,), "gh").steps(), report=False)
+
+    return sorted(commands)
+
+
+class TestVcsStart:
+    @staticmethod
+    @pytest.fixture
+    def branch_commands() -> list[str]:
+        return [
+            f"checkout -b {_BRANCH}",
+            f"commit --allow-empty -m {_TITLE}",
+            "log -1 --pretty=%B",
+            "pr create",
+            f"push --set-upstream origin {_BRANCH}",
+        ]
+
+    @staticmethod
+    def test_should_skip_stash_of_clean_tree(mocker, context_obj, branch_commands):
+        commands = _run_start(mocker, context_obj)
+
+        assert commands == sorted(
+            [
+                *branch_commands,
+                "fetch --quiet origin main",
+                "status --porcelain --untracked-files=no",
+                "checkout main",
+                "merge --ff-only origin/main",
+            ]
+        )
+
+    @staticmethod
+    def test_should_stash_dirty_tree_and_pop_it_at_the_end(mocker, context_obj, branch_commands):
+        commands = _run_start(mocker, context_obj, dirty=True)
+
+        assert commands == sorted(
+            [
+                *branch_commands,
+                "fetch --quiet origin main",
+                "status --porcelain --untracked-files=no",
+                "stash",
+                "checkout main",
+                "merge --ff-only origin/main",
+                "stash pop",
+            ]
+        )
+
+    @staticmethod
+    def test_should_only_create_pr_from_existing_branch(mocker, context_obj):
+        commands = _run_start(mocker, context_obj, dirty=True, new_branch=False)
+
+        assert commands == sorted(["fetch --quiet origin main", "status --porcelain --untracked-files=no", "pr create"])
+
+    @staticmethod
+    def test_should_not_check_out_trunk_when_on_it(mocker, context_obj, branch_commands):
+        commands = _run_start(mocker, context_obj, current="main")
+
+        assert commands == sorted(
+            [
+                *branch_commands,
+                "fetch --quiet origin main",
+                "status --porcelain --untracked-files=no",
+                "merge --ff-only origin/main",
+            ]
+        )
+
+    @staticmethod
+    def test_should_pull_current_branch_when_trunk_is_unknown(mocker, context_obj, branch_commands):
+        commands = _run_start(mocker, context_obj, trunk="")
+
+        assert commands == sorted([*branch_commands, "status --porcelain --untracked-files=no", "pull"])
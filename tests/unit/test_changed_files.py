@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from delfino_core import changed_files
+from delfino_core.changed_files import select_changed
+from tests.integration.helpers import tmpdir_in_path
+
+
+def _write(path: str, content: str = "") -> Path:
+    file = Path(path)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content, encoding="utf-8")
+    return file
+
+
+class TestSelectChanged:
+    @staticmethod
+    def test_should_select_importers_of_deleted_module_without_the_module(monkeypatch):
+        with tmpdir_in_path(chdir=True):
+            # GIVEN `pkg.removed` was deleted, but is still imported
+            importer = _write("src/pkg/importer.py", "from pkg import removed\n")
+            test = _write("tests/test_importer.py", "import pkg.importer\n")
+            _write("tests/test_other.py", "import os\n")
+            monkeypatch.setattr(changed_files, "get_changed_files", lambda: [Path("src/pkg/removed.py")])
+
+            # WHEN
+            selected = select_changed([Path("src"), Path("tests")], [Path("src"), Path()], include_dependents=True)
+
+            # THEN
+            assert selected == [importer, test]
+
+    @staticmethod
+    def test_should_not_select_deleted_module_without_dependents(monkeypatch):
+        with tmpdir_in_path(chdir=True):
+            _write("src/pkg/importer.py", "from pkg import removed\n")
+            monkeypatch.setattr(changed_files, "get_changed_files", lambda: [Path("src/pkg/removed.py")])
+
+            assert select_changed([Path("src")], [Path("src")], include_dependents=False) == []
+
+    @staticmethod
+    @pytest.mark.parametrize("lock_file", ["uv.lock", "poetry.lock", "Pipfile.lock"])
+    def test_should_check_everything_after_lock_file_change(monkeypatch, lock_file):
+        monkeypatch.setattr(changed_files, "get_changed_files", lambda: [Path(lock_file)])
+
+        assert select_changed([Path("src")], [Path("src")], include_dependents=True) is None
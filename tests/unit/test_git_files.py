@@ -0,0 +1,124 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from delfino_core.git_files import GitDir, UnsupportedGitStateError, parse_config
+from delfino_core.vcs_tools import RepoSnapshot
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch) -> Path:
+    """A repository isolated from the system and user git config."""
+    global_config = tmp_path / "gitconfig"
+    global_config.write_text("[user]\n\temail = global@example.com\n")
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(global_config))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-b", "main")
+    _git(path, "commit", "--allow-empty", "-m", "Initial commit")
+    return path
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def _git_config(cwd: Path) -> dict[str, list[str]]:
+    config: dict[str, list[str]] = {}
+    for entry in _git(cwd, "config", "--list", "-z").split("\0"):
+        if entry:
+            key, _, value = entry.partition("\n")
+            config.setdefault(key, []).append(value)
+    return config
+
+
+class TestParseConfig:
+    @staticmethod
+    def test_should_parse_values_the_same_as_git():
+        # GIVEN
+        text = (
+            "[Core]\n"
+            "\tBare = false ; comment\n"
+            "\tbool\n"
+            '[remote "Origin"]\n'
+            '\turl = "git@github.com:org/repo.git"  # comment\n'
+            "[alias]\n"
+            '\tlog1 = log  -1 "--format=%s ;" \\\n'
+            "\t\t--stat\n"
+            '\tquoted = "a\\tb\\"c"\n'
+            "[section.Sub] key = value\n"
+        )
+
+        # WHEN
+        entries = list(parse_config(text, Path("config")))
+
+        # THEN
+        assert entries == [
+            ("core.bare", "false"),
+            ("core.bool", "true"),
+            ("remote.Origin.url", "git@github.com:org/repo.git"),
+            ("alias.log1", "log  -1 --format=%s ;   --stat"),
+            ("alias.quoted", 'a\tb"c'),
+            ("section.sub.key", "value"),
+        ]
+
+
+class TestGitDir:
+    @staticmethod
+    def test_should_read_config_the_same_as_git(repo, tmp_path):
+        # GIVEN
+        (tmp_path / "work.gitconfig").write_text("[user]\n\temail = work@example.com\n")
+        (tmp_path / "extra.gitconfig").write_text("[extra]\n\tvalue = 1\n")
+        _git(repo, "config", "includeIf.gitdir:**/repo/.path", str(tmp_path / "work.gitconfig"))
+        _git(repo, "config", "includeIf.gitdir:/nonexistent/.path", str(tmp_path / "extra.gitconfig"))
+        _git(repo, "config", "include.path", "../../extra.gitconfig")
+        _git(repo, "remote", "add", "origin", "git@github.com:org/repo.git")
+
+        # WHEN
+        config = GitDir.discover(repo).config()
+
+        # THEN
+        assert config == _git_config(repo)
+        assert config["user.email"][-1] == "work@example.com"
+
+    @staticmethod
+    def test_should_read_refs_in_linked_work_tree(repo, tmp_path):
+        # GIVEN packed and loose branches, and a work tree with a `.git` file
+        _git(repo, "branch", "packed/branch")
+        _git(repo, "pack-refs", "--all")
+        _git(repo, "branch", "loose")
+        _git(repo, "update-ref", "refs/remotes/origin/main", "HEAD")
+        _git(repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/main")
+        _git(repo, "worktree", "add", "-q", str(tmp_path / "work_tree"), "-b", "feature")
+
+        # WHEN
+        git_dir = GitDir.discover(tmp_path / "work_tree")
+        snapshot = RepoSnapshot.from_git_dir(git_dir)
+
+        # THEN
+        assert git_dir.work_tree == (tmp_path / "work_tree").resolve()
+        assert git_dir.common_dir == (repo / ".git").resolve()
+        assert git_dir.read_ref("HEAD") == _git(repo, "rev-parse", "HEAD").strip()
+        assert snapshot.trunk_branch == "main"
+        assert snapshot.current_branch == "feature"
+        assert snapshot.local_branches == {"main", "packed/branch", "loose", "feature"}
+
+    @staticmethod
+    def test_should_not_guess_repository_location_changed_by_git_env_vars(repo, monkeypatch):
+        monkeypatch.setenv("GIT_DIR", str(repo / ".git"))
+        with pytest.raises(UnsupportedGitStateError):
+            GitDir.discover(repo)
+
+    @staticmethod
+    def test_should_leave_config_which_is_not_utf8_to_git(repo, monkeypatch):
+        # GIVEN a user name encoded in Latin-1
+        (repo.parent / "gitconfig").write_bytes("[user]\n\tname = René\n".encode("latin-1"))
+        monkeypatch.chdir(repo)
+
+        # WHEN / THEN the config can't be read from files, but the snapshot is taken with git
+        with pytest.raises(UnsupportedGitStateError):
+            GitDir.discover(repo).config()
+        assert RepoSnapshot.take().config_value("user.name") == "Ren\ufffd"
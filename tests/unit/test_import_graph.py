@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from delfino_core.import_graph import ImportGraph, module_name, python_files
+from tests.integration.helpers import tmpdir_in_path
+
+
+def _write(path: Path, content: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestModuleName:
+    @staticmethod
+    def test_should_use_first_matching_root():
+        assert module_name(Path("src/pkg/mod.py"), [Path("src"), Path()]) == "pkg.mod"
+
+    @staticmethod
+    def test_should_strip_init_module():
+        assert module_name(Path("tests/unit/__init__.py"), [Path("src"), Path()]) == "tests.unit"
+
+
+class TestImportGraph:
+    @staticmethod
+    def test_should_find_transitive_dependents():
+        with tmpdir_in_path(chdir=True):
+            # GIVEN `pkg.a` is imported by `pkg.b`, which is imported by a test
+            a = _write(Path("src/pkg/a.py"))
+            b = _write(Path("src/pkg/b.py"), "from pkg import a\n")
+            test = _write(Path("tests/test_b.py"), "import pkg.b\n")
+            unrelated = _write(Path("tests/test_other.py"), "import os\n")
+            init = _write(Path("src/pkg/__init__.py"))
+
+            graph = ImportGraph(python_files([Path("src"), Path("tests")]), [Path("src"), Path()])
+
+            # WHEN `pkg.a` changes
+            # THEN it, `pkg.b` and the test importing `pkg.b` are affected
+            assert graph.dependents([a]) == {a, b, test}
+            # AND a change of the package `__init__` affects everything importing from the package
+            assert graph.dependents([init]) == {init, b, test}
+            assert unrelated not in graph.dependents([a, init])
+
+    @staticmethod
+    def test_should_resolve_relative_imports():
+        with tmpdir_in_path(chdir=True):
+            a = _write(Path("src/pkg/sub/a.py"))
+            b = _write(Path("src/pkg/b.py"), "from .sub import a\n")
+            c = _write(Path("src/pkg/sub/c.py"), "from ..b import something\n")
+
+            graph = ImportGraph(python_files([Path("src")]), [Path("src")])
+
+            assert graph.dependents([a]) == {a, b, c}
+
+    @staticmethod
+    def test_should_ignore_files_outside_of_graph():
+        graph = ImportGraph([], [Path()])
+
+        assert graph.dependents([Path("missing.py")]) == set()
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+from delfino_core import output as output_module
+from delfino_core.output import CapturedOutput
+
+
+def _capture(code: str, **kwargs) -> CapturedOutput:
+    output = CapturedOutput(**kwargs)
+    subprocess.run([sys.executable, "-c", code], stdout=output.stdout, stderr=output.stderr, check=False)
+    return output
+
+
+class TestCapturedOutput:
+    @staticmethod
+    def test_should_find_text_across_chunk_boundary(monkeypatch):
+        monkeypatch.setattr(output_module, "_CHUNK_SIZE", 4)
+
+        with _capture("print('abcdefgh')") as output:
+            assert output.contains("cdef")
+            assert not output.contains("xyz")
+
+    @staticmethod
+    def test_should_keep_last_lines_only():
+        with _capture("for i in range(100): print(i)", tail_lines=3) as output:
+            assert output.tail() == ["97", "98", "99"]
+
+    @staticmethod
+    def test_should_merge_stderr_in_order():
+        code = "import sys; print('out', flush=True); print('err', file=sys.stderr, flush=True)"
+
+        with _capture(code, merge_stderr=True) as output:
+            assert output.read().split() == [b"out", b"err"]
+
+    @staticmethod
+    def test_should_echo_tail_after_large_output(capsys):
+        with _capture("for i in range(100): print(i)", tail_threshold=10, tail_lines=2) as output:
+            output.echo()
+
+        printed = capsys.readouterr().out
+        assert printed.startswith("0\n1\n")
+        assert printed.endswith("Last 2 lines of 0.0 MiB output:\n98\n99\n")
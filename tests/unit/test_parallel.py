@@ -0,0 +1,75 @@
+import sys
+from graphlib import CycleError
+
+import click
+import pytest
+
+from delfino_core.parallel import Job, delfino_args, run_jobs
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+class TestRunJobs:
+    @staticmethod
+    def test_should_print_output_in_declared_order(capsys):
+        # GIVEN the first job finishes last
+        jobs = [
+            Job("slow", _python("import time; time.sleep(0.3); print('slow output')")),
+            Job("fast", _python("print('fast output')")),
+        ]
+
+        # WHEN jobs run concurrently
+        results = run_jobs(jobs, max_workers=2)
+
+        # THEN output follows the declared order, not the order of completion
+        output = capsys.readouterr().out
+        assert output.index("slow output") < output.index("fast output")
+        assert all(job.succeeded for job in results)
+
+    @staticmethod
+    def test_should_skip_dependents_of_failed_job():
+        jobs = [
+            Job("failing", _python("raise SystemExit(3)")),
+            Job("dependent", _python("print('never')"), dependencies={"failing"}),
+            Job("transitive", _python("print('never')"), dependencies={"dependent"}),
+            Job("independent", _python("print('ok')")),
+        ]
+
+        results = {job.name: job for job in run_jobs(jobs, max_workers=4)}
+
+        assert not results["failing"].succeeded
+        assert results["dependent"].skipped
+        assert results["transitive"].skipped
+        assert results["independent"].succeeded
+
+    @staticmethod
+    def test_should_ignore_dependencies_outside_of_the_group():
+        jobs = [Job("only", _python("pass"), dependencies={"not-in-group"})]
+
+        assert run_jobs(jobs, max_workers=1)[0].succeeded
+
+    @staticmethod
+    def test_should_reject_cyclic_dependencies():
+        jobs = [
+            Job("a", _python("pass"), dependencies={"b"}),
+            Job("b", _python("pass"), dependencies={"a"}),
+        ]
+
+        with pytest.raises(CycleError):
+            run_jobs(jobs, max_workers=2)
+
+
+class TestDelfinoArgs:
+    @staticmethod
+    def test_should_convert_known_options_only():
+        @click.command("dummy")
+        @click.option("-f", "--file", "files_folders", multiple=True)
+        @click.option("--summary-only", is_flag=True)
+        def dummy(files_folders, summary_only):
+            del files_folders, summary_only
+
+        args = delfino_args(dummy, {"files_folders": ("a", "b"), "summary_only": True, "unknown": 1})
+
+        assert args[-6:] == ["dummy", "--file", "a", "--file", "b", "--summary-only"]
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from delfino_core.pipeline import Step, run_pipeline
+
+
+class TestRunPipeline:
+    @staticmethod
+    def test_should_run_independent_steps_concurrently():
+        # GIVEN two steps which can finish only when both run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        # WHEN
+        values = run_pipeline(
+            [
+                Step("first", lambda _: barrier.wait()),
+                Step("second", lambda _: barrier.wait()),
+                Step("last", sorted, {"first", "second"}),
+            ],
+            report=False,
+        )
+
+        # THEN
+        assert values["last"] == ["first", "second"]
+
+    @staticmethod
+    def test_should_run_interactive_steps_in_main_thread_while_others_run():
+        started = threading.Event()
+
+        def background(_):
+            started.set()
+            time.sleep(0.05)
+
+        values = run_pipeline(
+            [
+                Step("background", background),
+                Step("prompt", lambda _: (threading.current_thread(), started.wait(5)), interactive=True),
+            ],
+            report=False,
+        )
+
+        assert values["prompt"] == (threading.main_thread(), True)
+
+    @staticmethod
+    def test_should_report_skipped_steps_and_continue_with_dependents(capsys):
+        values = run_pipeline(
+            [
+                Step("stash", lambda _: "stashed", skip=lambda _: "the working tree is clean"),
+                Step("commit", lambda _: "committed", {"stash"}),
+                Step("pop", lambda _: "popped", {"commit"}, lambda values: None if "stash" in values else "no stash"),
+            ]
+        )
+
+        assert values == {"commit": "committed"}
+        assert capsys.readouterr().out.splitlines() == [
+            " - stash skipped because the working tree is clean",
+            " ✔ commit (0.0s)",
+            " - pop skipped because no stash",
+        ]
+
+    @staticmethod
+    def test_should_not_run_dependents_of_failed_step():
+        def fail(_):
+            raise RuntimeError("failed")
+
+        ran: list[dict] = []
+        with pytest.raises(RuntimeError, match="failed"):
+            run_pipeline([Step("fail", fail), Step("after", ran.append, {"fail"})], report=False)
+
+        assert not ran
+
+    @staticmethod
+    def test_should_reject_dependencies_declared_later():
+        with pytest.raises(ValueError, match="later"):
+            run_pipeline([Step("first", lambda _: None, {"later"}), Step("later", lambda _: None)], report=False)
@@ -0,0 +1,28 @@
+from delfino.click_utils.command import CommandRegistry, _CommandPackage
+from delfino.models.pyproject_toml import PluginConfig
+
+import delfino_core.commands
+import delfino_core.plugin
+from delfino_core.lazy_command import LazyCommand
+
+
+def _registry(package) -> CommandRegistry:
+    command_package = _CommandPackage(plugin_name="delfino-core", package=package, plugin_config=PluginConfig.empty())
+    return CommandRegistry({}, [command_package])
+
+
+class TestPluginManifest:
+    @staticmethod
+    def test_should_list_all_commands_with_matching_help():
+        implemented = {command.name: command.command for command in _registry(delfino_core.commands).visible_commands}
+        manifest = {command.name: command.command for command in _registry(delfino_core.plugin).visible_commands}
+
+        assert manifest.keys() == implemented.keys()
+        for name, command in manifest.items():
+            assert command.get_short_help_str(1000) == implemented[name].get_short_help_str(1000), name
+
+    @staticmethod
+    def test_should_point_to_implementation():
+        for command in vars(delfino_core.plugin).values():
+            if isinstance(command, LazyCommand):
+                assert command.load().name == command.name
@@ -0,0 +1,86 @@
+import os
+import stat
+
+import pytest
+
+from delfino_core import probes
+from delfino_core.probes import ExecutableProbe, probe_executable
+
+
+@pytest.fixture
+def search_path(tmp_path, monkeypatch):
+    bin_path = tmp_path / "bin"
+    bin_path.mkdir()
+    monkeypatch.setenv("PATH", str(bin_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(probes, "_PROBES", {})
+    return bin_path
+
+
+def _executable(bin_path, name: str, version: str):
+    """An executable printing the version and counting how many times it ran."""
+    path = bin_path / name
+    path.write_text(f"#!/bin/sh\necho run >> {bin_path / 'runs'}\necho '{version}'\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+def _runs(bin_path) -> int:
+    runs_file = bin_path / "runs"
+    return len(runs_file.read_text().splitlines()) if runs_file.exists() else 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Uses a shell script as the executable")
+class TestProbeExecutable:
+    @staticmethod
+    def test_should_return_path_and_version(search_path):
+        path = _executable(search_path, "tool", "tool 1.2.3")
+        assert probe_executable("tool") == ExecutableProbe(path=str(path), version="tool 1.2.3")
+
+    @staticmethod
+    def test_should_return_none_when_not_installed(search_path):
+        assert probe_executable("tool") is None
+
+    @staticmethod
+    def test_should_reuse_probe_from_another_process(search_path, monkeypatch):
+        # GIVEN a probe stored on disk by a previous run
+        _executable(search_path, "tool", "tool 1.2.3")
+        probe_executable("tool")
+        monkeypatch.setattr(probes, "_PROBES", {})
+
+        # WHEN
+        probe = probe_executable("tool")
+
+        # THEN
+        assert probe and probe.version == "tool 1.2.3"
+        assert _runs(search_path) == 1
+
+    @staticmethod
+    def test_should_probe_again_when_executable_changes(search_path, monkeypatch):
+        # GIVEN
+        path = _executable(search_path, "tool", "tool 1.2.3")
+        probe_executable("tool")
+        monkeypatch.setattr(probes, "_PROBES", {})
+
+        # WHEN the executable is upgraded
+        _executable(search_path, "tool", "tool 2.0.0")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+
+        # THEN
+        probe = probe_executable("tool")
+        assert probe and probe.version == "tool 2.0.0"
+        assert _runs(search_path) == 2  # noqa: PLR2004
+
+    @staticmethod
+    def test_should_probe_again_when_path_changes(search_path, monkeypatch):
+        # GIVEN
+        _executable(search_path, "tool", "tool 1.2.3")
+        probe_executable("tool")
+        monkeypatch.setattr(probes, "_PROBES", {})
+
+        # WHEN
+        monkeypatch.setenv("PATH", f"{search_path}{os.pathsep}/nonexistent")
+
+        # THEN
+        probe_executable("tool")
+        assert _runs(search_path) == 2  # noqa: PLR2004
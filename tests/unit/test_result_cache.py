@@ -0,0 +1,85 @@
+import hashlib
+from pathlib import Path
+
+import click
+from click.testing import CliRunner
+
+from delfino_core.config import CorePluginConfig, pass_plugin_app_context
+from delfino_core.result_cache import ResultCache, cache_result, file_state
+from tests.integration.helpers import tmpdir_in_path
+
+
+class TestFileState:
+    @staticmethod
+    def test_should_hash_content_when_not_cached():
+        with tmpdir_in_path(chdir=True):
+            path = Path("module.py")
+            path.write_text("x = 1\n", encoding="utf-8")
+
+            assert file_state(path, None)[2] == hashlib.sha256(b"x = 1\n").hexdigest()
+
+    @staticmethod
+    def test_should_reuse_cached_hash_when_stat_matches():
+        with tmpdir_in_path(chdir=True):
+            path = Path("module.py")
+            path.write_text("x = 1\n", encoding="utf-8")
+            stat = path.stat()
+
+            assert file_state(path, (stat.st_mtime_ns, stat.st_size, "cached"))[2] == "cached"
+
+    @staticmethod
+    def test_should_rehash_when_size_differs():
+        with tmpdir_in_path(chdir=True):
+            path = Path("module.py")
+            path.write_text("x = 1\n", encoding="utf-8")
+            stat = path.stat()
+
+            assert file_state(path, (stat.st_mtime_ns, stat.st_size + 1, "stale"))[2] != "stale"
+
+
+class TestResultCache:
+    @staticmethod
+    def test_should_hit_only_when_inputs_are_unchanged(context_obj):
+        with tmpdir_in_path(chdir=True):
+            # GIVEN a successful run was stored
+            context_obj.plugin_config = CorePluginConfig()
+            source = Path("src/module.py")
+            source.parent.mkdir()
+            source.write_text("x = 1\n", encoding="utf-8")
+            duration = 1.5
+            ResultCache("mypy", "mypy", context_obj).store({"strict": True}, duration)
+
+            # THEN the same arguments and inputs hit the cache with the original duration
+            assert ResultCache("mypy", "mypy", context_obj).lookup({"strict": True}) == duration
+            # AND different arguments miss it
+            assert ResultCache("mypy", "mypy", context_obj).lookup({"strict": False}) is None
+
+            # WHEN an input file changes
+            source.write_text("x = 2\n", encoding="utf-8")
+
+            # THEN the cache is missed
+            assert ResultCache("mypy", "mypy", context_obj).lookup({"strict": True}) is None
+
+
+class TestCacheResult:
+    @staticmethod
+    def test_should_run_cached_command_again_with_no_cache_option(context_obj):
+        runs: list[str] = []
+
+        @click.command("checks")
+        @pass_plugin_app_context
+        @cache_result("click")
+        def run_checks(app_context):  # noqa: ARG001
+            runs.append("run with --no-cache" if runs else "first run")
+
+        with tmpdir_in_path(chdir=True):
+            # GIVEN a successful run was stored
+            CliRunner().invoke(run_checks, [], obj=context_obj, catch_exceptions=False)
+
+            # WHEN run again without and with the option
+            cached = CliRunner().invoke(run_checks, [], obj=context_obj, catch_exceptions=False)
+            CliRunner().invoke(run_checks, ["--no-cache"], obj=context_obj, catch_exceptions=False)
+
+            # THEN only the run with the option runs the command again
+            assert "cached" in cached.output
+            assert runs == ["first run", "run with --no-cache"]
@@ -0,0 +1,90 @@
+import time
+from subprocess import CompletedProcess
+
+import click
+import pytest
+
+from delfino_core.spinner import Spinner, SpinnerGroup
+
+
+class TestSpinner:
+    @staticmethod
+    def test_should_print_only_start_and_result_lines_when_not_interactive(capsys):
+        # GIVEN stdout is captured, so not a terminal
+        with Spinner("tool", "doing work") as spinner:
+            time.sleep(0.3)
+
+        spinner.print_results(CompletedProcess([], 0, b"", b""))
+
+        # THEN no frames are rendered
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2  # noqa: PLR2004
+        assert "\r" not in "".join(lines)
+        assert "✔" in lines[1]
+
+    @staticmethod
+    def test_should_render_frames_in_background_when_interactive(capsys, monkeypatch):
+        monkeypatch.setattr("delfino_core.spinner.is_interactive", lambda: True)
+
+        with Spinner("tool", fps=0.01):
+            time.sleep(0.2)
+
+        frames_count = capsys.readouterr().out.count("\r")
+        time.sleep(0.05)
+
+        # THEN frames were drawn while running and stopped immediately after
+        assert frames_count > 1
+        assert not capsys.readouterr().out
+
+    @staticmethod
+    def test_should_raise_on_failure(capsys):
+        spinner = Spinner("tool")
+        spinner()  # Used as `running_hook`
+
+        with pytest.raises(click.Abort):
+            spinner.print_results(CompletedProcess([], 1, b"error output", b""))
+
+        assert "error output" in capsys.readouterr().out
+
+
+class TestSpinnerGroup:
+    @staticmethod
+    def test_should_flush_output_in_declared_order(capsys):
+        with SpinnerGroup(["first", "second"]) as group:
+            group.start("first")
+            group.start("second")
+            group.finish("second", succeeded=False, duration=0.1, output=b"second output\n")
+
+            # THEN nothing is printed while a command declared earlier is still running
+            assert not capsys.readouterr().out
+
+            group.finish("first", succeeded=True, duration=0.2, output=b"first output")
+
+        output = capsys.readouterr().out
+        assert output.index("first output") < output.index("✔ first") < output.index("second output")
+        assert "✘ second" in output
+
+    @staticmethod
+    def test_should_report_skipped_and_unfinished_commands(capsys):
+        with SpinnerGroup(["skipped", "interrupted"]) as group:
+            group.skip("skipped", "a dependency failed")
+            group.start("interrupted")
+
+        output = capsys.readouterr().out
+        assert "- skipped skipped because a dependency failed" in output
+        assert "- interrupted did not finish" in output
+
+    @staticmethod
+    def test_should_redraw_rows_when_interactive(capsys, monkeypatch):
+        monkeypatch.setattr("delfino_core.spinner.is_interactive", lambda: True)
+
+        with SpinnerGroup(["first", "second"], fps=0.01) as group:
+            group.start("first")
+            time.sleep(0.05)
+            group.finish("first", succeeded=True, duration=0.05)
+
+        # THEN both rows are redrawn while running (cursor movement is stripped, because capsys is not a TTY)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines.count(" · second (waiting)") > 2  # noqa: PLR2004
+        assert " ✔ first (0.1s)" in lines
+        assert lines[-1] == " - second did not finish"
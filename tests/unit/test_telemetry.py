@@ -0,0 +1,46 @@
+import sys
+
+import click
+import pytest
+from delfino.execution import OnError
+
+from delfino_core.config import CorePluginConfig
+from delfino_core.telemetry import TIMINGS_FILE, read_timings, run
+from tests.integration.helpers import tmpdir_in_path
+
+
+class TestRun:
+    @staticmethod
+    @pytest.mark.parametrize("record_timings", [False, True])
+    def test_should_record_timings_only_when_enabled(context_obj, record_timings):
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN
+            context_obj.plugin_config = CorePluginConfig(record_timings=record_timings)
+
+            # WHEN
+            with click.Context(click.Command("checks"), obj=context_obj):
+                run([sys.executable, "-c", "pass"], on_error=OnError.PASS)
+
+            # THEN
+            records = list(read_timings(tmpdir / "reports" / TIMINGS_FILE))
+            assert [(record["command"], record["returncode"]) for record in records] == (
+                [("checks", 0)] if record_timings else []
+            )
+
+    @staticmethod
+    def test_should_resolve_timings_file_again_for_another_config(context_obj):
+        with tmpdir_in_path(chdir=True) as tmpdir:
+            # GIVEN
+            reports_directories = [tmpdir / "first", tmpdir / "second"]
+
+            # WHEN
+            with click.Context(click.Command("checks"), obj=context_obj):
+                for reports_directory in reports_directories:
+                    context_obj.plugin_config = CorePluginConfig(
+                        record_timings=True, reports_directory=reports_directory
+                    )
+                    run([sys.executable, "-c", "pass"], on_error=OnError.PASS)
+
+            # THEN
+            for reports_directory in reports_directories:
+                assert len(list(read_timings(reports_directory / TIMINGS_FILE))) == 1
@@ -1,6 +1,9 @@
+import subprocess
+from pathlib import Path
+
 import pytest
 
-from delfino_core.vcs_tools import _sanitize_branch_name
+from delfino_core.vcs_tools import RepoSnapshot, _sanitize_branch_name, parse_name_status, repo_snapshot
 
 
 class TestSanitizeBranchName:
@@ -104,3 +107,66 @@ class TestSanitizeBranchName:
     )
     def test_should_strip_special_characters_around_slash(input_branch, expected_output):
         assert _sanitize_branch_name(input_branch) == expected_output
+
+
+class TestRepoSnapshot:
+    @staticmethod
+    def test_should_parse_git_output():
+        # GIVEN
+        config_output = "user.email\nme@example.com\0remote.origin.url\ngit@github.com:org/repo.git\0"
+        refs_output = (
+            "*\0refs/heads/feature/x\0\n \0refs/heads/main\0\n \0refs/remotes/origin/HEAD\0refs/remotes/origin/main\n"
+        )
+
+        # WHEN
+        snapshot = RepoSnapshot.from_git_output(config_output, refs_output)
+
+        # THEN
+        assert snapshot.trunk_branch == "main"
+        assert snapshot.current_branch == "feature/x"
+        assert snapshot.local_branches == {"feature/x", "main"}
+        assert snapshot.remote_urls == ("git@github.com:org/repo.git",)
+        assert snapshot.config_value("user.email") == "me@example.com"
+        assert snapshot.config_value("user.name") == ""
+
+    @staticmethod
+    def test_should_read_repository(tmp_path, monkeypatch):
+        # GIVEN
+        def git(*args: str):
+            subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+        git("init", "-b", "trunk")
+        git("config", "user.email", "me@example.com")
+        git("commit", "--allow-empty", "-m", "Initial commit")
+        git("branch", "other")
+        git("remote", "add", "origin", "git@gitlab.com:org/repo.git")
+        git("update-ref", "refs/remotes/origin/trunk", "HEAD")
+        git("symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/trunk")
+        monkeypatch.chdir(tmp_path)
+        repo_snapshot.cache_clear()
+
+        # WHEN
+        try:
+            snapshot = repo_snapshot()
+        finally:
+            repo_snapshot.cache_clear()
+
+        # THEN
+        assert snapshot.trunk_branch == "trunk"
+        assert snapshot.current_branch == "trunk"
+        assert snapshot.local_branches == {"trunk", "other"}
+        assert snapshot.remote_urls == ("git@gitlab.com:org/repo.git",)
+        assert snapshot.config_value("user.email") == "me@example.com"
+
+
+class TestParseNameStatus:
+    @staticmethod
+    def test_should_keep_deleted_files_and_both_paths_of_renamed_files():
+        output = "M\0src/changed.py\0D\0src/deleted.py\0R087\0src/old.py\0src/new.py\0"
+
+        assert parse_name_status(output) == [
+            Path("src/changed.py"),
+            Path("src/deleted.py"),
+            Path("src/old.py"),
+            Path("src/new.py"),
+        ]
@@ -0,0 +1,77 @@
+import pytest
+
+from delfino_core.venv_store import VenvStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    project_root = tmp_path / "project"
+    project_root.mkdir()
+    (project_root / "poetry.lock").write_text("lock v1")
+    return VenvStore(project_root, project_root / "poetry.lock")
+
+
+def _venv(path, python_version: str):
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text(f"home = /usr/bin\nversion_info = {python_version}.final.0\n")
+    return path
+
+
+class TestVenvStore:
+    @staticmethod
+    def test_should_key_environments_by_python_version_and_lock_file(store):
+        # GIVEN
+        before = store.path("3.12.1")
+
+        # WHEN
+        store.lock_file.write_text("lock v2")
+
+        # THEN
+        assert store.path("3.12.1") != before
+        assert store.path("3.12.1").name.startswith("3.12.1-")
+        assert store.path("3.12.1").parent == store.directory
+
+    @staticmethod
+    def test_should_swap_venv_symlink(store):
+        # GIVEN
+        first = _venv(store.path("3.10.0"), "3.10.0")
+        second = _venv(store.path("3.13.0"), "3.13.0")
+        store.activate(first)
+
+        # WHEN
+        store.activate(second)
+
+        # THEN
+        assert store.venv.resolve() == second.resolve()
+        assert "3.13.0" in (store.venv / "pyvenv.cfg").read_text()
+        assert first.is_dir()
+
+    @staticmethod
+    def test_should_remove_venv_folder_not_installed_by_store(store):
+        # GIVEN a `.venv` created without the store, from an unknown lock file
+        _venv(store.venv, "3.11.7")
+        other = _venv(store.path("3.13.0"), "3.13.0")
+
+        # WHEN
+        store.activate(other)
+
+        # THEN
+        assert store.venv.is_symlink()
+        assert not store.path("3.11.7").exists()
+
+    @staticmethod
+    def test_should_prune_environments_of_previous_lock_files(store):
+        # GIVEN
+        outdated = _venv(store.path("3.12.1"), "3.12.1")
+        other_version = _venv(store.path("3.12.10"), "3.12.10")
+        store.lock_file.write_text("lock v2")
+        current = _venv(store.path("3.12.1"), "3.12.1")
+
+        # WHEN
+        removed = store.prune(keep=current)
+
+        # THEN
+        assert removed == [outdated]
+        assert current.exists()
+        assert other_version.exists()